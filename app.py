@@ -3,15 +3,11 @@ KREAM 자동 입찰 프로그램 - Streamlit UI
 """
 import streamlit as st
 import pandas as pd
-import time
+from collections import deque
 from datetime import datetime
-import threading
-import queue
 
 from utils import load_config, format_price, get_env, create_directories
-from kream_crawler import KreamCrawler
-from auto_bidder import KreamAutoBidder
-from price_monitor import PriceMonitor
+from daemon_client import DaemonClient, DaemonUnavailable
 
 # 페이지 설정
 st.set_page_config(
@@ -21,19 +17,67 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 세션 상태 초기화
-if 'monitoring' not in st.session_state:
-    st.session_state.monitoring = False
-if 'bid_history' not in st.session_state:
-    st.session_state.bid_history = []
-if 'price_history' not in st.session_state:
-    st.session_state.price_history = []
+# 세션 상태 초기화 (모니터링/입찰 상태는 백엔드 데몬이 보관)
 if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
 
 # 디렉토리 생성
 create_directories()
 
+# 화면 갱신 설정
+UI_CONFIG = load_config().get('ui', {})
+REFRESH_INTERVAL = UI_CONFIG.get('refresh_interval', 5)
+CHART_WINDOW = UI_CONFIG.get('chart_window', 500)
+
+
+@st.cache_resource
+def get_client():
+    """백엔드 데몬 API 클라이언트 (세션 간 공유)"""
+    return DaemonClient()
+
+
+@st.fragment(run_every=REFRESH_INTERVAL)
+def price_chart(job):
+    """
+    가격 추이 차트 (부분 자동 갱신)
+    
+    마지막으로 받은 순번 이후의 샘플만 받아 최근 CHART_WINDOW건 창에 추가하므로
+    모니터링이 오래 실행되어도 갱신당 전송량과 렌더링 양이 일정합니다.
+    """
+    feed = st.session_state.get('price_feed')
+    if feed is None or feed['job_id'] != job['id']:
+        feed = {'job_id': job['id'], 'seq': -CHART_WINDOW, 'rows': deque(maxlen=CHART_WINDOW)}
+        st.session_state.price_feed = feed
+    
+    try:
+        delta = get_client().prices(job['id'], since=feed['seq'])
+    except (DaemonUnavailable, ValueError) as e:
+        st.warning(f"⚠️ 가격 데이터를 가져올 수 없습니다: {e}")
+        return
+    
+    feed['rows'].extend(delta['samples'])
+    feed['seq'] = delta['seq']
+    
+    if not feed['rows']:
+        st.info("가격 데이터를 기다리는 중입니다...")
+        return
+    
+    st.caption(f"작업 #{job['id']}: {job['product_url']} ({job['size']}) - 누적 {feed['seq']}건")
+    df = pd.DataFrame(list(feed['rows'])).drop(columns=['size'], errors='ignore')
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    st.line_chart(df.set_index('timestamp'))
+
+
+def running_job(jobs, product_url=None, size=None):
+    """조건에 맞는 실행 중 작업 (가장 최근)"""
+    for job in reversed(jobs):
+        if job['status'] != 'running':
+            continue
+        if product_url and (job['product_url'] != product_url or (size and job['size'] != size)):
+            continue
+        return job
+    return None
+
 
 def main():
     """메인 함수"""
@@ -53,10 +97,22 @@ def main():
         - 본인 책임하에 사용하세요
         """)
     
+    client = get_client()
+    try:
+        daemon_status = client.status()
+    except DaemonUnavailable:
+        daemon_status = None
+    
     # 사이드바 - 설정
     with st.sidebar:
         st.header("⚙️ 설정")
         
+        # 백엔드 상태
+        if daemon_status:
+            st.success(f"🟢 백엔드 연결됨 (모니터링 {daemon_status['monitors']}개, 입찰 {daemon_status['bids']}개)")
+        else:
+            st.error("🔴 백엔드 데몬이 실행 중이 아닙니다.\n\n`python daemon.py`로 실행하세요.")
+        
         # 계정 정보
         st.subheader("🔐 계정 정보")
         email = st.text_input("KREAM 이메일", value=get_env('KREAM_EMAIL', ''), type="default")
@@ -139,42 +195,74 @@ def main():
         with col1:
             if st.button("🔍 가격 조회", use_container_width=True, type="primary"):
                 if product_url and size:
-                    with st.spinner("가격 정보를 가져오는 중..."):
-                        try:
-                            # 가격 조회 로직 (시뮬레이션)
-                            st.success("✅ 가격 조회 완료!")
+                    try:
+                        quote = client.quote(product_url, size)
+                        previous = st.session_state.get('last_quote')
+                        if previous and (previous['product_url'], previous['size']) != (product_url, size):
+                            previous = None
+                        
+                        bid_info = quote['bid_info']
+                        if bid_info:
+                            # 결과 표시 (이전 조회 대비 변화)
+                            def delta(field):
+                                if not previous or not previous['bid_info']:
+                                    return None
+                                return f"{bid_info[field] - previous['bid_info'][field]:+,}원"
                             
-                            # 결과 표시
                             col_a, col_b, col_c = st.columns(3)
                             with col_a:
-                                st.metric("최저 판매가", "150,000원", "-5,000원")
+                                st.metric("최저 판매가", format_price(bid_info['lowest_ask']), delta('lowest_ask'))
                             with col_b:
-                                st.metric("최고 구매가", "145,000원", "+2,000원")
+                                st.metric("최고 구매가", format_price(bid_info['highest_bid']), delta('highest_bid'))
                             with col_c:
-                                st.metric("즉시 구매가", "155,000원", "0원")
-                        except Exception as e:
-                            st.error(f"❌ 오류 발생: {e}")
+                                st.metric("즉시 구매가", format_price(bid_info['buy_now_price']), delta('buy_now_price'))
+                            
+                            caption = f"🕒 기준 시각: {quote['fetched_at']} ({quote['age']:.0f}초 전)"
+                            if quote['refreshing']:
+                                caption += " · 최신 가격으로 갱신 중"
+                            st.caption(caption)
+                            st.session_state.last_quote = quote
+                        else:
+                            st.info("⏳ 가격 정보를 가져오는 중입니다. 잠시 후 다시 조회하세요.")
+                    except (DaemonUnavailable, ValueError) as e:
+                        st.error(f"❌ 오류 발생: {e}")
                 else:
                     st.warning("⚠️ 상품 URL과 사이즈를 입력하세요")
         
         with col2:
             if st.button("📈 모니터링 시작", use_container_width=True):
                 if product_url and size:
-                    st.session_state.monitoring = True
-                    st.info("🔄 모니터링이 시작되었습니다")
+                    try:
+                        job = client.start_monitor(product_url, size, check_interval=check_interval, headless=headless)
+                        st.info(f"🔄 모니터링이 시작되었습니다 (작업 #{job['id']})")
+                    except (DaemonUnavailable, ValueError) as e:
+                        st.error(f"❌ 모니터링 시작 실패: {e}")
                 else:
                     st.warning("⚠️ 상품 URL과 사이즈를 입력하세요")
         
+        try:
+            monitor_jobs = client.list_jobs('monitor') if daemon_status else []
+        except (DaemonUnavailable, ValueError) as e:
+            st.warning(f"⚠️ 모니터링 작업 목록을 가져올 수 없습니다: {e}")
+            monitor_jobs = []
+        current_monitor = running_job(monitor_jobs, product_url, size) or running_job(monitor_jobs)
+        
         with col3:
             if st.button("⏹️ 모니터링 중지", use_container_width=True):
-                st.session_state.monitoring = False
-                st.info("⏸️ 모니터링이 중지되었습니다")
+                if current_monitor:
+                    try:
+                        client.stop_job(current_monitor['id'])
+                        current_monitor = None
+                        st.info("⏸️ 모니터링이 중지되었습니다")
+                    except (DaemonUnavailable, ValueError) as e:
+                        st.error(f"❌ 모니터링 중지 실패: {e}")
+                else:
+                    st.info("실행 중인 모니터링이 없습니다")
         
         # 가격 차트
         st.subheader("📉 가격 추이")
-        if st.session_state.price_history:
-            df = pd.DataFrame(st.session_state.price_history)
-            st.line_chart(df.set_index('timestamp'))
+        if current_monitor:
+            price_chart(current_monitor)
         else:
             st.info("가격 데이터가 없습니다. 모니터링을 시작하세요.")
     
@@ -239,19 +327,33 @@ def main():
         
         col1, col2 = st.columns(2)
         
+        try:
+            bid_jobs = client.list_jobs('bid') if daemon_status else []
+        except (DaemonUnavailable, ValueError) as e:
+            st.warning(f"⚠️ 자동 입찰 작업 목록을 가져올 수 없습니다: {e}")
+            bid_jobs = []
+        
         with col1:
             if st.button("🚀 자동 입찰 시작", use_container_width=True, type="primary"):
                 if bid_product_url and bid_size:
                     if auto_bid:
-                        st.success("✅ 자동 입찰이 시작되었습니다!")
-                        st.info(f"""
-                        **입찰 조건:**
-                        - 목표 가격: {format_price(target_price)}
-                        - 최대 가격: {format_price(bid_max_price)}
-                        - 확인 주기: {check_interval}초
-                        
-                        💡 가격이 목표 가격 이하로 떨어지면 자동으로 입찰합니다.
-                        """)
+                        try:
+                            job = client.start_bid(
+                                bid_product_url, bid_size, target_price, bid_max_price,
+                                check_interval=check_interval, headless=headless
+                            )
+                            bid_jobs.append(job)
+                            st.success(f"✅ 자동 입찰이 시작되었습니다! (작업 #{job['id']})")
+                            st.info(f"""
+                            **입찰 조건:**
+                            - 목표 가격: {format_price(target_price)}
+                            - 최대 가격: {format_price(bid_max_price)}
+                            - 확인 주기: {check_interval}초
+                            
+                            💡 가격이 목표 가격 이하로 떨어지면 자동으로 입찰합니다.
+                            """)
+                        except (DaemonUnavailable, ValueError) as e:
+                            st.error(f"❌ 자동 입찰 시작 실패: {e}")
                     else:
                         st.warning("⚠️ 자동 입찰이 비활성화되어 있습니다. 사이드바에서 활성화하세요.")
                 else:
@@ -259,60 +361,127 @@ def main():
         
         with col2:
             if st.button("⏹️ 자동 입찰 중지", use_container_width=True):
-                st.info("⏸️ 자동 입찰이 중지되었습니다")
+                job = running_job(bid_jobs, bid_product_url, bid_size) or running_job(bid_jobs)
+                if job:
+                    try:
+                        client.stop_job(job['id'])
+                        job['status'] = 'stopped'
+                        st.info("⏸️ 자동 입찰이 중지되었습니다")
+                    except (DaemonUnavailable, ValueError) as e:
+                        st.error(f"❌ 자동 입찰 중지 실패: {e}")
+                else:
+                    st.info("실행 중인 자동 입찰이 없습니다")
         
         # 실시간 상태
         st.subheader("📡 실시간 상태")
         status_placeholder = st.empty()
         
         with status_placeholder.container():
-            st.info("💤 대기 중... 자동 입찰을 시작하세요.")
+            active_bids = [job for job in bid_jobs if job['status'] == 'running']
+            if active_bids:
+                for job in active_bids:
+                    st.info(
+                        f"🔄 작업 #{job['id']}: {job['product_url']} ({job['size']}) - "
+                        f"목표 {format_price(job['target_price'])}, 시작 {job['started_at']}"
+                    )
+            else:
+                st.info("💤 대기 중... 자동 입찰을 시작하세요.")
     
     # 탭 3: 히스토리
     with tab3:
         st.header("📈 입찰 히스토리")
         
-        col1, col2, col3 = st.columns(3)
+        # 필터 (조회/집계/내보내기는 모두 데몬의 입찰 원장에서 처리)
+        col1, col2, col3, col4 = st.columns([3, 1, 1, 2])
+        with col1:
+            filter_url = st.text_input("상품 URL", key="history_url", placeholder="전체")
+        with col2:
+            filter_size = st.text_input("사이즈", key="history_size", placeholder="전체")
+        with col3:
+            filter_status = st.selectbox(
+                "상태", ["", "success", "failed", "test", "pending", "unknown"],
+                format_func=lambda value: value or "전체", key="history_status"
+            )
+        with col4:
+            date_range = st.date_input("기간", value=(), key="history_dates")
+        
+        filters = {
+            'product_url': filter_url.strip(),
+            'size': filter_size.strip(),
+            'status': filter_status,
+            'date_from': date_range[0].isoformat() if len(date_range) > 0 else '',
+            'date_to': date_range[-1].isoformat() if len(date_range) > 0 else ''
+        }
+        
+        summary = {'total': 0, 'by_status': {}, 'unknown': 0}
+        try:
+            if daemon_status:
+                summary = client.bid_summary(**filters)
+        except (DaemonUnavailable, ValueError) as e:
+            st.warning(f"⚠️ 입찰 요약을 가져올 수 없습니다: {e}")
+        
+        col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("총 입찰 시도", len(st.session_state.bid_history))
+            st.metric("총 입찰 시도", summary['total'])
         with col2:
-            success_count = sum(1 for bid in st.session_state.bid_history if bid.get('status') == 'success')
+            success_count = summary['by_status'].get('success', 0)
             st.metric("성공", success_count)
         with col3:
-            failed_count = len(st.session_state.bid_history) - success_count
+            unknown_count = summary.get('unknown', 0)
+            st.metric("확인 필요", unknown_count)
+        with col4:
+            failed_count = summary['total'] - success_count - unknown_count
             st.metric("실패", failed_count)
         
+        if unknown_count:
+            st.warning(f"결과를 알 수 없는 입찰 {unknown_count}건이 있습니다 (재시작 전에 결과가 기록되지 않음). "
+                       "KREAM에서 실제 입찰 여부를 확인하세요. 상태 필터에서 'unknown'으로 조회할 수 있습니다.")
+        
         st.divider()
         
-        # 히스토리 테이블
-        if st.session_state.bid_history:
-            df = pd.DataFrame(st.session_state.bid_history)
+        # 히스토리 테이블 (현재 페이지만 조회)
+        if summary['total']:
+            page_size = 50
+            page_count = (summary['total'] + page_size - 1) // page_size
+            page = st.number_input(f"페이지 (총 {page_count})", min_value=1, max_value=page_count, value=1, key="history_page")
+            try:
+                rows = client.bid_history(page=int(page), page_size=page_size, **filters)['rows']
+            except (DaemonUnavailable, ValueError) as e:
+                st.warning(f"⚠️ 입찰 기록을 가져올 수 없습니다: {e}")
+                rows = []
+            
+            # 빈 페이지도 열 이름은 유지
+            df = pd.DataFrame(rows, columns=['created_at', 'product_url', 'size', 'price', 'status', 'latency_ms'])
             st.dataframe(
                 df,
                 use_container_width=True,
                 column_config={
-                    "timestamp": st.column_config.DatetimeColumn("시간", format="YYYY-MM-DD HH:mm:ss"),
+                    "created_at": st.column_config.TextColumn("시간"),
                     "price": st.column_config.NumberColumn("가격", format="%d원"),
                     "size": "사이즈",
                     "status": st.column_config.TextColumn("상태")
                 }
             )
             
-            # 다운로드 버튼
-            csv = df.to_csv(index=False, encoding='utf-8-sig')
-            st.download_button(
-                label="📥 CSV 다운로드",
-                data=csv,
-                file_name=f"bid_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+            # CSV는 이 서버가 데몬에서 받아 전달 (브라우저가 데몬 주소에 직접 접근하지 않음)
+            export_key = tuple(sorted(filters.items()))
+            if st.button("📦 CSV 준비", key="history_export_prepare"):
+                try:
+                    st.session_state.history_export = (export_key, client.export_history(**filters))
+                except (DaemonUnavailable, ValueError) as e:
+                    st.error(f"❌ CSV 내보내기 실패: {e}")
+            export = st.session_state.get('history_export')
+            if export and export[0] == export_key:
+                st.download_button(
+                    "📥 CSV 다운로드", export[1],
+                    file_name=f"bid_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv", mime="text/csv"
+                )
         else:
             st.info("입찰 히스토리가 없습니다.")
         
-        # 히스토리 초기화
-        if st.button("🗑️ 히스토리 초기화", type="secondary"):
-            st.session_state.bid_history = []
+        # 히스토리 새로고침 (기록은 백엔드 입찰 원장에 영구 저장됨)
+        if st.button("🔄 새로고침", type="secondary"):
             st.rerun()
     
     # 탭 4: 정보
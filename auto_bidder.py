@@ -3,29 +3,77 @@
 """
 import time
 import argparse
-from datetime import datetime
+import threading
+from collections import deque
+from clock import SYSTEM_CLOCK
 from kream_crawler import KreamCrawler
-from price_monitor import PriceMonitor
-from utils import setup_logger, load_config, format_price, get_env
+from bid_engine import BidDecisionEngine, FILLED
+from threshold_index import ThresholdIndex
+from hot_bidder import HotStandbyPool
+from bid_ledger import BidLedger
+from checkpoint import Checkpointer, resume_delay
+from profiler import get_profiler, install_signal_handlers
+from metrics import PollTimer, BID_TRIGGER_SECONDS, BIDS, start_server
+from tracing import get_tracer
+from utils import setup_logger, load_config, watch_config, format_price, get_env, data_path
 
 
 class KreamAutoBidder:
     """KREAM 자동 입찰 클래스"""
     
-    def __init__(self):
-        """초기화"""
+    def __init__(self, ledger=None, headless=False, driver_factory=None, clock=None, data_dir=None):
+        """
+        초기화
+        
+        Args:
+            ledger (BidLedger): 공유 입찰 원장 (None이면 새로 생성)
+            headless (bool): 헤드리스 모드 사용 여부
+            driver_factory: 웹드라이버 생성 함수 (None이면 Chrome, 테스트에서는 fake_driver)
+            clock: 시계 (None이면 실제 시계, 시뮬레이션에서는 clock.VirtualClock)
+            data_dir (str): 입찰 원장/체크포인트 위치 (None이면 설정 파일 기준, 시뮬레이션 시계면 clock.data_dir)
+        """
         self.logger = setup_logger('AutoBidder', 'logs/auto_bidder.log')
         self.config = load_config()
-        self.crawler = KreamCrawler()
+        self.clock = clock or SYSTEM_CLOCK
+        self.data_dir = data_dir or self.clock.data_dir
+        self.driver_factory = driver_factory
+        self.crawler = KreamCrawler(headless=headless, driver_factory=driver_factory, clock=self.clock)
+        self.engine = BidDecisionEngine(self.config)
+        self.threshold_index = ThresholdIndex()
+        self.hot_pool = HotStandbyPool(
+            self.config, headless=headless, driver_factory=driver_factory, clock=self.clock
+        ) if self.config.get('bidding', {}).get('hot_standby', False) else None
+        self._owns_ledger = ledger is None
+        self.ledger = ledger or BidLedger(
+            data_path(self.config.get('ledger', {}).get('db', 'data/bids.db'), self.data_dir), self.config, self.clock
+        )
+        self.tracer = get_tracer()
         self.bid_history = []
+        self.bid_latencies = deque(maxlen=1000)
+        self._stop = threading.Event()
+        watch_config(self._on_config_change)
+        get_profiler().track(f"bid_history[AutoBidder {id(self):x}]", self, 'bid_history')
+    
+    def _on_config_change(self, config, old_config):
+        """설정 파일 변경 반영 (확인 주기, 새 목표의 기본 가격 한도)"""
+        self.config = config
+        self.engine.configure(config)
+        self.logger.info("설정 변경 반영")
+    
+    def stop(self):
+        """자동 입찰 중지 요청 (다른 스레드에서 호출)"""
+        self._stop.set()
         
     def setup(self):
         """초기 설정"""
+        # 공유 원장은 소유자가 시작 시 한 번만 복구함
+        if self._owns_ledger:
+            self.ledger.recover()
         self.crawler.setup_driver()
         if not self.crawler.login():
             raise Exception("로그인에 실패했습니다")
     
-    def place_bid(self, product_url, size, price):
+    def place_bid(self, product_url, size, price, triggered_at=None, target_price=None):
         """
         입찰하기
         
@@ -33,44 +81,99 @@ class KreamAutoBidder:
             product_url (str): 상품 URL
             size (str): 사이즈
             price (int): 입찰 가격
+            triggered_at (float): 목표 가격 감지 시각 (time.monotonic())
+            target_price (int): 목표 가격 (멱등 키 생성용)
             
         Returns:
             bool: 입찰 성공 여부
         """
+        idem_key = None
+        hot = False
         try:
-            self.logger.info(f"입찰 시도: {format_price(price)}, 사이즈: {size}")
-            
-            # 상품 페이지로 이동
-            self.crawler.driver.get(product_url)
-            time.sleep(2)
+            # 같은 입찰이 이미 나갔는지 확인 후 의도 기록
+            idem_key = self.ledger.begin(product_url, size, price, target_price)
+            if idem_key is None:
+                self.logger.warning(f"중복 입찰 방지: {format_price(price)}, 사이즈: {size}")
+                BIDS.labels(result='duplicate').inc()
+                return False
             
-            # ⚠️ 여기에 실제 입찰 로직 구현 필요
-            # KREAM의 실제 입찰 프로세스에 맞게 구현
-            # 1. 사이즈 선택
-            # 2. 판매 버튼 클릭
-            # 3. 가격 입력
-            # 4. 입찰 확인
+            self.logger.info(
+                f"입찰 시도: {format_price(price)}, 사이즈: {size}",
+                extra={'product_url': product_url, 'size': size, 'price': price}
+            )
             
-            self.logger.warning("⚠️  실제 입찰 로직은 구현되지 않았습니다")
-            self.logger.warning("실제 사용을 위해서는 KREAM의 HTML 구조에 맞게 구현이 필요합니다")
+            hot = self.hot_pool is not None and self.hot_pool.is_armed(product_url, size)
+            if hot:
+                # 대기 중인 입찰 폼에 가격만 입력 후 제출 (대기 브라우저가 사라졌거나 제출하지 못하면 캡처하지 않음)
+                success = self.hot_pool.submit(product_url, size, price)
+                submitted = success
+            else:
+                submitted = self.crawler.open_bid_form(product_url, size)
+                success = submitted and self.crawler.submit_bid_form(price)
+        except Exception as e:
+            self.logger.error(f"입찰 실패: {e}")
+            if idem_key:
+                self.ledger.finish(idem_key, 'failed', hot=hot)
+            BIDS.labels(result='failed').inc()
+            return False
+        
+        # 제출 결과는 바로 원장에 기록 (아래 기록/캡처가 실패해도 다시 입찰 가능 상태로 바뀌지 않음)
+        latency = time.monotonic() - triggered_at if triggered_at is not None else None
+        latency_ms = round(latency * 1000) if latency is not None else None
+        status = 'success' if success else 'test'  # success, failed, test
+        self.ledger.finish(idem_key, status, latency_ms, hot)
+        
+        try:
+            if latency is not None:
+                self.bid_latencies.append(latency)
+                BID_TRIGGER_SECONDS.observe(latency)
+                self.logger.info(
+                    f"감지 → 제출 지연 시간: {latency_ms}ms ({'hot' if hot else 'cold'})",
+                    extra={'product_url': product_url, 'size': size, 'price': price, 'latency_ms': latency_ms}
+                )
+            BIDS.labels(result='success' if success else 'failed').inc()
             
             # 입찰 기록
-            bid_record = {
-                'timestamp': datetime.now(),
+            self.bid_history.append({
+                'timestamp': self.clock.now(),
                 'product_url': product_url,
                 'size': size,
                 'price': price,
-                'status': 'test'  # success, failed, test
-            }
-            self.bid_history.append(bid_record)
-            
-            return False  # 테스트 모드에서는 False 반환
+                'status': status,
+                'latency_ms': latency_ms,
+                'hot': hot
+            })
             
+            # 감지 → 제출 지연을 늘리지 않도록 지연 시간 기록 후 캡처
+            if submitted:
+                if hot:
+                    self.hot_pool.capture(product_url, size, 'bid_submitted')
+                else:
+                    self.crawler.capture('bid_submitted', product_url)
         except Exception as e:
-            self.logger.error(f"입찰 실패: {e}")
-            return False
+            self.logger.error(f"입찰 후 기록 실패 (입찰 결과는 원장에 기록됨): {e}")
+        
+        return success
     
-    def monitor_and_bid(self, product_url, size, target_price, max_price=None):
+    def latency_stats(self):
+        """
+        감지 → 제출 지연 시간 통계
+        
+        Returns:
+            dict: count, p50, p95, max (초)
+        """
+        if not self.bid_latencies:
+            return {}
+        
+        values = sorted(self.bid_latencies)
+        return {
+            'count': len(values),
+            'p50': values[len(values) // 2],
+            'p95': values[min(len(values) - 1, int(len(values) * 0.95))],
+            'max': values[-1]
+        }
+    
+    def monitor_and_bid(self, product_url, size, target_price, max_price=None, check_interval=None, resume=True):
         """
         가격 모니터링 후 자동 입찰
         
@@ -79,15 +182,41 @@ class KreamAutoBidder:
             size (str): 사이즈
             target_price (int): 목표 가격
             max_price (int): 최대 가격
+            check_interval (int): 가격 확인 주기 (초), None이면 설정 파일 기준
+            resume (bool): 체크포인트가 있으면 이어서 실행 (마지막 가격, 재시도 여부, 확인 일정)
         """
+        checkpoint = Checkpointer('bidder', [product_url, size, target_price], self.config, self.clock, self.data_dir)
+        state = checkpoint.load() if resume else None
+        last_price = None
+        waiting_ids = []
+        filled = False
+        next_due = None
+        running = False
+        
+        def checkpoint_state():
+            return {'last_price': last_price, 'retry': bool(waiting_ids), 'filled': filled, 'next_due': next_due}
+        
+        if state and state.get('filled'):
+            self.logger.info("이전 실행에서 이미 체결된 목표입니다 (다시 입찰하려면 --fresh)")
+            print(f"\n✅ 이미 체결된 목표입니다: {format_price(target_price)}, 사이즈: {size}")
+            return
+        
         try:
             self.setup()
+            if self.hot_pool:
+                self.hot_pool.arm(product_url, size)
             
             # 설정값 가져오기
             if max_price is None:
                 max_price = self.config.get('bidding', {}).get('max_price', target_price)
             
-            check_interval = self.config.get('crawler', {}).get('check_interval', 60)
+            key = (product_url, size)
+            target_id = self.engine.add_target(product_url, size, target_price, max_price)
+            self.threshold_index.add(key, target_price, target_id)
+            if state:
+                # 직전 가격 기준으로 새 도달을 판단하고, 도달했지만 체결되지 않은 목표는 이어서 평가
+                last_price = state.get('last_price')
+                waiting_ids = [target_id] if state.get('retry') else []
             
             self.logger.info(f"자동 입찰 시작")
             self.logger.info(f"목표 가격: {format_price(target_price)}")
@@ -104,55 +233,107 @@ class KreamAutoBidder:
             print(f"사이즈: {size}")
             print(f"목표 가격: {format_price(target_price)}")
             print(f"{'='*50}\n")
+            poll = PollTimer('bidder', self.clock)
+            delay = resume_delay(state, check_interval or self.config.get('crawler', {}).get('check_interval', 60), self.clock)
+            if state:
+                self.logger.info(
+                    f"이전 실행에서 이어서 감시 (마지막 가격 {format_price(last_price or 0)}, 다음 확인까지 {delay:.0f}초)"
+                )
+            running = True
+            if delay:
+                poll.plan(delay)
+                self.clock.wait(self._stop, delay)
             
-            while True:
+            while not self._stop.is_set():
+                # 인자로 받은 주기가 없으면 매번 현재 설정을 따름 (설정 변경 즉시 반영)
+                interval = check_interval or self.config.get('crawler', {}).get('check_interval', 60)
+                poll.tick()
                 try:
                     # 현재 가격 조회
-                    bid_info = self.crawler.get_bid_prices(size)
+                    trace_id = self.tracer.new_trace()
+                    with self.tracer.span(trace_id, 'fetch'):
+                        bid_info = self.crawler.get_bid_prices(size)
                     
                     if not bid_info:
                         self.logger.warning("가격 정보를 가져올 수 없습니다")
-                        time.sleep(check_interval)
+                        poll.plan(interval)
+                        self.clock.wait(self._stop, interval)
                         continue
                     
                     current_price = bid_info['lowest_ask']
+                    detected_at = time.monotonic()
                     
-                    print(f"[{datetime.now().strftime('%H:%M:%S')}] 현재 최저 판매가: {format_price(current_price)}")
+                    print(f"[{self.clock.now().strftime('%H:%M:%S')}] 현재 최저 판매가: {format_price(current_price)}")
                     
-                    # 입찰 조건 확인
-                    if current_price > 0 and current_price <= target_price:
+                    # 입찰 조건 확인 (새로 도달한 목표 + 도달했지만 체결되지 않은 목표만 평가)
+                    with self.tracer.span(trace_id, 'decide'):
+                        crossed = self.threshold_index.crossed(key, last_price, current_price)
+                        candidates = crossed + [target_id for target_id in waiting_ids if target_id not in crossed]
+                        if current_price > 0:
+                            last_price = current_price
+                        
+                        intents = self.engine.evaluate({key: current_price}, candidates=candidates)
+                    for intent in intents:
                         self.logger.info(f"🎯 목표 가격 달성! 입찰 시도...")
                         
                         # 입찰 실행
-                        success = self.place_bid(product_url, size, current_price)
+                        with self.tracer.span(trace_id, 'submit'):
+                            success = self.place_bid(
+                                product_url, size, intent.price, triggered_at=detected_at, target_price=target_price
+                            )
                         
                         if success:
-                            print(f"\n✅ 입찰 성공! 가격: {format_price(current_price)}")
-                            self.logger.info(f"입찰 성공: {format_price(current_price)}")
-                            break
+                            filled = True
+                            self.engine.set_state(intent.target_id, FILLED)
+                            self.threshold_index.remove(key, target_price, intent.target_id)
+                            print(f"\n✅ 입찰 성공! 가격: {format_price(intent.price)}")
+                            self.logger.info(f"입찰 성공: {format_price(intent.price)}")
                         else:
                             print(f"\n⚠️  입찰 실패 (테스트 모드)")
                             self.logger.warning("입찰 실패 또는 테스트 모드")
+                    # 엔진이 거절했거나(최대 가격 초과 등) 제출에 실패한 목표는 가격이 목표 위로 올라갈 때까지 다시 평가
+                    waiting_ids = self.engine.waiting(candidates)
+                    if intents:
+                        # 감지 → 제출 지연을 늘리지 않도록 입찰 후에 캡처
+                        self.crawler.capture('target_hit', product_url)
+                    
+                    if self.threshold_index.count(key) == 0:
+                        break
                     
-                    elif current_price > max_price:
+                    if current_price > max_price:
                         self.logger.info(f"현재 가격({format_price(current_price)})이 최대 가격을 초과합니다")
                     
                     # 대기
-                    time.sleep(check_interval)
+                    poll.plan(interval)
+                    next_due = self.clock.time() + interval
+                    checkpoint.maybe_save(checkpoint_state)
+                    self.clock.wait(self._stop, interval)
                     
                 except KeyboardInterrupt:
                     self.logger.info("사용자가 자동 입찰을 중단했습니다")
                     break
                 except Exception as e:
                     self.logger.error(f"모니터링 중 오류: {e}")
-                    time.sleep(check_interval)
+                    poll.plan(interval)
+                    self.clock.wait(self._stop, interval)
             
         except Exception as e:
             self.logger.error(f"자동 입찰 실패: {e}")
         finally:
-            self.crawler.close()
+            if running:
+                checkpoint.save(checkpoint_state())
+            self.close()
             self._print_summary()
     
+    def close(self):
+        """브라우저 및 입찰 원장 종료"""
+        if self.hot_pool:
+            self.hot_pool.close()
+        self.crawler.close()
+        if self._owns_ledger:
+            self.ledger.close()
+        self.tracer.flush()
+    
     def _print_summary(self):
         """입찰 요약 출력"""
         if not self.bid_history:
@@ -169,24 +350,42 @@ class KreamAutoBidder:
             print(f"   가격: {format_price(bid['price'])}")
             print(f"   사이즈: {bid['size']}")
             print(f"   상태: {bid['status']}")
+        
+        stats = self.latency_stats()
+        if stats:
+            print(f"\n감지 → 제출 지연 시간: p50 {stats['p50'] * 1000:.0f}ms, "
+                  f"p95 {stats['p95'] * 1000:.0f}ms, 최대 {stats['max'] * 1000:.0f}ms")
 
 
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(description='KREAM 자동 입찰')
-    parser.add_argument('--product-url', type=str, required=True, help='상품 URL')
-    parser.add_argument('--size', type=str, required=True, help='사이즈')
+    parser.add_argument('--product-url', type=str, help='상품 URL')
+    parser.add_argument('--size', type=str, help='사이즈')
     parser.add_argument('--target-price', type=int, help='목표 가격')
     parser.add_argument('--max-price', type=int, help='최대 가격')
+    parser.add_argument('--targets', type=str, help='여러 목표 동시 입찰: 목표 목록 파일 (YAML/CSV)')
+    parser.add_argument('--max-spend', type=int, help='여러 목표 동시 입찰: 전체 지출 한도 (원)')
+    parser.add_argument('--fresh', action='store_true', help='체크포인트를 무시하고 처음부터 시작')
     
     args = parser.parse_args()
+    install_signal_handlers()
+    start_server()
+    
+    if args.targets:
+        from portfolio import PortfolioBidder, load_targets
+        PortfolioBidder(load_targets(args.targets), max_total_spend=args.max_spend).run(resume=not args.fresh)
+        return
+    
+    if not args.product_url or not args.size:
+        parser.error('--product-url과 --size가 필요합니다 (또는 --targets)')
     
     # 환경 변수에서 가격 가져오기
     target_price = args.target_price or int(get_env('TARGET_PRICE', 100000))
     max_price = args.max_price or int(get_env('MAX_PRICE', 150000))
     
     bidder = KreamAutoBidder()
-    bidder.monitor_and_bid(args.product_url, args.size, target_price, max_price)
+    bidder.monitor_and_bid(args.product_url, args.size, target_price, max_price, resume=not args.fresh)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,295 @@
+"""
+입찰 전략 백테스트 모듈
+
+저장된 가격 이력을 입찰 로직에 다시 흘려보내 전략 파라미터
+(목표 가격, 최대 가격, 가격 단위, 적응형 할인 규칙)를 오프라인으로 평가합니다.
+파라미터 조합은 벡터 연산으로 한 번에 평가하고, 상품별로 프로세스 풀에서 병렬 처리합니다.
+
+입찰 로직은 KreamAutoBidder와 같습니다: 구간(episode)마다 목표가 새로 감시를 시작하고,
+최저 판매가가 기준 이하가 되는 첫 시점에 가격 단위로 내림한 가격(최소 가격 이상)으로 입찰합니다.
+"""
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from utils import setup_logger, load_config, format_price
+
+
+GRID_COLUMNS = ['target_price', 'max_price', 'price_step', 'min_price', 'discount', 'window']
+
+
+def build_grid(target_prices, max_prices, price_steps, min_prices=(0,), discounts=(0.0,), windows=(60,)):
+    """
+    파라미터 조합 생성
+
+    Args:
+        target_prices: 목표 가격 목록
+        max_prices: 최대 가격 목록
+        price_steps: 가격 단위 목록
+        min_prices: 최소 입찰 가격 목록
+        discounts: 적응형 할인율 목록 (0이면 미사용, 이동평균 대비 할인된 가격 이하일 때만 입찰)
+        windows: 적응형 규칙의 이동평균 샘플 수 목록
+
+    Returns:
+        pd.DataFrame: 조합별 파라미터
+    """
+    rows = [
+        combo for combo in itertools.product(target_prices, max_prices, price_steps, min_prices, discounts, windows)
+        if combo[0] <= combo[1]
+    ]
+    return pd.DataFrame(rows, columns=GRID_COLUMNS)
+
+
+def load_history(db_path=None, csv_path=None):
+    """
+    가격 이력 로드
+
+    Args:
+        db_path (str): HistoryStore 데이터베이스 경로
+        csv_path (str): 가격 이력 CSV 경로
+
+    Returns:
+        pd.DataFrame: product_url, size, timestamp, lowest_ask 열
+    """
+    if csv_path:
+        df = pd.read_csv(csv_path, encoding='utf-8-sig')
+        if 'product_url' not in df.columns:
+            df['product_url'] = ''
+    else:
+        import sqlite3
+        conn = sqlite3.connect(db_path)
+        try:
+            df = pd.read_sql_query(
+                'SELECT product_url, size, timestamp, lowest_ask FROM price_history '
+                'ORDER BY product_url, size, timestamp',
+                conn
+            )
+        finally:
+            conn.close()
+
+    df['size'] = df['size'].fillna('').astype(str)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df[['product_url', 'size', 'timestamp', 'lowest_ask']].sort_values(
+        ['product_url', 'size', 'timestamp'], kind='stable'
+    )
+
+
+def simulate_series(market, episode_starts, grid, fill_model='immediate', horizon=10):
+    """
+    가격 시계열 하나에 대해 모든 파라미터 조합 평가
+
+    Args:
+        market (np.ndarray): 최저 판매가 (0 이하는 가격 없음)
+        episode_starts (np.ndarray): 구간 시작 인덱스
+        grid (dict): GRID_COLUMNS별 배열
+        fill_model (str): immediate(감지 즉시 체결) 또는 touch(이후 horizon 샘플 안에 입찰가 이하 도달 시 체결)
+        horizon (int): touch 모델의 체결 확인 샘플 수
+
+    Returns:
+        dict: 조합별 triggers, fills, fill_price_sum, best_price_sum 배열
+    """
+    n = len(grid['target_price'])
+    triggers = np.zeros(n, dtype=np.int64)
+    fills = np.zeros(n, dtype=np.int64)
+    fill_price_sum = np.zeros(n, dtype=np.float64)
+
+    market = np.where(market > 0, market, np.inf).astype(np.float64)
+    episode_ends = np.append(episode_starts[1:], len(market))
+
+    if fill_model == 'touch':
+        forward_min = (
+            pd.Series(market[::-1]).rolling(horizon, min_periods=1).min().to_numpy()[::-1]
+        )
+        forward_min = np.append(forward_min[1:], np.inf)
+
+    # 최대 가격을 넘는 입찰은 하지 않으므로 기준은 min(목표, 최대)
+    threshold = np.minimum(grid['target_price'], grid['max_price']).astype(np.float64)
+    valid = grid['min_price'] <= grid['max_price']
+    rules = np.stack([grid['discount'], grid['window'], grid['min_price']], axis=1)
+
+    for discount, window, floor in np.unique(rules, axis=0):
+        members = np.flatnonzero(
+            (rules[:, 0] == discount) & (rules[:, 1] == window) & (rules[:, 2] == floor) & valid
+        )
+        if members.size == 0:
+            continue
+
+        eligible = market
+        if discount > 0:
+            rolling = pd.Series(market).replace(np.inf, np.nan).rolling(int(window), min_periods=1).mean()
+            eligible = np.where(market <= rolling.to_numpy() * (1 - discount), market, np.inf)
+        if floor > 0:
+            # 최저 판매가가 최소 입찰 가격보다 낮으면 엔진이 입찰하지 않으므로 감지에서 제외
+            eligible = np.where(eligible >= floor, eligible, np.inf)
+
+        member_threshold = threshold[members]
+        step = grid['price_step'][members]
+
+        for start, end in zip(episode_starts, episode_ends):
+            # 구간 내 누적 최저가는 단조 감소하므로 이분 탐색으로 첫 도달 시점을 찾음
+            prefix_min = np.minimum.accumulate(eligible[start:end])
+            offset = np.searchsorted(-prefix_min, -member_threshold, side='left')
+            hit = offset < (end - start)
+            if not hit.any():
+                continue
+
+            hit_members = members[hit]
+            trigger_at = start + offset[hit]
+            price = market[trigger_at]
+            bid = np.maximum(np.floor(price / step[hit]) * step[hit], floor)
+
+            if fill_model == 'touch':
+                filled = forward_min[trigger_at] <= bid
+            else:
+                filled = np.ones(len(bid), dtype=bool)
+
+            triggers[hit_members] += 1
+            fills[hit_members[filled]] += 1
+            fill_price_sum[hit_members[filled]] += bid[filled]
+
+    return {'triggers': triggers, 'fills': fills, 'fill_price_sum': fill_price_sum}
+
+
+def _run_product(args):
+    """프로세스 풀 작업: (상품, 사이즈) 하나 평가"""
+    key, timestamps, market, grid, episode, fill_model, horizon = args
+    episode_ids = pd.DatetimeIndex(timestamps).floor(episode).asi8
+    _, episode_starts = np.unique(episode_ids, return_index=True)
+    result = simulate_series(market, episode_starts, grid, fill_model, horizon)
+    result['episodes'] = len(episode_starts)
+    return key, result
+
+
+class Backtester:
+    """입찰 전략 백테스트 엔진"""
+
+    def __init__(self, history, workers=None, episode='1D', fill_model='immediate', horizon=10):
+        """
+        초기화
+
+        Args:
+            history (pd.DataFrame): load_history() 결과
+            workers (int): 프로세스 수
+            episode (str): 목표가 다시 감시를 시작하는 구간 (pandas 주기 문자열)
+            fill_model (str): immediate 또는 touch
+            horizon (int): touch 모델의 체결 확인 샘플 수
+        """
+        self.logger = setup_logger('Backtester', 'logs/backtest.log')
+        self.history = history
+        self.workers = workers
+        self.episode = episode
+        self.fill_model = fill_model
+        self.horizon = horizon
+
+    def run(self, grid):
+        """
+        백테스트 실행
+
+        Args:
+            grid (pd.DataFrame): build_grid() 결과
+
+        Returns:
+            pd.DataFrame: 조합별 결과 (fills, avg_price, missed 등)
+        """
+        start_time = time.time()
+        grid_arrays = {column: grid[column].to_numpy() for column in GRID_COLUMNS}
+
+        tasks = [
+            (key, group['timestamp'].to_numpy(), group['lowest_ask'].to_numpy(),
+             grid_arrays, self.episode, self.fill_model, self.horizon)
+            for key, group in self.history.groupby(['product_url', 'size'], sort=False)
+        ]
+
+        totals = {name: np.zeros(len(grid), dtype=np.float64) for name in ('triggers', 'fills', 'fill_price_sum')}
+        episodes = 0
+
+        if len(tasks) > 1 and self.workers != 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(_run_product, tasks))
+        else:
+            results = [_run_product(task) for task in tasks]
+
+        for _, result in results:
+            episodes += result['episodes']
+            for name in totals:
+                totals[name] += result[name]
+
+        report = grid.copy()
+        report['episodes'] = episodes
+        report['triggers'] = totals['triggers'].astype(np.int64)
+        report['fills'] = totals['fills'].astype(np.int64)
+        report['missed'] = report['triggers'] - report['fills']
+        report['avg_price'] = np.where(
+            report['fills'] > 0, totals['fill_price_sum'] / np.maximum(report['fills'], 1), np.nan
+        )
+        report['fill_rate'] = report['fills'] / max(episodes, 1)
+
+        self.logger.info(
+            f"백테스트 완료: 조합 {len(grid)}개 × 시계열 {len(tasks)}개 "
+            f"({len(self.history)}건) - {time.time() - start_time:.2f}초"
+        )
+        return report.sort_values(['fills', 'avg_price'], ascending=[False, True]).reset_index(drop=True)
+
+
+def _parse_range(value):
+    """'시작:끝:간격' 또는 '값,값,...' 형식을 목록으로 변환"""
+    if ':' in value:
+        start, stop, step = (float(v) for v in value.split(':'))
+        values = np.arange(start, stop + step / 2, step)
+    else:
+        values = [float(v) for v in value.split(',')]
+    return [int(v) if float(v).is_integer() else v for v in values]
+
+
+def main():
+    """메인 함수"""
+    config = load_config()
+    bidding_config = config.get('bidding', {})
+
+    parser = argparse.ArgumentParser(description='입찰 전략 백테스트')
+    parser.add_argument('--db', type=str, default=config.get('storage', {}).get('history_db', 'data/history.db'),
+                        help='가격 이력 데이터베이스')
+    parser.add_argument('--csv', type=str, help='가격 이력 CSV (지정 시 데이터베이스 대신 사용)')
+    parser.add_argument('--target-prices', type=str, required=True, help="목표 가격 ('80000:120000:1000' 또는 '90000,100000')")
+    parser.add_argument('--max-prices', type=str, default=str(bidding_config.get('max_price', 200000)), help='최대 가격 목록')
+    parser.add_argument('--price-steps', type=str, default=str(bidding_config.get('price_step', 1000)), help='가격 단위 목록')
+    parser.add_argument('--min-prices', type=str, default=str(bidding_config.get('min_price', 0)), help='최소 입찰 가격 목록')
+    parser.add_argument('--discounts', type=str, default='0', help='적응형 할인율 목록 (예: 0,0.03,0.05)')
+    parser.add_argument('--windows', type=str, default='60', help='적응형 이동평균 샘플 수 목록')
+    parser.add_argument('--episode', type=str, default='1D', help='목표 재감시 구간 (예: 1D, 12h)')
+    parser.add_argument('--fill-model', choices=['immediate', 'touch'], default='immediate', help='체결 모델')
+    parser.add_argument('--horizon', type=int, default=10, help='touch 모델 체결 확인 샘플 수')
+    parser.add_argument('--workers', type=int, help='프로세스 수')
+    parser.add_argument('--output', type=str, help='결과 CSV 저장 경로')
+    parser.add_argument('--top', type=int, default=10, help='출력할 상위 조합 수')
+
+    args = parser.parse_args()
+
+    history = load_history(db_path=args.db, csv_path=args.csv)
+    grid = build_grid(
+        _parse_range(args.target_prices), _parse_range(args.max_prices), _parse_range(args.price_steps),
+        _parse_range(args.min_prices), _parse_range(args.discounts), _parse_range(args.windows)
+    )
+
+    start_time = time.time()
+    backtester = Backtester(history, workers=args.workers, episode=args.episode,
+                            fill_model=args.fill_model, horizon=args.horizon)
+    report = backtester.run(grid)
+    elapsed = time.time() - start_time
+
+    print(f"\n=== 백테스트 결과 (조합 {len(grid)}개, {elapsed:.2f}초) ===")
+    for _, row in report.head(args.top).iterrows():
+        avg_price = format_price(int(row['avg_price'])) if row['fills'] else '-'
+        print(f"목표 {format_price(int(row['target_price']))} / 최대 {format_price(int(row['max_price']))} / "
+              f"단위 {int(row['price_step'])} / 할인 {row['discount']:.0%}: "
+              f"체결 {row['fills']}/{row['episodes']}, 평균 {avg_price}, 놓침 {row['missed']}")
+
+    if args.output:
+        report.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
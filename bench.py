@@ -0,0 +1,460 @@
+"""
+성능 벤치마크 모음
+
+마이크로 벤치마크(가격 파싱, 이력 저장, 통계, 입찰 결정 등)와
+매크로 벤치마크(N개 목표 × M분 가격 확인을 로컬 대역 크롤러로 시뮬레이션)를 실행합니다.
+브라우저나 네트워크 없이 실행되며, 결과는 JSON으로 저장하고 기준선과 비교합니다.
+
+실행:
+    python bench.py                              # 실행 후 benchmarks/<커밋>.json 저장
+    python bench.py --update-baseline            # 기준선(benchmarks/baseline.json) 갱신
+    python bench.py --compare benchmarks/baseline.json --threshold 0.2
+    python bench.py --filter engine --quick
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import platform
+import argparse
+import tempfile
+import subprocess
+import zlib
+from datetime import datetime
+from types import SimpleNamespace
+
+
+BENCH_DIR = 'benchmarks'
+BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+_benchmarks = []
+
+
+def benchmark(name, number=1000, kind='micro'):
+    """
+    벤치마크 등록 데코레이터
+
+    등록한 함수는 준비 작업 후 측정할 함수(인자 없음)를 반환합니다.
+
+    Args:
+        name (str): 벤치마크 이름
+        number (int): 1회 측정에서 호출할 횟수
+        kind (str): micro 또는 macro
+    """
+    def register(setup):
+        _benchmarks.append(SimpleNamespace(name=name, number=number, kind=kind, setup=setup))
+        return setup
+    return register
+
+
+def measure(func, number, repeat):
+    """
+    반복 측정 후 가장 빠른 회차의 호출당 시간
+
+    Args:
+        func: 측정할 함수
+        number (int): 회차당 호출 횟수
+        repeat (int): 회차 수
+
+    Returns:
+        float: 호출당 시간 (µs)
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - started) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e6
+
+
+class StandInCrawler:
+    """
+    로컬 대역 크롤러 (KreamCrawler 인터페이스, 상품/사이즈별 고정 시드 랜덤 워크 가격)
+
+    가격 시퀀스는 모든 인스턴스가 공유하므로 풀에서 어느 크롤러가 조회하든
+    같은 실행은 같은 가격과 체결 수를 냅니다 (실행 전 reset() 호출).
+    """
+
+    walks = {}
+
+    def __init__(self, *args, **kwargs):
+        self.product_url = None
+        self.driver = None
+        self.is_logged_in = False
+
+    @classmethod
+    def reset(cls):
+        """공유 가격 시퀀스 초기화"""
+        cls.walks = {}
+
+    def setup_driver(self):
+        self.driver = self
+
+    def login(self, *args, **kwargs):
+        self.is_logged_in = True
+        return True
+
+    def get_product_info(self, product_url):
+        self.product_url = product_url
+        return {'name': product_url, 'url': product_url}
+
+    def get_bid_prices(self, size=None):
+        key = (self.product_url, size)
+        walk = self.walks.get(key)
+        if walk is None:
+            from fake_driver import price_walk
+            seed = zlib.crc32(str(key).encode('utf-8'))
+            walk = self.walks[key] = price_walk(100000 + seed % 50 * 1000, step=1000, seed=seed)
+        return dict(next(walk), size=size)
+
+    def open_bid_form(self, product_url, size):
+        return True
+
+    def submit_bid_form(self, price):
+        return True
+
+    def capture(self, event, page=None):
+        return False
+
+    def close(self):
+        self.driver = None
+        self.is_logged_in = False
+
+
+# ---------------------------------------------------------------------------
+# 마이크로 벤치마크
+# ---------------------------------------------------------------------------
+
+@benchmark('parse_price', number=20000)
+def bench_parse_price():
+    from utils import parse_price
+    return lambda: parse_price('1,234,000원')
+
+
+@benchmark('history_append', number=500)
+def bench_history_append():
+    from history_store import HistoryStore
+    store = HistoryStore(os.path.join(_tmpdir(), 'history.db'))
+    counter = iter(range(10 ** 9))
+
+    def run():
+        i = next(counter)
+        store.add({'timestamp': f'2024-01-01 00:00:00.{i:09d}', 'size': '270',
+                   'buy_now_price': i, 'highest_bid': i, 'lowest_ask': i}, 'bench')
+    return run
+
+
+@benchmark('monitor_stats_1k', number=20)
+def bench_monitor_stats():
+    from price_monitor import PriceMonitor
+    history = [{'buy_now_price': 100000 + i % 977, 'highest_bid': 0, 'lowest_ask': 0} for i in range(1000)]
+    holder = SimpleNamespace(price_history=history)
+    return lambda: PriceMonitor.get_statistics(holder)
+
+
+@benchmark('engine_evaluate_10k', number=200)
+def bench_engine_evaluate():
+    from bid_engine import BidDecisionEngine
+    engine = BidDecisionEngine({'bidding': {}}, capacity=10000)
+    rng = random.Random(1)
+    keys = [(f'p{i}', '270') for i in range(1000)]
+    for i in range(10000):
+        engine.add_target(*keys[i % 1000], target_price=rng.randrange(80000, 120000, 1000), max_price=150000)
+    prices = {key: rng.randrange(80000, 140000, 1000) for key in keys}
+    return lambda: engine.evaluate(prices)
+
+
+@benchmark('threshold_crossed', number=20000)
+def bench_threshold_crossed():
+    from threshold_index import ThresholdIndex
+    index = ThresholdIndex()
+    for i in range(1000):
+        index.add(('p', '270'), 80000 + i * 100, i)
+    return lambda: index.crossed(('p', '270'), 130000, 120000)
+
+
+@benchmark('ledger_begin_finish', number=2000)
+def bench_ledger():
+    from bid_ledger import BidLedger
+    ledger = _closing(BidLedger(os.path.join(_tmpdir(), 'bids.db'), {'ledger': {}}))
+    counter = iter(range(10 ** 9))
+
+    def run():
+        key = ledger.begin('bench', '270', next(counter), 1)
+        ledger.finish(key, 'test', 1, False)
+    return run
+
+
+@benchmark('tracer_span', number=50000)
+def bench_tracer_span():
+    from tracing import Tracer
+    tracer = _closing(Tracer(os.path.join(_tmpdir(), 'trace.jsonl'), enabled=True, flush_interval=0.2))
+
+    def run():
+        with tracer.span(1, 'decide'):
+            pass
+    return run
+
+
+@benchmark('snapshot_cache_get', number=50000)
+def bench_snapshot_cache():
+    from snapshot_cache import SnapshotCache
+    cache = SnapshotCache(ttl=60)
+    cache.put('p', '270', {'lowest_ask': 1})
+    return lambda: cache.is_fresh('p', '270')
+
+
+@benchmark('metrics_counter_inc', number=50000)
+def bench_metrics_counter():
+    from metrics import POLLS
+    counter = POLLS.labels(component='bench')
+    return counter.inc
+
+
+@benchmark('metrics_histogram_observe', number=50000)
+def bench_metrics_histogram():
+    from metrics import FETCH_SECONDS
+    return lambda: FETCH_SECONDS.observe(0.12)
+
+
+@benchmark('crawler_fake_driver_prices', number=5000)
+def bench_crawler_fake_driver():
+    from fake_driver import FakeDriver
+    from kream_crawler import KreamCrawler
+    crawler = KreamCrawler(driver_factory=FakeDriver)
+    crawler.setup_driver()
+    crawler.driver.get('https://kream.co.kr/products/bench')
+    crawler.logger.disabled = True
+    return lambda: crawler.get_bid_prices('270')
+
+
+# ---------------------------------------------------------------------------
+# 매크로 벤치마크
+# ---------------------------------------------------------------------------
+
+def polling_pipeline(items, minutes, crawlers=2):
+    """
+    N개 목표 × M분 가격 확인 시뮬레이션 (1분에 한 번 확인, 대기 없음)
+
+    Args:
+        items (int): 감시 목표 수
+        minutes (int): 시뮬레이션 시간 (분)
+        crawlers (int): 대역 크롤러 수
+
+    Returns:
+        dict: 틱당 시간, 체결 수
+    """
+    from auto_bidder import KreamAutoBidder
+    from bid_ledger import BidLedger
+    from crawler_pool import CrawlerPool
+    from portfolio import PortfolioBidder
+    from tracing import Tracer
+
+    StandInCrawler.reset()
+    tmpdir = _tmpdir()
+    bidder = KreamAutoBidder(ledger=BidLedger(os.path.join(tmpdir, 'bids.db'), {'ledger': {}}), data_dir=tmpdir)
+    bidder.crawler = StandInCrawler()
+    bidder.tracer = Tracer(os.path.join(tmpdir, 'trace.jsonl'), enabled=True)
+
+    rng = random.Random(7)
+    targets = [
+        {'product_url': f'https://kream.co.kr/products/{i // 4}', 'size': str(250 + (i % 4) * 5),
+         'target_price': rng.randrange(90000, 130000, 1000), 'max_price': 160000}
+        for i in range(items)
+    ]
+    portfolio = PortfolioBidder(targets, max_total_spend=10 ** 12, crawlers=crawlers, bidder=bidder)
+    portfolio.pool = CrawlerPool(crawlers, {'crawler': {'request_delay': 0}}, StandInCrawler, login=False)
+    portfolio.pool.start()
+
+    tick_times = []
+    try:
+        for _ in range(minutes):
+            started = time.perf_counter()
+            keys = portfolio.active_keys()
+            if not keys:
+                break
+            snapshots = portfolio.pool.fetch(keys)
+            for (product_url, size), bid_info in snapshots.items():
+                portfolio.cache.put(product_url, size, bid_info)
+            portfolio.tick({key: bid_info['lowest_ask'] for key, bid_info in snapshots.items()})
+            tick_times.append(time.perf_counter() - started)
+    finally:
+        portfolio.pool.close()
+        bidder.ledger.close()
+        bidder.tracer.close()
+
+    tick_times.sort()
+    return {
+        'ticks': len(tick_times),
+        'tick_p50_ms': tick_times[len(tick_times) // 2] * 1000 if tick_times else 0.0,
+        'tick_p95_ms': tick_times[min(len(tick_times) - 1, int(len(tick_times) * 0.95))] * 1000 if tick_times else 0.0,
+        'filled': portfolio.state_counts().get('filled', 0),
+    }
+
+
+_tmpdirs = []
+_closers = []
+
+
+def _tmpdir():
+    """벤치마크용 임시 디렉토리 (종료 시 삭제)"""
+    tmp = tempfile.TemporaryDirectory(prefix='kream_bench_')
+    _tmpdirs.append(tmp)
+    return tmp.name
+
+
+def _closing(resource):
+    """
+    벤치마크가 끝나면 닫을 자원 등록 (백그라운드 기록 스레드가 다음 측정에 끼어들지 않도록)
+
+    Args:
+        resource: close() 메서드가 있는 객체
+
+    Returns:
+        resource 그대로
+    """
+    _closers.append(resource.close)
+    return resource
+
+
+def git_commit():
+    """현재 커밋 (git이 없으면 unknown)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(filter_text=None, repeat=5, quick=False, items=200, minutes=30):
+    """
+    벤치마크 실행
+
+    Args:
+        filter_text (str): 이름에 이 문자열이 포함된 벤치마크만 실행
+        repeat (int): 회차 수
+        quick (bool): 호출 횟수를 1/10로 줄임
+        items (int): 매크로 벤치마크 목표 수
+        minutes (int): 매크로 벤치마크 시뮬레이션 시간 (분)
+
+    Returns:
+        dict: {'meta': ..., 'results': {이름: 결과}}
+    """
+    # 벤치마크 중에는 경고 이상만 출력
+    logging.disable(logging.INFO)
+
+    results = {}
+    for bench in _benchmarks:
+        if filter_text and filter_text not in bench.name:
+            continue
+        number = max(1, bench.number // 10) if quick else bench.number
+        func = bench.setup()
+        func()  # 준비 호출 (지연 import, 캐시 등)
+        per_op = measure(func, number, repeat)
+        while _closers:
+            _closers.pop()()
+        results[bench.name] = {'kind': bench.kind, 'us_per_op': round(per_op, 3)}
+        print(f"  {bench.name:<24} {per_op:12.3f} µs/op")
+
+    macro_name = f'polling_{items}x{minutes}m'
+    if not filter_text or filter_text in macro_name:
+        started = time.perf_counter()
+        stats = polling_pipeline(items, max(1, minutes // 10) if quick else minutes)
+        total = time.perf_counter() - started
+        results[macro_name] = dict(kind='macro', us_per_op=round(stats['tick_p50_ms'] * 1000, 3),
+                                   total_s=round(total, 3), **stats)
+        print(f"  {macro_name:<24} {stats['tick_p50_ms']:12.3f} ms/tick (p95 {stats['tick_p95_ms']:.3f}ms, "
+              f"{stats['ticks']} ticks, {stats['filled']} filled, {total:.2f}s)")
+
+    logging.disable(logging.NOTSET)
+    for tmp in _tmpdirs:
+        tmp.cleanup()
+    _tmpdirs.clear()
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'quick': quick,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=0.2):
+    """
+    기준선과 비교
+
+    Args:
+        current (dict): 이번 결과
+        baseline (dict): 기준선 결과
+        threshold (float): 허용 느려짐 비율 (0.2 = 20%)
+
+    Returns:
+        list: 회귀한 벤치마크 설명 목록
+    """
+    regressions = []
+    print(f"\n=== 기준선 비교 ({baseline['meta'].get('commit')} → {current['meta'].get('commit')}) ===")
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if not base or not base.get('us_per_op'):
+            print(f"  {name:<24} (기준선 없음)")
+            continue
+        ratio = result['us_per_op'] / base['us_per_op']
+        mark = '❌' if ratio > 1 + threshold else ('✅' if ratio < 1 - threshold else '  ')
+        print(f"  {name:<24} {base['us_per_op']:12.3f} → {result['us_per_op']:12.3f} µs  {ratio:6.2f}x {mark}")
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {ratio:.2f}x 느려짐")
+    return regressions
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='성능 벤치마크')
+    parser.add_argument('--filter', type=str, help='이름에 이 문자열이 포함된 벤치마크만 실행')
+    parser.add_argument('--repeat', type=int, default=5, help='회차 수 (가장 빠른 회차 사용)')
+    parser.add_argument('--quick', action='store_true', help='호출 횟수를 줄여 빠르게 실행')
+    parser.add_argument('--items', type=int, default=200, help='매크로 벤치마크 목표 수')
+    parser.add_argument('--minutes', type=int, default=30, help='매크로 벤치마크 시뮬레이션 시간 (분)')
+    parser.add_argument('--save', type=str, help='결과 파일 (기본: benchmarks/<커밋>.json)')
+    parser.add_argument('--compare', type=str, nargs='?', const=BASELINE, help='비교할 기준선 파일')
+    parser.add_argument('--threshold', type=float, default=0.2, help='회귀로 판단할 느려짐 비율')
+    parser.add_argument('--update-baseline', action='store_true', help='결과를 기준선으로 저장')
+
+    args = parser.parse_args()
+
+    print("=== 벤치마크 실행 ===")
+    current = run(args.filter, args.repeat, args.quick, args.items, args.minutes)
+
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    path = args.save or os.path.join(BENCH_DIR, f"{current['meta']['commit']}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(current, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {path}")
+
+    if args.update_baseline:
+        with open(BASELINE, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"기준선 갱신: {BASELINE}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print("\n❌ 성능 회귀:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\n✅ 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
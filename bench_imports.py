@@ -0,0 +1,102 @@
+"""
+진입점 import 시간 벤치마크
+
+진입점마다 새 프로세스에서 `python -X importtime`을 실행하여 전체 import 시간과
+가장 무거운 모듈을 출력합니다. 예산(ms)을 넘거나, 진입점에서 불러오면 안 되는
+무거운 패키지(pandas, selenium 등)가 import되면 실패(종료 코드 1)합니다.
+
+실행:
+    python bench_imports.py
+    python bench_imports.py --repeat 5 --top 15 main auto_bidder
+"""
+import sys
+import argparse
+import subprocess
+
+
+# 진입점별 import 시간 예산 (ms)
+BUDGETS_MS = {
+    'main': 150,
+    'price_monitor': 150,
+    'auto_bidder': 250,
+    'portfolio': 250,
+    'daemon': 300,
+    'tracing': 150,
+}
+
+# 진입점에서 바로 불러오면 안 되는 패키지 (실제로 필요한 경로에서만 불러옴)
+LAZY_PACKAGES = ('pandas', 'selenium', 'webdriver_manager', 'openpyxl', 'streamlit')
+
+
+def measure(module):
+    """
+    새 프로세스에서 모듈 import 시간 측정
+
+    Args:
+        module (str): 모듈 이름
+
+    Returns:
+        tuple: (전체 시간 ms, {모듈: 누적 시간 ms})
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{result.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        if name.strip() == 'site' and not name.startswith('  '):
+            # 인터프리터 시작(site)에서 불러온 모듈은 제외
+            cumulative = {}
+            continue
+        cumulative[name.strip()] = int(cumulative_us) / 1000
+    return cumulative.get(module, 0.0), cumulative
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='진입점 import 시간 벤치마크')
+    parser.add_argument('modules', nargs='*', help=f"측정할 진입점 (기본: {', '.join(BUDGETS_MS)})")
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최솟값 사용)')
+    parser.add_argument('--top', type=int, default=10, help='출력할 무거운 모듈 수')
+    parser.add_argument('--scale', type=float, default=1.0, help='예산 배율 (느린 장비용)')
+
+    args = parser.parse_args()
+    modules = args.modules or list(BUDGETS_MS)
+
+    failures = []
+    for module in modules:
+        runs = [measure(module) for _ in range(max(1, args.repeat))]
+        total, cumulative = min(runs, key=lambda run: run[0])
+        budget = BUDGETS_MS.get(module)
+
+        status = ''
+        if budget is not None:
+            limit = budget * args.scale
+            status = f" / 예산 {limit:.0f}ms {'✅' if total <= limit else '❌'}"
+            if total > limit:
+                failures.append(f"{module}: {total:.0f}ms > 예산 {limit:.0f}ms")
+
+        print(f"\n=== {module}: {total:.1f}ms{status} ===")
+        for name, ms in sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[1:args.top + 1]:
+            print(f"  {ms:8.1f}ms  {name}")
+
+        loaded = sorted({name.split('.')[0] for name in cumulative} & set(LAZY_PACKAGES))
+        if loaded:
+            failures.append(f"{module}: 무거운 패키지를 바로 불러옴 ({', '.join(loaded)})")
+
+    if failures:
+        print("\n❌ import 시간 회귀:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ 모든 진입점이 예산 안에 있습니다")
+
+
+if __name__ == "__main__":
+    main()
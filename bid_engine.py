@@ -0,0 +1,259 @@
+"""
+입찰 결정 엔진 모듈
+
+활성화된 입찰 목표를 열(column) 단위 배열로 보관하고,
+가격 스냅샷마다 모든 목표를 벡터 연산으로 한 번에 평가합니다.
+"""
+from collections import namedtuple
+from itertools import repeat
+import numpy as np
+from utils import load_config
+
+
+# 목표 상태
+ARMED = 0       # 감시 중
+TRIGGERED = 1   # 입찰 조건 달성 (입찰 진행 중)
+FILLED = 2      # 입찰 완료
+CANCELLED = 3   # 취소됨
+
+STATE_NAMES = {
+    ARMED: 'armed',
+    TRIGGERED: 'triggered',
+    FILLED: 'filled',
+    CANCELLED: 'cancelled'
+}
+
+BidIntent = namedtuple('BidIntent', ['target_id', 'product_url', 'size', 'price', 'market_price'])
+
+
+class IntentBatch:
+    """
+    배열 기반 입찰 의도 목록
+
+    평가 결과를 목표 ID/입찰가/시장가 배열로 보관하고,
+    순회하거나 인덱싱할 때만 BidIntent를 만듭니다.
+    """
+
+    def __init__(self, engine, target_ids, prices, market_prices):
+        """
+        초기화
+
+        Args:
+            engine (BidDecisionEngine): 키 조회에 사용할 엔진
+            target_ids (np.ndarray): 목표 ID 배열
+            prices (np.ndarray): 입찰 가격 배열
+            market_prices (np.ndarray): 시장 가격 배열
+        """
+        self.engine = engine
+        self.target_ids = target_ids
+        self.prices = prices
+        self.market_prices = market_prices
+
+    def __len__(self):
+        return len(self.target_ids)
+
+    def __getitem__(self, index):
+        target_id = int(self.target_ids[index])
+        product_url, size = self.engine.get_key(target_id)
+        return BidIntent(target_id, product_url, size, int(self.prices[index]), int(self.market_prices[index]))
+
+    def __iter__(self):
+        for index in range(len(self.target_ids)):
+            yield self[index]
+
+
+class BidDecisionEngine:
+    """벡터화된 입찰 결정 엔진"""
+
+    def __init__(self, config=None, capacity=1024):
+        """
+        초기화
+
+        Args:
+            config (dict): 설정 (None이면 config.yaml 로드)
+            capacity (int): 초기 배열 크기
+        """
+        self.configure(config if config is not None else load_config())
+
+        self.count = 0
+        self._keys = {}
+        self._key_list = []
+        self.market = np.zeros(64, dtype=np.int64)
+
+        self.key_idx = np.zeros(capacity, dtype=np.int64)
+        self.target = np.zeros(capacity, dtype=np.int64)
+        self.max_price = np.zeros(capacity, dtype=np.int64)
+        self.min_price = np.zeros(capacity, dtype=np.int64)
+        self.price_step = np.ones(capacity, dtype=np.int64)
+        self.state = np.full(capacity, CANCELLED, dtype=np.int8)
+
+    def configure(self, config):
+        """
+        기본 가격 한도 적용 (이후 추가되는 목표부터 사용)
+
+        Args:
+            config (dict): 설정
+        """
+        self.config = config
+        bidding_config = config.get('bidding', {})
+        self.default_min_price = bidding_config.get('min_price', 0)
+        self.default_max_price = bidding_config.get('max_price', 0)
+        self.default_price_step = bidding_config.get('price_step', 1000)
+
+    def _grow(self):
+        """배열 크기 두 배로 확장"""
+        capacity = len(self.target) * 2
+        for name in ('key_idx', 'target', 'max_price', 'min_price', 'price_step'):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+        state = np.full(capacity, CANCELLED, dtype=np.int8)
+        state[:len(self.state)] = self.state
+        self.state = state
+
+    def _key_code(self, product_url, size):
+        """(상품, 사이즈) 키 번호"""
+        key = (product_url, size)
+        code = self._keys.get(key)
+        if code is None:
+            code = len(self._key_list)
+            self._keys[key] = code
+            self._key_list.append(key)
+            if code == len(self.market):
+                market = np.zeros(len(self.market) * 2, dtype=np.int64)
+                market[:code] = self.market
+                self.market = market
+        return code
+
+    def add_target(self, product_url, size, target_price, max_price=None, min_price=None, price_step=None):
+        """
+        입찰 목표 추가
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+            target_price (int): 목표 가격
+            max_price (int): 최대 가격
+            min_price (int): 최소 입찰 가격
+            price_step (int): 가격 단위
+
+        Returns:
+            int: 목표 ID
+        """
+        if self.count == len(self.target):
+            self._grow()
+
+        target_id = self.count
+        self.key_idx[target_id] = self._key_code(product_url, size)
+        self.target[target_id] = target_price
+        self.max_price[target_id] = max_price if max_price is not None else max(self.default_max_price, target_price)
+        self.min_price[target_id] = min_price if min_price is not None else self.default_min_price
+        self.price_step[target_id] = max(1, price_step or self.default_price_step)
+        self.state[target_id] = ARMED
+        self.count += 1
+        return target_id
+
+    def set_state(self, target_ids, state):
+        """
+        목표 상태 변경
+
+        Args:
+            target_ids: 목표 ID 또는 ID 목록
+            state (int): 새 상태
+        """
+        self.state[np.asarray(target_ids, dtype=np.int64)] = state
+
+    def get_key(self, target_id):
+        """
+        목표의 (상품 URL, 사이즈)
+
+        Args:
+            target_id (int): 목표 ID
+
+        Returns:
+            tuple: (product_url, size)
+        """
+        return self._key_list[self.key_idx[target_id]]
+
+    def update_prices(self, prices):
+        """
+        최신 시장 가격 반영 (변경된 키만 전달하면 됨)
+
+        Args:
+            prices (dict): {(product_url, size): 최저 판매가}
+        """
+        keys = self._keys
+        codes = np.fromiter(map(keys.get, prices, repeat(-1)), dtype=np.int64, count=len(prices))
+        values = np.fromiter((price or 0 for price in prices.values()), dtype=np.int64, count=len(prices))
+        known = codes >= 0
+        self.market[codes[known]] = values[known]
+
+    def decide(self, candidates=None):
+        """
+        현재 시장 가격으로 입찰 대상 계산 (벡터 연산)
+
+        Args:
+            candidates: 평가할 목표 ID 목록 (None이면 전체)
+
+        Returns:
+            tuple: (목표 ID 배열, 입찰 가격 배열, 시장 가격 배열)
+        """
+        if candidates is None:
+            # 전체 평가는 인덱스 배열 대신 슬라이스(뷰)로 읽어 복사를 줄임
+            ids = slice(0, self.count)
+        else:
+            ids = np.asarray(candidates, dtype=np.int64)
+
+        market = self.market[self.key_idx[ids]]
+        step = self.price_step[ids]
+        bid = np.maximum(market // step * step, self.min_price[ids])
+
+        # 최소 입찰 가격이 최저 판매가보다 높으면 판매가 이상으로 입찰하게 되므로 제외
+        hit = (
+            (self.state[ids] == ARMED)
+            & (market > 0)
+            & (market <= self.target[ids])
+            & (bid <= market)
+            & (bid <= self.max_price[ids])
+        )
+        hit_ids = np.flatnonzero(hit) if candidates is None else ids[hit]
+        return hit_ids, bid[hit], market[hit]
+
+    def waiting(self, candidates):
+        """
+        가격이 목표에 도달했지만 아직 체결되지 않은 목표 (armed이고 0 < 시장 가격 <= 목표 가격)
+
+        엔진이 거절했거나(최대 가격 초과 등) 제출에 실패한 목표를 가격이 목표 위로
+        올라갈 때까지 다음 평가 후보로 남겨 두는 데 사용합니다.
+
+        Args:
+            candidates: 확인할 목표 ID 목록
+
+        Returns:
+            list: 목표 ID 목록
+        """
+        if not len(candidates):
+            return []
+        ids = np.asarray(candidates, dtype=np.int64)
+        market = self.market[self.key_idx[ids]]
+        keep = (self.state[ids] == ARMED) & (market > 0) & (market <= self.target[ids])
+        return ids[keep].tolist()
+
+    def evaluate(self, prices=None, candidates=None):
+        """
+        가격 스냅샷에 대해 입찰 의도 생성
+
+        Args:
+            prices (dict): {(product_url, size): 최저 판매가} (None이면 마지막 가격 사용)
+            candidates: 평가할 목표 ID 목록 (None이면 전체)
+
+        Returns:
+            IntentBatch: 입찰 의도 목록 (순회 시 BidIntent)
+        """
+        if prices:
+            self.update_prices(prices)
+        if self.count == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return IntentBatch(self, empty, empty, empty)
+        return IntentBatch(self, *self.decide(candidates))
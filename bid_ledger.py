@@ -0,0 +1,477 @@
+"""
+입찰 기록 원장 모듈 (SQLite)
+
+입찰 제출 전에 의도(pending)를 기록하고 제출 후 결과를 갱신합니다.
+(목표, 가격, 시간 구간)별 멱등 키로 같은 입찰이 두 번 나가지 않도록 막고,
+재시작 시 완료되지 않은 입찰을 정리합니다.
+쓰기는 백그라운드 스레드가 모아서 한 트랜잭션으로 커밋(group commit)합니다.
+입찰 의도(begin)와 결과(finish)는 메모리의 멱등 키에 먼저 반영하고 커밋을 기다리지 않으므로,
+같은 프로세스 안에서는 즉시 중복 입찰을 막고 디스크 기록은 commit_interval 안에 따라옵니다.
+재시작 시 결과가 기록되지 않은 입찰은 'unknown'(확인 필요)으로 남겨 요약과 CLI에 표시합니다.
+"""
+import os
+import time
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+from clock import SYSTEM_CLOCK
+from utils import setup_logger, load_config, data_path
+
+
+# 다시 입찰해도 되는 상태 (실제로 입찰이 나가지 않음)
+RETRYABLE_STATUSES = ('failed', 'test')
+
+# 재시작 시 결과를 알 수 없어 확인이 필요한 상태
+UNKNOWN = 'unknown'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bids (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idem_key TEXT NOT NULL UNIQUE,
+    product_url TEXT NOT NULL,
+    size TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    target_price INTEGER,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    latency_ms INTEGER,
+    hot INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_bids_product_size_status ON bids (product_url, size, status);
+CREATE INDEX IF NOT EXISTS idx_bids_status ON bids (status);
+CREATE INDEX IF NOT EXISTS idx_bids_created_at ON bids (created_at);
+"""
+
+
+class LedgerError(RuntimeError):
+    """입찰 원장 기록 실패 (입찰 의도를 저장할 수 없으면 제출하지 않음)"""
+
+
+class _Commit:
+    """커밋 완료 알림 (flush 대기용)"""
+
+    __slots__ = ('event', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.error = None
+
+    def wait(self, timeout):
+        """
+        커밋 대기
+
+        Returns:
+            bool: 커밋 성공 여부 (실패/시간 초과면 False)
+        """
+        return self.event.wait(timeout) and self.error is None
+
+
+class BidLedger:
+    """입찰 기록 원장"""
+
+    def __init__(self, db_path=None, config=None, clock=None):
+        """
+        초기화
+
+        Args:
+            db_path (str): SQLite 데이터베이스 경로 (None이면 설정 파일 기준, 시뮬레이션 시계면 clock.data_dir 아래)
+            config (dict): 설정 (None이면 config.yaml 로드)
+            clock: 시계 (멱등 키 시간 구간과 기록 시각, None이면 실제 시계)
+        """
+        self.logger = setup_logger('BidLedger', 'logs/auto_bidder.log')
+        self.config = config if config is not None else load_config()
+        ledger_config = self.config.get('ledger', {})
+
+        self.clock = clock or SYSTEM_CLOCK
+        self.db_path = db_path or data_path(ledger_config.get('db', 'data/bids.db'), self.clock.data_dir)
+        self.window = ledger_config.get('idempotency_window', 3600)
+        self.commit_interval = ledger_config.get('commit_interval', 0.05)
+
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        conn = self.connect()
+        conn.executescript(SCHEMA)
+        conn.commit()
+        conn.close()
+
+        # 멱등 키 -> 상태 (입찰 경로에서는 이 딕셔너리만 확인)
+        self._keys = {}
+        self._keys_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name='BidLedgerWriter', daemon=True)
+        self._writer.start()
+
+    def connect(self):
+        """
+        데이터베이스 연결 생성
+
+        Returns:
+            sqlite3.Connection: 연결
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def make_key(self, product_url, size, target_price, price, now=None):
+        """
+        멱등 키 생성 (목표, 가격, 시간 구간)
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+            target_price (int): 목표 가격
+            price (int): 입찰 가격
+            now (float): 기준 시각 (epoch 초, None이면 clock.time())
+
+        Returns:
+            str: 멱등 키
+        """
+        window = int((now if now is not None else self.clock.time()) // self.window)
+        return f"{product_url}|{size}|{target_price}|{price}|{window}"
+
+    def recover(self):
+        """
+        시작 시 복구: 최근 멱등 키를 메모리로 읽고, 완료되지 않은 입찰을 정리
+
+        제출 직전/직후에 종료된 입찰(pending)은 실제 입찰 여부를 알 수 없으므로
+        'unknown'으로 표시하고 같은 키로 다시 입찰하지 않습니다. (summary, needs_review로 확인)
+
+        Returns:
+            list: 정리된 입찰 기록 목록
+        """
+        self.flush()
+        conn = self.connect()
+        try:
+            conn.row_factory = sqlite3.Row
+            in_flight = [dict(row) for row in conn.execute(
+                "SELECT * FROM bids WHERE status = 'pending'"
+            )]
+            if in_flight:
+                with conn:
+                    conn.execute(
+                        "UPDATE bids SET status = ?, updated_at = ? WHERE status = 'pending'",
+                        (UNKNOWN, self.clock.now().strftime('%Y-%m-%d %H:%M:%S'))
+                    )
+                for bid in in_flight:
+                    self.logger.warning(
+                        f"완료되지 않은 입찰 발견 (확인 필요): {bid['product_url']} "
+                        f"사이즈 {bid['size']}, {bid['price']}원"
+                    )
+
+            since = datetime.fromtimestamp(self.clock.time() - self.window).strftime('%Y-%m-%d %H:%M:%S')
+            rows = conn.execute(
+                'SELECT idem_key, status FROM bids WHERE created_at >= ?', (since,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        with self._keys_lock:
+            for key, status in rows:
+                self._keys[key] = status
+
+        self.logger.info(f"입찰 원장 복구 완료: 최근 키 {len(rows)}개, 미완료 {len(in_flight)}건")
+        return in_flight
+
+    def begin(self, product_url, size, price, target_price=None):
+        """
+        입찰 의도 기록 (제출 전)
+
+        멱등 키는 메모리에 바로 반영하고 pending 기록은 다음 group commit에 함께 저장합니다.
+        (커밋을 기다리지 않으므로 commit_interval 안에 프로세스가 죽으면 기록이 남지 않을 수 있음)
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+            price (int): 입찰 가격
+            target_price (int): 목표 가격
+
+        Returns:
+            str: 멱등 키 (이미 같은 입찰이 있으면 None)
+
+        Raises:
+            LedgerError: 원장이 닫혀 의도를 기록할 수 없는 경우 (입찰하지 말 것)
+        """
+        if not self._writer.is_alive():
+            raise LedgerError("입찰 원장이 닫혀 있어 입찰 의도를 기록할 수 없습니다")
+
+        key = self.make_key(product_url, size, target_price, price)
+        with self._keys_lock:
+            status = self._keys.get(key)
+            if status is not None and status not in RETRYABLE_STATUSES:
+                return None
+            retry = status is not None
+            self._keys[key] = 'pending'
+
+        now = self.clock.now().strftime('%Y-%m-%d %H:%M:%S')
+        sql = (
+            'INSERT INTO bids (idem_key, product_url, size, price, target_price, status, created_at, updated_at) '
+            "VALUES (?, ?, ?, ?, ?, 'pending', ?, ?)"
+        )
+        if retry:
+            # 이전 기록이 커밋되지 않았을 수도 있으므로 없으면 새로 추가
+            sql += " ON CONFLICT(idem_key) DO UPDATE SET status = 'pending', updated_at = excluded.updated_at"
+        self._queue.put((sql, (key, product_url, size or '', price, target_price, now, now)))
+        return key
+
+    def finish(self, key, status, latency_ms=None, hot=False):
+        """
+        입찰 결과 기록 (제출 후)
+
+        Args:
+            key (str): begin()이 반환한 멱등 키
+            status (str): success, failed, test
+            latency_ms (int): 감지 → 제출 지연 시간
+            hot (bool): 대기 브라우저 사용 여부
+        """
+        with self._keys_lock:
+            self._keys[key] = status
+
+        self._queue.put((
+            'UPDATE bids SET status = ?, updated_at = ?, latency_ms = ?, hot = ? WHERE idem_key = ?',
+            (status, self.clock.now().strftime('%Y-%m-%d %H:%M:%S'), latency_ms, int(bool(hot)), key)
+        ))
+
+    def _where(self, product_url=None, size=None, status=None, date_from=None, date_to=None):
+        """필터 조건 SQL과 파라미터 (날짜는 'YYYY-MM-DD', date_to 포함)"""
+        clauses, params = [], []
+        for column, value in (('product_url', product_url), ('size', size), ('status', status)):
+            if value:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if date_from:
+            clauses.append('created_at >= ?')
+            params.append(str(date_from))
+        if date_to:
+            clauses.append("created_at < date(?, '+1 day')")
+            params.append(str(date_to))
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+    def find(self, product_url=None, size=None, status=None, limit=100):
+        """
+        입찰 기록 조회 (인덱스 사용)
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+            status (str): 상태
+            limit (int): 최대 건수
+
+        Returns:
+            list: 입찰 기록 딕셔너리 목록 (최신순)
+        """
+        return self.query(product_url=product_url, size=size, status=status, limit=limit)['rows']
+
+    def query(self, limit=50, offset=0, **filters):
+        """
+        필터/페이지 단위 입찰 기록 조회
+
+        Args:
+            limit (int): 페이지 크기
+            offset (int): 건너뛸 건수
+            **filters: product_url, size, status, date_from, date_to
+
+        Returns:
+            dict: {'rows': 입찰 기록 목록 (최신순), 'total': 전체 건수}
+        """
+        where, params = self._where(**filters)
+        conn = self.connect()
+        try:
+            conn.row_factory = sqlite3.Row
+            total = conn.execute(f'SELECT COUNT(*) FROM bids {where}', params).fetchone()[0]
+            rows = conn.execute(
+                f'SELECT * FROM bids {where} ORDER BY id DESC LIMIT ? OFFSET ?', params + [limit, offset]
+            ).fetchall()
+        finally:
+            conn.close()
+        return {'rows': [dict(row) for row in rows], 'total': total}
+
+    def summary(self, **filters):
+        """
+        상태별 입찰 건수 집계
+
+        Args:
+            **filters: product_url, size, status, date_from, date_to
+
+        Returns:
+            dict: {'total': 전체, 'by_status': {상태: 건수}, 'unknown': 확인이 필요한 건수}
+        """
+        where, params = self._where(**filters)
+        conn = self.connect()
+        try:
+            rows = conn.execute(f'SELECT status, COUNT(*) FROM bids {where} GROUP BY status', params).fetchall()
+        finally:
+            conn.close()
+        by_status = dict(rows)
+        return {'total': sum(by_status.values()), 'by_status': by_status, 'unknown': by_status.get(UNKNOWN, 0)}
+
+    def needs_review(self, limit=20):
+        """
+        확인이 필요한 입찰 (재시작 전에 결과가 기록되지 않은 'unknown' 기록)
+
+        Args:
+            limit (int): 최대 건수
+
+        Returns:
+            list: 입찰 기록 딕셔너리 목록 (최신순)
+        """
+        return self.find(status=UNKNOWN, limit=limit)
+
+    def iter_rows(self, chunk_size=5000, **filters):
+        """
+        입찰 기록을 청크 단위로 순회 (메모리 사용량 일정)
+
+        Args:
+            chunk_size (int): 한 번에 읽을 행 수
+            **filters: product_url, size, status, date_from, date_to
+
+        Yields:
+            tuple: (열 이름 목록, 행 튜플 목록)
+        """
+        where, params = self._where(**filters)
+        conn = self.connect()
+        try:
+            cursor = conn.execute(f'SELECT * FROM bids {where} ORDER BY id', params)
+            columns = [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield columns, rows
+        finally:
+            conn.close()
+
+    def _write_loop(self):
+        """큐에 쌓인 쓰기를 모아서 한 트랜잭션으로 커밋 (flush/종료 요청이 있으면 바로 커밋)"""
+        conn = self.connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.commit_interval
+            while isinstance(batch[-1], tuple):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # 이미 쌓여 있는 쓰기는 같은 트랜잭션에 포함
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            statements = [entry for entry in batch if entry is not None and not isinstance(entry, _Commit)]
+            errors = self._commit(conn, statements)
+
+            for entry in batch:
+                if isinstance(entry, _Commit):
+                    # flush: 이번 배치에 실패한 쓰기가 있으면 실패로 알림
+                    entry.error = next(iter(errors.values()), None)
+                    entry.event.set()
+                self._queue.task_done()
+
+            if stop:
+                break
+        conn.close()
+
+    def _commit(self, conn, statements):
+        """
+        쓰기 묶음 커밋 (실패하면 하나씩 다시 실행하여 실패한 쓰기만 제외)
+
+        Returns:
+            dict: {id(항목): 오류} (실패한 항목만)
+        """
+        if not statements:
+            return {}
+        try:
+            with conn:
+                for sql, params in statements:
+                    conn.execute(sql, params)
+            return {}
+        except sqlite3.Error as e:
+            self.logger.warning(f"입찰 원장 일괄 저장 실패, 하나씩 다시 저장합니다: {e}")
+
+        errors = {}
+        for entry in statements:
+            error = self._execute(conn, entry)
+            if error is not None:
+                errors[id(entry)] = error
+                self.logger.error(f"입찰 원장 저장 실패: {error} ({entry[1]})")
+        return errors
+
+    def _execute(self, conn, entry, attempts=3):
+        """
+        쓰기 하나 커밋 (database is locked 등 일시적 오류는 재시도)
+
+        Returns:
+            Exception: 오류 (성공하면 None)
+        """
+        for attempt in range(attempts):
+            try:
+                with conn:
+                    conn.execute(entry[0], entry[1])
+                return None
+            except sqlite3.OperationalError as e:
+                error = e
+                time.sleep(0.05 * (attempt + 1))
+            except sqlite3.Error as e:
+                return e
+        return error
+
+    def flush(self, timeout=5):
+        """
+        대기 중인 쓰기를 커밋할 때까지 대기
+
+        Args:
+            timeout (float): 최대 대기 시간 (초)
+
+        Returns:
+            bool: 모두 커밋되었는지 여부 (실패/시간 초과면 False)
+        """
+        done = _Commit()
+        self._queue.put(done)
+        if not done.wait(timeout):
+            self.logger.error(f"입찰 원장 쓰기가 커밋되지 않았습니다: {done.error or '시간 초과'}")
+            return False
+        return True
+
+    def close(self):
+        """
+        남은 쓰기를 커밋하고 종료
+
+        Returns:
+            bool: 남은 쓰기를 모두 커밋했는지 여부
+        """
+        if not self._writer.is_alive():
+            return True
+        committed = self.flush()
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        return committed
+
+
+def print_unknown_bids(ledger, limit=10):
+    """
+    확인이 필요한 입찰(unknown)을 콘솔에 안내
+
+    Args:
+        ledger (BidLedger): 복구가 끝난 입찰 원장
+        limit (int): 출력할 최대 건수
+
+    Returns:
+        int: 확인이 필요한 전체 건수
+    """
+    count = ledger.summary(status=UNKNOWN)['unknown']
+    if count:
+        print(f"\n⚠️  결과를 알 수 없는 입찰 {count}건이 있습니다. KREAM에서 실제 입찰 여부를 확인하세요:")
+        for bid in ledger.needs_review(limit):
+            print(f"  - {bid['created_at']} {bid['product_url']} 사이즈 {bid['size']}, {bid['price']:,}원")
+        if count > limit:
+            print(f"  ... 외 {count - limit}건")
+    return count
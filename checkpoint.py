@@ -0,0 +1,142 @@
+"""
+실행 상태 체크포인트 모듈
+
+모니터링/입찰 루프의 실행 상태(다음 확인 예정 시각, 마지막 가격, 목표 상태 등)를
+작은 JSON 파일로 주기적으로 저장합니다. 임시 파일에 쓴 뒤 교체하므로 저장 도중
+종료되어도 이전 체크포인트가 남고, 다시 시작하면 마지막 체크포인트에서 이어서 실행합니다.
+
+파일: <checkpoint.dir>/<종류>_<키 해시>.json (data_dir을 넘기면 <data_dir>/checkpoints/...)
+"""
+import os
+import json
+import time
+import hashlib
+from clock import SYSTEM_CLOCK
+from utils import setup_logger, load_config, data_path
+
+
+VERSION = 1
+
+
+class Checkpointer:
+    """작업 하나의 체크포인트 저장/복원"""
+
+    def __init__(self, kind, key, config=None, clock=None, data_dir=None):
+        """
+        초기화
+
+        Args:
+            kind (str): 작업 종류 (monitor, bidder, portfolio)
+            key: 작업 식별 정보 (JSON으로 바꿀 수 있는 값, 예: [상품 URL, 사이즈])
+            config (dict): 설정 (None이면 config.yaml 로드)
+            clock: 시계 (None이면 실제 시계)
+            data_dir (str): 데이터 디렉토리 (None이면 시계 기준, 실제 시계면 checkpoint.dir)
+        """
+        self.logger = setup_logger('Checkpoint', 'logs/checkpoint.log')
+        checkpoint_config = (config if config is not None else load_config()).get('checkpoint', {})
+        self.enabled = checkpoint_config.get('enabled', True)
+        self.interval = checkpoint_config.get('interval', 10)
+        self.max_age = checkpoint_config.get('max_age', 86400)
+        self.kind = kind
+        self.key = json.loads(json.dumps(key, ensure_ascii=False))
+        self.clock = clock or SYSTEM_CLOCK
+        digest = hashlib.sha1(json.dumps(self.key, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+        directory = data_path(checkpoint_config.get('dir', 'data/checkpoints'), data_dir or self.clock.data_dir)
+        self.path = os.path.join(directory, f"{kind}_{digest[:12]}.json")
+        self._last_save = None
+
+    def load(self):
+        """
+        체크포인트 복원
+
+        Returns:
+            dict: 저장된 상태 (없거나, 다른 작업이거나, max_age보다 오래됐거나, 저장 시각이 미래면 None)
+        """
+        if not self.enabled:
+            return None
+
+        started = time.perf_counter()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"체크포인트를 읽을 수 없어 처음부터 시작합니다 ({self.path}): {e}")
+            return None
+
+        if data.get('version') != VERSION or data.get('kind') != self.kind or data.get('key') != self.key:
+            self.logger.warning(f"다른 작업의 체크포인트라 사용하지 않습니다: {self.path}")
+            return None
+        age = self.clock.time() - data.get('saved_at', 0)
+        if age < 0:
+            # 시계가 뒤로 갔거나 다른 시간축(시뮬레이션)에서 저장한 체크포인트
+            self.logger.warning(f"저장 시각이 현재보다 늦은 체크포인트라 사용하지 않습니다 ({-age:.0f}초 뒤): {self.path}")
+            return None
+        if self.max_age and age > self.max_age:
+            self.logger.info(f"오래된 체크포인트라 사용하지 않습니다 ({age / 3600:.1f}시간 전): {self.path}")
+            return None
+
+        self.logger.info(
+            f"체크포인트 복원: {self.path} ({age:.0f}초 전 저장, {(time.perf_counter() - started) * 1000:.1f}ms)"
+        )
+        return data['state']
+
+    def save(self, state):
+        """
+        체크포인트 저장 (임시 파일에 쓴 뒤 교체)
+
+        Args:
+            state (dict): 저장할 상태 (JSON으로 바꿀 수 있는 값)
+        """
+        if not self.enabled:
+            return
+
+        data = {'version': VERSION, 'kind': self.kind, 'key': self.key, 'saved_at': self.clock.time(), 'state': state}
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self._last_save = self.clock.monotonic()
+        except OSError as e:
+            self.logger.error(f"체크포인트 저장 실패 ({self.path}): {e}")
+
+    def maybe_save(self, build_state):
+        """
+        마지막 저장 후 checkpoint.interval초가 지났을 때만 저장
+
+        Args:
+            build_state: 저장할 상태를 만드는 함수 (저장할 때만 호출)
+        """
+        if not self.enabled:
+            return
+        if self._last_save is None or self.clock.monotonic() - self._last_save >= self.interval:
+            self.save(build_state())
+
+    def clear(self):
+        """체크포인트 삭제"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def resume_delay(state, interval, clock=None):
+    """
+    체크포인트의 다음 확인 예정 시각까지 남은 시간
+
+    Args:
+        state (dict): 복원한 상태 (next_due: clock.time() 기준 예정 시각)
+        interval (float): 확인 주기 (초, 남은 시간의 상한)
+        clock: 시계 (None이면 실제 시계)
+
+    Returns:
+        float: 첫 확인 전에 기다릴 시간 (초, 이미 지났으면 0)
+    """
+    if not state or state.get('next_due') is None:
+        return 0.0
+    return min(max(0.0, state['next_due'] - (clock or SYSTEM_CLOCK).time()), interval)
@@ -0,0 +1,135 @@
+"""
+시계 모듈
+
+모니터링/입찰 루프는 현재 시각과 대기를 time/datetime 대신 시계 객체로 처리합니다.
+기본값인 SystemClock은 실제 시간을 그대로 사용하고, VirtualClock은 대기 요청을 받으면
+그 시각으로 즉시 건너뛰므로 check_interval 60초로 며칠 동안 감시하는 상황이나
+시간 초과/재시도 경로를 몇 초 만에 시뮬레이션할 수 있습니다.
+
+VirtualClock을 쓰는 실행은 data_dir을 따로 넘기지 않으면 가격 이력 저장소, 입찰 원장,
+체크포인트, 내보내기 파일을 실행마다 새로 만든 임시 디렉토리(clock.data_dir)에 기록하므로
+시뮬레이션이 실제 data/ 디렉토리를 건드리지 않습니다.
+
+사용:
+    from clock import VirtualClock
+    clock = VirtualClock(datetime(2024, 1, 1, 9, 0))
+    monitor = PriceMonitor(url, '270', driver_factory=FakeDriver, clock=clock)
+    monitor.start_monitoring(duration=7 * 86400)
+"""
+import time
+import tempfile
+import threading
+from datetime import datetime
+
+
+class SystemClock:
+    """실제 시계"""
+
+    # 데이터 파일 기본 위치 (None이면 설정 파일 경로 그대로)
+    data_dir = None
+
+    def time(self):
+        """현재 시각 (epoch 초, time.time())"""
+        return time.time()
+
+    def monotonic(self):
+        """경과 시간 측정용 시각 (time.monotonic())"""
+        return time.monotonic()
+
+    def now(self):
+        """현재 시각 (datetime)"""
+        return datetime.now()
+
+    def sleep(self, seconds):
+        """
+        대기
+
+        Args:
+            seconds (float): 대기 시간 (초)
+        """
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, event, timeout):
+        """
+        이벤트가 설정되거나 시간이 다 될 때까지 대기 (중지 요청 대기용)
+
+        Args:
+            event (threading.Event): 기다릴 이벤트
+            timeout (float): 최대 대기 시간 (초)
+
+        Returns:
+            bool: 이벤트 설정 여부
+        """
+        return event.wait(timeout)
+
+
+class VirtualClock(SystemClock):
+    """가상 시계 (대기하지 않고 예정 시각으로 바로 이동)"""
+
+    def __init__(self, start=None):
+        """
+        초기화
+
+        Args:
+            start: 시작 시각 (datetime 또는 epoch 초, None이면 현재 시각)
+        """
+        if start is None:
+            start = time.time()
+        elif isinstance(start, datetime):
+            start = start.timestamp()
+        self.started = float(start)
+        self._now = self.started
+        self._lock = threading.Lock()
+        self._data_dir = None
+        self.sleeps = 0
+
+    def time(self):
+        return self._now
+
+    def monotonic(self):
+        return self._now
+
+    def now(self):
+        return datetime.fromtimestamp(self._now)
+
+    @property
+    def data_dir(self):
+        """시뮬레이션 데이터 디렉토리 (처음 사용할 때 임시 디렉토리 생성, 같은 시계를 쓰는 객체가 공유)"""
+        with self._lock:
+            if self._data_dir is None:
+                self._data_dir = tempfile.mkdtemp(prefix='kream_sim_')
+            return self._data_dir
+
+    @property
+    def elapsed(self):
+        """시작 후 흐른 가상 시간 (초)"""
+        return self._now - self.started
+
+    def advance(self, seconds):
+        """
+        시간 이동
+
+        Args:
+            seconds (float): 이동할 시간 (초, 음수는 무시)
+        """
+        with self._lock:
+            self._now += max(0.0, seconds)
+
+    def sleep(self, seconds):
+        # 모든 대기가 같은 시간축을 공유하므로 루프 하나(스레드 하나)씩 시뮬레이션해야 함
+        with self._lock:
+            self.sleeps += 1
+            self._now += max(0.0, seconds)
+
+    def wait(self, event, timeout):
+        if event.is_set():
+            return True
+        if timeout is None:
+            return event.wait()
+        self.sleep(timeout)
+        return event.is_set()
+
+
+# 기본 시계 (시계를 넘기지 않으면 사용)
+SYSTEM_CLOCK = SystemClock()
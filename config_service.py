@@ -0,0 +1,330 @@
+"""
+설정 서비스 모듈
+
+config.yaml을 프로세스당 한 번만 파싱하여 검증된 읽기 전용 설정 객체(Config)로 보관합니다.
+백그라운드 스레드가 파일 수정 시각(mtime)만 확인하다가 바뀌었을 때만 다시 읽고,
+구독자에게 변경을 알립니다. 실행 중인 모니터링/입찰은 알림으로 새 주기와 한도를 반영하며
+가격 확인 경로에서는 YAML을 다시 읽지 않습니다.
+"""
+import os
+import weakref
+import threading
+from collections.abc import Mapping
+import yaml
+
+
+NUMBER = (int, float)
+
+# 섹션별 알려진 키의 타입 (알 수 없는 키는 그대로 허용)
+SCHEMA = {
+    'browser': {
+        'headless': bool, 'implicit_wait': NUMBER, 'page_load_timeout': NUMBER,
+        'driver_path': str, 'driver_offline': bool, 'driver_cache': str, 'chrome_binary': str,
+        'page_settle': NUMBER, 'login_wait': NUMBER,
+    },
+    'crawler': {
+        'check_interval': NUMBER, 'request_delay': NUMBER, 'max_retries': int, 'max_requests_per_minute': NUMBER,
+    },
+    'bidding': {
+        'auto_bid': bool, 'min_price': int, 'max_price': int, 'target_price': int, 'price_step': int,
+        'hot_standby': bool, 'hot_refresh_interval': NUMBER, 'hot_refresh_workers': NUMBER,
+    },
+    'portfolio': {'crawlers': int, 'max_total_spend': int},
+    'daemon': {'host': str, 'port': int, 'quote_ttl': NUMBER, 'quote_crawlers': int},
+    'ui': {'refresh_interval': NUMBER, 'chart_window': int},
+    'ledger': {'db': str, 'idempotency_window': NUMBER, 'commit_interval': NUMBER},
+    'tracing': {'enabled': bool, 'file': str},
+    'notification': {'enabled': bool, 'success_bid': bool, 'price_drop': bool},
+    'storage': {'history_db': str, 'import_batch_size': int, 'export_chunk_size': int, 'export_format': str,
+                'export_dir': str},
+    'logging': {
+        'format': str, 'max_bytes': int, 'when': str, 'backup_count': int,
+        'compress': bool, 'queue_size': int, 'console': bool,
+    },
+    'checkpoint': {'enabled': bool, 'dir': str, 'interval': NUMBER, 'max_age': NUMBER},
+    'metrics': {'enabled': bool, 'host': str, 'port': int},
+    'profiling': {'dir': str, 'window': NUMBER, 'interval': NUMBER, 'top': int, 'frames': int, 'signals': bool},
+    'screenshots': {
+        'enabled': bool, 'dir': str, 'events': list, 'max_mb': NUMBER, 'format': str, 'quality': int,
+        'dedup_distance': int, 'cooldown': NUMBER, 'queue': int,
+    },
+}
+
+# 0보다 커야 하는 값
+POSITIVE = {
+    ('crawler', 'check_interval'), ('bidding', 'price_step'), ('bidding', 'hot_refresh_workers'),
+    ('portfolio', 'crawlers'), ('daemon', 'quote_ttl'), ('daemon', 'quote_crawlers'), ('ui', 'refresh_interval'),
+    ('ledger', 'idempotency_window'), ('logging', 'queue_size'),
+    ('profiling', 'window'), ('profiling', 'interval'), ('profiling', 'frames'),
+    ('screenshots', 'max_mb'), ('screenshots', 'quality'), ('screenshots', 'queue'),
+}
+
+
+class ConfigError(ValueError):
+    """설정 파일 검증 실패"""
+
+
+class Config(Mapping):
+    """읽기 전용 설정 (딕셔너리처럼 get/[] 사용, 섹션은 속성으로도 접근)"""
+
+    def __init__(self, data=None):
+        """
+        초기화
+
+        Args:
+            data (dict): 설정 딕셔너리 (하위 딕셔너리도 Config로 감쌈)
+        """
+        self._data = {key: _freeze(value) for key, value in (data or {}).items()}
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['_data'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __repr__(self):
+        return f"Config({self.to_dict()!r})"
+
+    def to_dict(self):
+        """
+        수정 가능한 딕셔너리로 변환
+
+        Returns:
+            dict: 설정 딕셔너리 사본
+        """
+        return {key: _thaw(value) for key, value in self._data.items()}
+
+
+def _freeze(value):
+    """하위 딕셔너리/리스트를 읽기 전용으로 변환"""
+    if isinstance(value, dict):
+        return Config(value)
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """읽기 전용 값을 수정 가능한 값으로 변환"""
+    if isinstance(value, Config):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def validate(data):
+    """
+    설정 검증
+
+    Args:
+        data (dict): YAML 파싱 결과
+
+    Raises:
+        ConfigError: 타입이 맞지 않거나 값이 범위를 벗어난 경우
+    """
+    if not isinstance(data, dict):
+        raise ConfigError("설정 파일 최상위는 매핑이어야 합니다")
+
+    problems = []
+    for section, fields in SCHEMA.items():
+        values = data.get(section)
+        if values is None:
+            continue
+        if not isinstance(values, dict):
+            problems.append(f"{section}: 매핑이어야 합니다")
+            continue
+        for key, expected in fields.items():
+            value = values.get(key)
+            if value is None:
+                continue
+            # bool은 int의 하위 타입이므로 따로 구분
+            if isinstance(value, bool) != (expected is bool) or not isinstance(value, expected):
+                problems.append(f"{section}.{key}: 타입이 올바르지 않습니다 ({value!r})")
+            elif (section, key) in POSITIVE and value <= 0:
+                problems.append(f"{section}.{key}: 0보다 커야 합니다 ({value!r})")
+
+    if problems:
+        raise ConfigError('; '.join(problems))
+
+
+class ConfigService:
+    """설정 파일 캐시 및 변경 감지"""
+
+    def __init__(self, path='config.yaml', poll_interval=1.0):
+        """
+        초기화
+
+        Args:
+            path (str): 설정 파일 경로
+            poll_interval (float): 수정 시각 확인 주기 (초)
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+        self._config = Config()
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._watcher = None
+        self._stop = threading.Event()
+        self.reload()
+
+    def get(self):
+        """
+        현재 설정 (파일을 다시 읽지 않음)
+
+        Returns:
+            Config: 읽기 전용 설정
+        """
+        if self._watcher is None:
+            self.start()
+        return self._config
+
+    def reload(self, force=False):
+        """
+        수정 시각이 바뀌었으면 다시 읽고 검증
+
+        검증에 실패하면 이전 설정을 유지합니다.
+
+        Args:
+            force (bool): 수정 시각과 관계없이 다시 읽기
+
+        Returns:
+            bool: 설정이 교체되었으면 True
+        """
+        with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                if self._mtime is None and not force:
+                    print(f"설정 파일 로드 실패: {e}")
+                    self._mtime = 0
+                return False
+            if mtime == self._mtime and not force:
+                return False
+
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = yaml.safe_load(f) or {}
+                validate(data)
+            except Exception as e:
+                print(f"설정 파일 로드 실패 (이전 설정 유지): {e}")
+                self._mtime = mtime
+                return False
+
+            old, self._config = self._config, Config(data)
+            first_load = self._mtime is None
+            self._mtime = mtime
+
+        if not first_load:
+            self._notify(self._config, old)
+        return True
+
+    def subscribe(self, callback):
+        """
+        설정 변경 알림 등록
+
+        객체 메서드는 약한 참조로 보관하므로 객체가 사라지면 자동으로 해제됩니다.
+
+        Args:
+            callback: callback(new_config, old_config)
+        """
+        if hasattr(callback, '__self__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        with self._lock:
+            self._listeners.append(ref)
+        if self._watcher is None:
+            self.start()
+
+    def unsubscribe(self, callback):
+        """
+        설정 변경 알림 해제
+
+        Args:
+            callback: subscribe()에 넘긴 함수
+        """
+        with self._lock:
+            self._listeners = [ref for ref in self._listeners if ref() not in (None, callback)]
+
+    def _notify(self, new, old):
+        """구독자에게 변경 알림"""
+        with self._lock:
+            listeners = list(self._listeners)
+        for ref in listeners:
+            callback = ref()
+            if callback is None:
+                continue
+            try:
+                callback(new, old)
+            except Exception as e:
+                print(f"설정 변경 처리 실패: {e}")
+
+    def start(self):
+        """수정 시각 감시 스레드 시작"""
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._watcher = threading.Thread(target=self._watch_loop, name='ConfigWatcher', daemon=True)
+            self._watcher.start()
+
+    def _watch_loop(self):
+        """주기적으로 수정 시각 확인"""
+        while not self._stop.wait(self.poll_interval):
+            self.reload()
+
+    def close(self):
+        """감시 중지"""
+        self._stop.set()
+        if self._watcher:
+            self._watcher.join(timeout=5)
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_config_service(path='config.yaml'):
+    """
+    설정 파일별 프로세스 공용 서비스
+
+    Args:
+        path (str): 설정 파일 경로
+
+    Returns:
+        ConfigService: 설정 서비스
+    """
+    key = os.path.abspath(path)
+    service = _services.get(key)
+    if service is None:
+        with _services_lock:
+            service = _services.get(key)
+            if service is None:
+                service = _services[key] = ConfigService(path)
+    return service
+
+
+def changed(new, old, section, key):
+    """
+    설정 값 변경 여부
+
+    Args:
+        new (Config): 새 설정
+        old (Config): 이전 설정
+        section (str): 섹션 이름
+        key (str): 키
+
+    Returns:
+        bool: 값이 바뀌었으면 True
+    """
+    return new.get(section, {}).get(key) != old.get(section, {}).get(key)
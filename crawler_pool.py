@@ -0,0 +1,157 @@
+"""
+크롤러 풀 모듈
+
+로그인된 KreamCrawler 여러 개를 공유하여 여러 상품의 가격을 동시에 조회합니다.
+같은 상품의 여러 사이즈는 한 번의 페이지 이동으로 함께 조회하며,
+모든 크롤러의 요청은 crawler.max_requests_per_minute 한도를 함께 나눠 씁니다.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from clock import SYSTEM_CLOCK
+from kream_crawler import KreamCrawler
+from utils import setup_logger, load_config
+
+
+class RequestBudget:
+    """전체 요청 한도 (분당 요청 수, 요청 간격을 고르게 배분)"""
+
+    def __init__(self, per_minute=None, clock=None):
+        """
+        초기화
+
+        Args:
+            per_minute (float): 분당 최대 요청 수 (None이면 제한 없음)
+            clock: 시계 (None이면 실제 시계)
+        """
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.clock = clock or SYSTEM_CLOCK
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        요청 1회 차례가 올 때까지 대기
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = self.clock.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        wait = start - now
+        if wait > 0:
+            self.clock.sleep(wait)
+        return wait
+
+
+class CrawlerPool:
+    """공유 크롤러 풀"""
+
+    def __init__(self, size=2, config=None, crawler_factory=None, login=True, driver_factory=None, clock=None):
+        """
+        초기화
+
+        Args:
+            size (int): 크롤러 수
+            config (dict): 설정 (None이면 config.yaml 로드)
+            crawler_factory: 크롤러 생성 함수 (None이면 driver_factory/clock을 쓰는 KreamCrawler)
+            login (bool): 크롤러마다 로그인 여부
+            driver_factory: 웹드라이버 생성 함수 (None이면 Chrome, 테스트에서는 fake_driver)
+            clock: 시계 (요청 한도/요청 간격 대기, None이면 실제 시계)
+        """
+        self.logger = setup_logger('CrawlerPool', 'logs/crawler.log')
+        self.config = config if config is not None else load_config()
+        self.size = max(1, size)
+        self.clock = clock or SYSTEM_CLOCK
+        self.driver_factory = driver_factory
+        self.crawler_factory = crawler_factory or self._create_crawler
+        self.login = login
+        crawler_config = self.config.get('crawler', {})
+        self.request_delay = crawler_config.get('request_delay', 0)
+        self.budget = RequestBudget(crawler_config.get('max_requests_per_minute'), self.clock)
+
+        self.crawlers = []
+        self._idle = queue.Queue()
+        self._executor = None
+
+    def _create_crawler(self):
+        """기본 크롤러 생성 (풀과 같은 드라이버 생성 함수/시계 사용)"""
+        return KreamCrawler(driver_factory=self.driver_factory, clock=self.clock)
+
+    def start(self):
+        """크롤러 생성 및 로그인 (병렬)"""
+        def create(_):
+            crawler = self.crawler_factory()
+            crawler.setup_driver()
+            if self.login:
+                crawler.login()
+            return crawler
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            self.crawlers = list(executor.map(create, range(self.size)))
+
+        for crawler in self.crawlers:
+            self._idle.put(crawler)
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='CrawlerPool')
+        self.logger.info(f"크롤러 풀 시작: {self.size}개")
+
+    def _fetch_product(self, product_url, sizes):
+        """유휴 크롤러 하나로 상품 페이지를 열고 사이즈별 가격 조회"""
+        crawler = self._idle.get()
+        results = {}
+        try:
+            self.budget.acquire()
+            if crawler.get_product_info(product_url) is None:
+                return results
+            for size in sizes:
+                self.budget.acquire()
+                started = self.clock.monotonic()
+                bid_info = crawler.get_bid_prices(size)
+                if bid_info:
+                    bid_info['fetch_latency'] = self.clock.monotonic() - started
+                    results[(product_url, size)] = bid_info
+                if self.request_delay:
+                    self.clock.sleep(self.request_delay)
+        except Exception as e:
+            self.logger.error(f"가격 조회 실패 ({product_url}): {e}")
+        finally:
+            self._idle.put(crawler)
+        return results
+
+    def fetch(self, keys):
+        """
+        여러 (상품, 사이즈)의 가격을 동시에 조회
+
+        Args:
+            keys: (product_url, size) 목록
+
+        Returns:
+            dict: {(product_url, size): bid_info}
+        """
+        products = {}
+        for product_url, size in keys:
+            sizes = products.setdefault(product_url, [])
+            if size not in sizes:
+                sizes.append(size)
+
+        futures = [
+            self._executor.submit(self._fetch_product, product_url, sizes)
+            for product_url, sizes in products.items()
+        ]
+
+        results = {}
+        for future in futures:
+            results.update(future.result())
+        return results
+
+    def close(self):
+        """모든 크롤러 종료"""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+        for crawler in self.crawlers:
+            crawler.close()
+        self.crawlers = []
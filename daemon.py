@@ -0,0 +1,619 @@
+"""
+백엔드 데몬 모듈
+
+크롤러, 모니터링 목록, 자동 입찰을 소유하는 상주 프로세스입니다.
+로컬 HTTP API(JSON)로 제어하며, Streamlit UI(app.py)는 이 API만 호출하므로
+UI를 다시 실행하거나 브라우저를 새로고침해도 모니터링과 입찰은 계속됩니다.
+
+실행:
+    python daemon.py
+"""
+import io
+import os
+import csv
+import json
+import time
+import itertools
+import threading
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from auto_bidder import KreamAutoBidder
+from price_monitor import PriceMonitor
+from bid_ledger import BidLedger, print_unknown_bids
+from crawler_pool import CrawlerPool
+from snapshot_cache import SnapshotCache
+from profiler import get_profiler, install_signal_handlers
+from metrics import REGISTRY, CONTENT_TYPE
+from utils import setup_logger, load_config, watch_config, create_directories, data_path
+
+
+HISTORY_FILTERS = ('product_url', 'size', 'status', 'date_from', 'date_to')
+EXPORT_FIELDS = ('format', 'path', 'product_url', 'size', 'date_from', 'date_to')
+
+
+class Job:
+    """데몬이 실행 중인 모니터링/입찰 작업"""
+
+    def __init__(self, job_id, kind, params, worker):
+        """
+        초기화
+
+        Args:
+            job_id (int): 작업 ID
+            kind (str): monitor 또는 bid
+            params (dict): 시작 파라미터
+            worker: PriceMonitor 또는 KreamAutoBidder
+        """
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.worker = worker
+        self.thread = None
+        self.status = 'running'
+        self.error = None
+        self.started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def to_dict(self):
+        """
+        API 응답용 딕셔너리
+
+        Returns:
+            dict: 작업 정보
+        """
+        info = {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'error': self.error,
+            'started_at': self.started_at,
+        }
+        info.update(self.params)
+        if self.kind == 'monitor' and self.worker.price_history:
+            info['last_sample'] = _serialize(self.worker.price_history[-1])
+        return info
+
+
+def _serialize(record):
+    """datetime 값을 문자열로 변환"""
+    return {
+        key: value.strftime('%Y-%m-%d %H:%M:%S') if isinstance(value, datetime) else value
+        for key, value in record.items()
+    }
+
+
+class BidderDaemon:
+    """크롤러/모니터링/입찰을 소유하는 백엔드"""
+
+    def __init__(self, config=None, data_dir=None):
+        """
+        초기화
+
+        Args:
+            config (dict): 설정 (None이면 config.yaml 로드)
+            data_dir (str): 입찰 원장/가격 이력/내보내기 파일 위치 (None이면 설정 파일 기준)
+        """
+        self.logger = setup_logger('Daemon', 'logs/daemon.log')
+        self.config = config if config is not None else load_config()
+        self.data_dir = data_dir
+        self.ledger = BidLedger(
+            data_path(self.config.get('ledger', {}).get('db', 'data/bids.db'), data_dir), self.config
+        )
+        self._exporter = None
+        # 공유 원장은 데몬 시작 시 한 번만 복구 (작업마다 복구하면 실행 중인 입찰이 unknown이 됨)
+        self.ledger.recover()
+        daemon_config = self.config.get('daemon', {})
+        self.quotes = SnapshotCache(ttl=daemon_config.get('quote_ttl', 30), name='quote')
+        self.quote_crawlers = daemon_config.get('quote_crawlers', 1)
+        self._quote_pool = None
+        self._quote_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='QuoteRefresh')
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        if config is None:
+            watch_config(self._on_config_change)
+
+    def _on_config_change(self, config, old_config):
+        """설정 파일 변경 반영 (가격 조회 스냅샷 유효 시간)"""
+        self.config = config
+        self.quotes.ttl = config.get('daemon', {}).get('quote_ttl', 30)
+        self.logger.info("설정 변경 반영")
+
+    def _start(self, kind, params, worker, run):
+        """작업 스레드 시작"""
+        job = Job(next(self._ids), kind, params, worker)
+
+        def target():
+            try:
+                run()
+                job.status = 'finished' if job.status == 'running' else job.status
+            except Exception as e:
+                job.status = 'error'
+                job.error = str(e)
+                self.logger.error(f"작업 {job.id} 실패: {e}")
+
+        job.thread = threading.Thread(target=target, name=f'{kind}-{job.id}', daemon=True)
+        with self._lock:
+            self.jobs[job.id] = job
+        job.thread.start()
+        self.logger.info(f"작업 시작: {kind} #{job.id} {params}")
+        return job
+
+    def start_monitor(self, product_url, size=None, check_interval=None, duration=None, headless=False):
+        """
+        가격 모니터링 시작
+
+        Returns:
+            dict: 작업 정보
+        """
+        monitor = PriceMonitor(
+            product_url, size, check_interval=check_interval, headless=headless, data_dir=self.data_dir
+        )
+        params = {'product_url': product_url, 'size': size, 'check_interval': check_interval}
+        job = self._start('monitor', params, monitor, lambda: monitor.start_monitoring(duration))
+        return job.to_dict()
+
+    def start_bid(self, product_url, size, target_price, max_price=None, check_interval=None, headless=False):
+        """
+        자동 입찰 시작
+
+        Returns:
+            dict: 작업 정보
+        """
+        bidder = KreamAutoBidder(ledger=self.ledger, headless=headless, data_dir=self.data_dir)
+        params = {
+            'product_url': product_url,
+            'size': size,
+            'target_price': target_price,
+            'max_price': max_price,
+            'check_interval': check_interval
+        }
+        job = self._start(
+            'bid', params, bidder,
+            lambda: bidder.monitor_and_bid(product_url, size, target_price, max_price, check_interval)
+        )
+        return job.to_dict()
+
+    def stop_job(self, job_id):
+        """
+        작업 중지
+
+        Args:
+            job_id (int): 작업 ID
+
+        Returns:
+            dict: 작업 정보 (없으면 None)
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        job.worker.stop()
+        if job.status == 'running':
+            job.status = 'stopped'
+        self.logger.info(f"작업 중지: {job.kind} #{job.id}")
+        return job.to_dict()
+
+    def list_jobs(self, kind=None):
+        """
+        작업 목록
+
+        Args:
+            kind (str): monitor 또는 bid (None이면 전체)
+
+        Returns:
+            list: 작업 정보 목록
+        """
+        return [job.to_dict() for job in list(self.jobs.values()) if kind is None or job.kind == kind]
+
+    def prices(self, job_id, since=0):
+        """
+        모니터링 작업의 가격 피드 (순번 이후의 새 샘플만)
+
+        샘플 순번은 1부터 시작하는 누적 번호입니다. 클라이언트는 마지막으로 받은
+        순번(seq)을 since로 넘겨 변경분만 받습니다. since가 음수이면 최근 -since건을 반환합니다.
+
+        Args:
+            job_id (int): 작업 ID
+            since (int): 마지막으로 받은 순번
+
+        Returns:
+            dict: {'seq': 최신 순번, 'samples': 새 샘플 목록} (없으면 None)
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.kind != 'monitor':
+            return None
+
+        history = job.worker.price_history
+        seq = len(history)
+        start = max(0, seq + since) if since < 0 else min(since, seq)
+        return {'seq': seq, 'samples': [_serialize(record) for record in history[start:seq]]}
+
+    def bid_history(self, page=1, page_size=50, **filters):
+        """
+        입찰 기록 페이지 조회 (원장 기준)
+
+        Args:
+            page (int): 페이지 번호 (1부터)
+            page_size (int): 페이지 크기
+            **filters: product_url, size, status, date_from, date_to
+
+        Returns:
+            dict: {'rows', 'total', 'page', 'page_size'}
+        """
+        self.ledger.flush()
+        page = max(1, page)
+        page_size = max(1, min(page_size, 1000))
+        result = self.ledger.query(limit=page_size, offset=(page - 1) * page_size, **filters)
+        result.update({'page': page, 'page_size': page_size})
+        return result
+
+    def bid_summary(self, **filters):
+        """
+        상태별 입찰 건수 (원장 기준)
+
+        Args:
+            **filters: product_url, size, status, date_from, date_to
+
+        Returns:
+            dict: {'total', 'by_status', 'unknown'}
+        """
+        self.ledger.flush()
+        return self.ledger.summary(**filters)
+
+    def export_history(self, chunk_size=5000, **filters):
+        """
+        입찰 기록 CSV를 청크 단위로 생성
+
+        Args:
+            chunk_size (int): 한 번에 읽을 행 수
+            **filters: product_url, size, status, date_from, date_to
+
+        Yields:
+            bytes: CSV 조각 (첫 조각에 UTF-8 BOM 포함)
+        """
+        self.ledger.flush()
+        header_written = False
+        for columns, rows in self.ledger.iter_rows(chunk_size=chunk_size, **filters):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if not header_written:
+                buffer.write('\ufeff')
+                writer.writerow(columns)
+                header_written = True
+            writer.writerows(rows)
+            yield buffer.getvalue().encode('utf-8')
+
+    def start_export(self, format='csv', path=None, product_url=None, size=None, date_from=None, date_to=None):
+        """
+        가격 이력 내보내기 시작 (백그라운드)
+
+        Args:
+            format (str): csv, csv.gz, xlsx, parquet
+            path (str): 저장할 파일 이름 (storage.export_dir 기준, 디렉토리 밖 경로는 거부,
+                        None이면 자동 생성)
+            product_url (str): 상품 URL
+            size (str): 사이즈
+            date_from (str): 시작 날짜 (YYYY-MM-DD)
+            date_to (str): 종료 날짜 (YYYY-MM-DD, 포함)
+
+        Returns:
+            dict: 내보내기 작업 정보
+        """
+        from exporter import FORMATS
+
+        if format not in FORMATS:
+            raise ValueError(f"지원하지 않는 형식입니다: {format}")
+        export_dir = os.path.realpath(
+            data_path(self.config.get('storage', {}).get('export_dir', 'data/exports'), self.data_dir)
+        )
+        if path is None:
+            path = f"price_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+        path = os.path.realpath(os.path.join(export_dir, str(path)))
+        if os.path.commonpath([export_dir, path]) != export_dir or path == export_dir:
+            raise ValueError(f"내보내기 경로는 {export_dir} 안의 파일이어야 합니다")
+        return self._get_exporter().submit(
+            path, format, product_url=product_url, size=size, date_from=date_from, date_to=date_to
+        ).to_dict()
+
+    def _get_exporter(self):
+        """내보내기 작업기 (data_dir을 쓰면 그 아래 가격 이력 저장소를 쓰는 데몬 전용 작업기)"""
+        from exporter import Exporter, get_exporter
+        from history_store import HistoryStore
+
+        if not self.data_dir:
+            return get_exporter()
+        with self._lock:
+            if self._exporter is None:
+                history_db = self.config.get('storage', {}).get('history_db', 'data/history.db')
+                self._exporter = Exporter(store=HistoryStore(data_path(history_db, self.data_dir)))
+            return self._exporter
+
+    def exports(self, export_id=None):
+        """
+        내보내기 작업 조회
+
+        Args:
+            export_id (int): 작업 ID (None이면 전체 목록)
+
+        Returns:
+            dict 또는 list: 작업 정보 (없으면 None)
+        """
+        if export_id is None:
+            return self._get_exporter().list_jobs()
+        job = self._get_exporter().get(export_id)
+        return job.to_dict() if job else None
+
+    def quote(self, product_url, size):
+        """
+        현재 가격 조회 (스냅샷 캐시)
+
+        캐시가 유효하면 바로 반환하고, 오래되었거나 없으면 백그라운드 갱신을
+        예약한 뒤 가지고 있는 스냅샷을 그대로 반환합니다 (조회를 기다리지 않음).
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+
+        Returns:
+            dict: {'bid_info', 'fetched_at', 'age', 'fresh', 'refreshing'} (스냅샷이 없으면 bid_info는 None)
+        """
+        now = time.time()
+        bid_info, fetched_at = self.quotes.get(product_url, size)
+        fresh = self.quotes.is_fresh(product_url, size, now)
+        if not fresh and self.quotes.begin_refresh(product_url, size):
+            self._quote_executor.submit(self._refresh_quote, product_url, size)
+
+        return {
+            'product_url': product_url,
+            'size': size,
+            'bid_info': bid_info,
+            'fetched_at': datetime.fromtimestamp(fetched_at).strftime('%Y-%m-%d %H:%M:%S') if fetched_at else None,
+            'age': now - fetched_at if fetched_at else None,
+            'fresh': fresh,
+            'refreshing': self.quotes.is_refreshing(product_url, size),
+        }
+
+    def _refresh_quote(self, product_url, size):
+        """스냅샷 갱신 (공유 크롤러 풀, 처음 한 번만 브라우저 시작)"""
+        try:
+            if self._quote_pool is None:
+                pool = CrawlerPool(self.quote_crawlers, self.config, login=False)
+                pool.start()
+                self._quote_pool = pool
+            bid_info = self._quote_pool.fetch([(product_url, size)]).get((product_url, size))
+            if bid_info:
+                self.quotes.put(product_url, size, bid_info)
+                return
+            self.logger.warning(f"가격 조회 결과 없음: {product_url} 사이즈 {size}")
+        except Exception as e:
+            self.logger.error(f"가격 조회 실패 ({product_url}): {e}")
+        self.quotes.end_refresh(product_url, size)
+
+    def profile(self, seconds=None):
+        """
+        CPU 프로파일 시작 (작업을 멈추지 않음, 끝나면 logs/에 기록)
+
+        Args:
+            seconds (float): 수집 시간 (None이면 profiling.window)
+
+        Returns:
+            dict: 프로파일링 상태
+        """
+        return get_profiler().start_profile(seconds)
+
+    def memory_snapshot(self):
+        """
+        메모리 스냅샷 (직전 스냅샷 대비 증가량을 logs/에 기록)
+
+        Returns:
+            dict: 결과 파일 경로, 자료구조 크기, 증가량 상위 위치
+        """
+        return get_profiler().memory_snapshot()
+
+    def profiling(self):
+        """
+        프로파일링 상태
+
+        Returns:
+            dict: 상태 정보
+        """
+        return get_profiler().status()
+
+    def status(self):
+        """
+        데몬 상태
+
+        Returns:
+            dict: 상태 정보
+        """
+        return {
+            'uptime': time.time() - self.started_at,
+            'monitors': sum(1 for job in list(self.jobs.values()) if job.kind == 'monitor' and job.status == 'running'),
+            'bids': sum(1 for job in list(self.jobs.values()) if job.kind == 'bid' and job.status == 'running'),
+        }
+
+    def shutdown(self):
+        """모든 작업 중지"""
+        for job in list(self.jobs.values()):
+            job.worker.stop()
+        for job in list(self.jobs.values()):
+            if job.thread:
+                job.thread.join(timeout=10)
+        self._quote_executor.shutdown(wait=True)
+        if self._quote_pool:
+            self._quote_pool.close()
+        if self._exporter:
+            self._exporter.close()
+            self._exporter.store.close()
+        self.ledger.close()
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """로컬 HTTP API 핸들러"""
+
+    daemon = None
+
+    def log_message(self, format, *args):
+        """요청 로그는 데몬 로거로 (DEBUG)"""
+        self.daemon.logger.debug(format % args)
+
+    def _send(self, status, payload):
+        """JSON 응답"""
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, body, content_type):
+        """텍스트 응답"""
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, chunks, content_type, filename):
+        """청크 스트리밍 응답 (Content-Length 없이 연결 종료로 끝을 알림)"""
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        for chunk in chunks:
+            self.wfile.write(chunk)
+        self.close_connection = True
+
+    def _body(self):
+        """요청 본문 JSON"""
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+
+    def _route(self, method):
+        """경로별 처리"""
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        daemon = self.daemon
+
+        try:
+            if method == 'GET' and parts == ['metrics']:
+                return self._send_text(REGISTRY.render(), CONTENT_TYPE)
+            if method == 'GET' and parts == ['status']:
+                return self._send(200, daemon.status())
+            if method == 'GET' and parts == ['jobs']:
+                return self._send(200, daemon.list_jobs(query.get('kind')))
+            if method == 'GET' and len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'prices':
+                prices = daemon.prices(int(parts[1]), int(query.get('since', 0)))
+                if prices is None:
+                    return self._send(404, {'error': '모니터링 작업이 없습니다'})
+                return self._send(200, prices)
+            if method == 'POST' and parts == ['monitors']:
+                return self._send(201, daemon.start_monitor(**self._body()))
+            if method == 'POST' and parts == ['bids']:
+                return self._send(201, daemon.start_bid(**self._body()))
+            if method == 'DELETE' and len(parts) == 2 and parts[0] == 'jobs':
+                job = daemon.stop_job(int(parts[1]))
+                if job is None:
+                    return self._send(404, {'error': '작업이 없습니다'})
+                return self._send(200, job)
+            if method == 'POST' and parts == ['exports']:
+                body = self._body()
+                unknown = sorted(set(body) - set(EXPORT_FIELDS))
+                if unknown:
+                    return self._send(400, {'error': f"알 수 없는 필드: {', '.join(unknown)}"})
+                return self._send(202, daemon.start_export(**body))
+            if method == 'GET' and parts == ['exports']:
+                return self._send(200, daemon.exports())
+            if method == 'GET' and len(parts) == 2 and parts[0] == 'exports':
+                export = daemon.exports(int(parts[1]))
+                if export is None:
+                    return self._send(404, {'error': '내보내기 작업이 없습니다'})
+                return self._send(200, export)
+            if method == 'POST' and parts == ['profile']:
+                return self._send(202, daemon.profile(self._body().get('seconds')))
+            if method == 'POST' and parts == ['profile', 'memory']:
+                return self._send(200, daemon.memory_snapshot())
+            if method == 'GET' and parts == ['profile']:
+                return self._send(200, daemon.profiling())
+            if method == 'GET' and parts == ['quote']:
+                if not query.get('product_url') or not query.get('size'):
+                    return self._send(400, {'error': 'product_url과 size가 필요합니다'})
+                return self._send(200, daemon.quote(query['product_url'], query['size']))
+            if method == 'GET' and parts and parts[0] == 'history':
+                filters = {key: query[key] for key in HISTORY_FILTERS if query.get(key)}
+                if parts == ['history']:
+                    return self._send(200, daemon.bid_history(
+                        int(query.get('page', 1)), int(query.get('page_size', 50)), **filters
+                    ))
+                if parts == ['history', 'summary']:
+                    return self._send(200, daemon.bid_summary(**filters))
+                if parts == ['history', 'export.csv']:
+                    filename = f"bid_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                    return self._send_stream(daemon.export_history(**filters), 'text/csv; charset=utf-8', filename)
+            return self._send(404, {'error': f'알 수 없는 경로: {url.path}'})
+        except (TypeError, ValueError) as e:
+            return self._send(400, {'error': str(e)})
+        except Exception as e:
+            daemon.logger.error(f"API 처리 실패 ({method} {self.path}): {e}")
+            return self._send(500, {'error': str(e)})
+
+    def do_GET(self):
+        self._route('GET')
+
+    def do_POST(self):
+        self._route('POST')
+
+    def do_DELETE(self):
+        self._route('DELETE')
+
+
+def serve(host=None, port=None):
+    """
+    데몬 실행 (Ctrl+C로 종료)
+
+    Args:
+        host (str): 바인딩 주소
+        port (int): 포트
+    """
+    create_directories()
+    daemon = BidderDaemon()
+    print_unknown_bids(daemon.ledger)
+    daemon_config = daemon.config.get('daemon', {})
+    host = host or daemon_config.get('host', '127.0.0.1')
+    port = port or daemon_config.get('port', 8765)
+
+    ApiHandler.daemon = daemon
+    install_signal_handlers()
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    daemon.logger.info(f"데몬 시작: http://{host}:{port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        daemon.logger.info("데몬 종료 요청")
+    finally:
+        server.server_close()
+        daemon.shutdown()
+        daemon.logger.info("데몬 종료")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='KREAM 자동 입찰 백엔드 데몬')
+    parser.add_argument('--host', type=str, help='바인딩 주소 (기본: 127.0.0.1)')
+    parser.add_argument('--port', type=int, help='포트 (기본: 8765)')
+
+    args = parser.parse_args()
+    serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
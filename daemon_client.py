@@ -0,0 +1,146 @@
+"""
+백엔드 데몬 API 클라이언트
+"""
+import requests
+from utils import load_config
+
+
+class DaemonUnavailable(Exception):
+    """데몬에 연결할 수 없음"""
+
+
+class DaemonClient:
+    """daemon.py 로컬 API 클라이언트"""
+
+    def __init__(self, base_url=None, timeout=3):
+        """
+        초기화
+
+        Args:
+            base_url (str): 데몬 주소 (None이면 설정 파일 기준)
+            timeout (float): 요청 타임아웃 (초)
+        """
+        if base_url is None:
+            daemon_config = load_config().get('daemon', {})
+            base_url = f"http://{daemon_config.get('host', '127.0.0.1')}:{daemon_config.get('port', 8765)}"
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _request(self, method, path, **kwargs):
+        """API 호출"""
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise DaemonUnavailable(f"데몬에 연결할 수 없습니다 ({self.base_url}): {e}")
+
+        payload = response.json()
+        if response.status_code >= 400:
+            raise ValueError(payload.get('error', response.text))
+        return payload
+
+    def status(self):
+        """데몬 상태"""
+        return self._request('GET', '/status')
+
+    def is_available(self):
+        """
+        데몬 실행 여부
+
+        Returns:
+            bool: 연결 가능 여부
+        """
+        try:
+            self.status()
+            return True
+        except DaemonUnavailable:
+            return False
+
+    def list_jobs(self, kind=None):
+        """작업 목록 (kind: monitor, bid)"""
+        return self._request('GET', '/jobs', params={'kind': kind} if kind else None)
+
+    def start_monitor(self, product_url, size=None, check_interval=None, headless=False):
+        """가격 모니터링 시작"""
+        return self._request('POST', '/monitors', json={
+            'product_url': product_url,
+            'size': size,
+            'check_interval': check_interval,
+            'headless': headless
+        })
+
+    def start_bid(self, product_url, size, target_price, max_price=None, check_interval=None, headless=False):
+        """자동 입찰 시작"""
+        return self._request('POST', '/bids', json={
+            'product_url': product_url,
+            'size': size,
+            'target_price': target_price,
+            'max_price': max_price,
+            'check_interval': check_interval,
+            'headless': headless
+        })
+
+    def stop_job(self, job_id):
+        """작업 중지"""
+        return self._request('DELETE', f'/jobs/{job_id}')
+
+    def prices(self, job_id, since=0):
+        """모니터링 작업의 가격 피드 (since 순번 이후 샘플, 음수면 최근 -since건)"""
+        return self._request('GET', f'/jobs/{job_id}/prices', params={'since': since})
+
+    def start_export(self, format='csv', **filters):
+        """가격 이력 내보내기 시작 (filters: product_url, size, date_from, date_to)"""
+        body = {'format': format}
+        body.update({key: value for key, value in filters.items() if value})
+        return self._request('POST', '/exports', json=body)
+
+    def export_status(self, export_id):
+        """내보내기 진행 상황"""
+        return self._request('GET', f'/exports/{export_id}')
+
+    def quote(self, product_url, size):
+        """현재 가격 (데몬의 스냅샷 캐시, 오래되면 백그라운드 갱신)"""
+        return self._request('GET', '/quote', params={'product_url': product_url, 'size': size})
+
+    def start_profile(self, seconds=None):
+        """CPU 프로파일 시작 (끝나면 데몬의 logs/에 기록)"""
+        return self._request('POST', '/profile', json={'seconds': seconds})
+
+    def memory_snapshot(self):
+        """메모리 스냅샷 (직전 스냅샷 대비 증가량)"""
+        return self._request('POST', '/profile/memory')
+
+    def profile_status(self):
+        """프로파일링 상태"""
+        return self._request('GET', '/profile')
+
+    def bid_history(self, page=1, page_size=50, **filters):
+        """입찰 기록 페이지 (filters: product_url, size, status, date_from, date_to)"""
+        params = {'page': page, 'page_size': page_size}
+        params.update({key: value for key, value in filters.items() if value})
+        return self._request('GET', '/history', params=params)
+
+    def bid_summary(self, **filters):
+        """상태별 입찰 건수"""
+        return self._request('GET', '/history/summary', params={key: value for key, value in filters.items() if value})
+
+    def export_history(self, timeout=60, **filters):
+        """
+        입찰 기록 CSV 받기 (데몬이 스트리밍한 전체 기록을 이 프로세스에서 받음)
+
+        Args:
+            timeout (float): 요청 타임아웃 (초, 기록이 많으면 기본 타임아웃보다 길게)
+            **filters: product_url, size, status, date_from, date_to
+
+        Returns:
+            bytes: CSV 내용
+        """
+        params = {key: value for key, value in filters.items() if value}
+        try:
+            response = self.session.get(f"{self.base_url}/history/export.csv", params=params, timeout=timeout)
+        except requests.RequestException as e:
+            raise DaemonUnavailable(f"데몬에 연결할 수 없습니다 ({self.base_url}): {e}")
+
+        if response.status_code >= 400:
+            raise ValueError(response.json().get('error', response.text))
+        return response.content
@@ -0,0 +1,205 @@
+"""
+크롬드라이버 경로 캐시 모듈
+
+설치된 Chrome 버전별로 한 번 받은 크롬드라이버 경로와 SHA-256 체크섬을 기록해 두고,
+다음 실행부터는 파일이 그대로 있으면 네트워크 조회 없이 바로 사용합니다.
+browser.driver_path로 경로를 직접 지정하거나 browser.driver_offline으로
+네트워크 조회를 완전히 막을 수 있습니다 (외부망이 없는 환경).
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import platform
+import threading
+import subprocess
+from datetime import datetime
+from utils import setup_logger, load_config
+
+
+# Chrome 실행 파일 후보 (운영체제별)
+CHROME_COMMANDS = {
+    'Linux': ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser'],
+    'Darwin': ['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'],
+    'Windows': [
+        r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+        r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe',
+    ],
+}
+
+# 프로세스 안에서 한 번 확인한 결과 (Chrome 버전, 드라이버 경로)
+_versions = {}
+_resolved = {}
+_lock = threading.Lock()
+
+
+def detect_chrome_version(binary=None):
+    """
+    설치된 Chrome 버전 확인
+
+    Args:
+        binary (str): Chrome 실행 파일 (None이면 운영체제별 기본 경로)
+
+    Returns:
+        str: 버전 (예: "120.0.6099.109"), 찾지 못하면 None
+    """
+    system = platform.system()
+    if system == 'Windows' and binary is None:
+        try:
+            output = subprocess.run(
+                ['reg', 'query', r'HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon', '/v', 'version'],
+                capture_output=True, text=True, timeout=5
+            ).stdout
+            match = re.search(r'(\d+\.\d+\.\d+\.\d+)', output)
+            if match:
+                return match.group(1)
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+    for command in [binary] if binary else CHROME_COMMANDS.get(system, []):
+        try:
+            output = subprocess.run([command, '--version'], capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r'(\d+\.\d+\.\d+\.\d+)', output)
+        if match:
+            return match.group(1)
+    return None
+
+
+def file_checksum(path):
+    """
+    파일 SHA-256 체크섬
+
+    Args:
+        path (str): 파일 경로
+
+    Returns:
+        str: 16진수 체크섬
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DriverCache:
+    """Chrome 버전별 크롬드라이버 경로 캐시"""
+
+    def __init__(self, config=None):
+        """
+        초기화
+
+        Args:
+            config (dict): 설정 (None이면 config.yaml 로드)
+        """
+        self.logger = setup_logger('DriverCache', 'logs/crawler.log')
+        self.config = config if config is not None else load_config()
+        browser_config = self.config.get('browser', {})
+        self.driver_path = browser_config.get('driver_path')
+        self.offline = browser_config.get('driver_offline', False)
+        self.chrome_binary = browser_config.get('chrome_binary')
+        self.cache_file = browser_config.get('driver_cache', 'data/driver_cache.json')
+
+    def _load(self):
+        """캐시 파일 읽기"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries):
+        """캐시 파일 쓰기 (임시 파일 후 교체)"""
+        if os.path.dirname(self.cache_file):
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp_path = f"{self.cache_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cache_file)
+
+    def _verify(self, entry):
+        """기록된 드라이버 파일이 그대로 있는지 확인"""
+        path = entry.get('path')
+        return bool(path) and os.path.isfile(path) and file_checksum(path) == entry.get('sha256')
+
+    def resolve(self):
+        """
+        크롬드라이버 경로 확인
+
+        순서: 직접 지정한 경로 → 같은 프로세스에서 확인한 경로 → 캐시(체크섬 확인) → 네트워크 조회
+
+        Returns:
+            str: 크롬드라이버 경로
+
+        Raises:
+            RuntimeError: 오프라인 모드에서 사용할 수 있는 드라이버가 없을 때
+        """
+        started = time.perf_counter()
+
+        if self.driver_path:
+            if not os.path.isfile(self.driver_path):
+                raise RuntimeError(f"browser.driver_path에 드라이버가 없습니다: {self.driver_path}")
+            self.logger.info(f"드라이버 경로 사용 (설정): {self.driver_path}")
+            return self.driver_path
+
+        if self.chrome_binary not in _versions:
+            _versions[self.chrome_binary] = detect_chrome_version(self.chrome_binary)
+        chrome_version = _versions[self.chrome_binary]
+        key = chrome_version or 'unknown'
+
+        with _lock:
+            path = _resolved.get(key)
+            if path:
+                return path
+
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None and chrome_version is None and entries:
+                # Chrome 버전을 모르면 마지막으로 확인한 드라이버 사용
+                entry = max(entries.values(), key=lambda item: item.get('resolved_at', ''))
+                self.logger.warning(f"Chrome 버전을 확인할 수 없어 마지막 드라이버 사용 (Chrome {entry.get('chrome_version')})")
+
+            if entry and self._verify(entry):
+                source = '캐시'
+                path = entry['path']
+            elif self.offline:
+                raise RuntimeError(
+                    f"오프라인 모드: Chrome {key}에 맞는 드라이버가 캐시에 없습니다 "
+                    "(browser.driver_path로 직접 지정하세요)"
+                )
+            else:
+                if entry:
+                    self.logger.warning(f"캐시된 드라이버가 없거나 변경되어 다시 받습니다: {entry.get('path')}")
+                from webdriver_manager.chrome import ChromeDriverManager
+                source = '네트워크'
+                path = ChromeDriverManager().install()
+                entries[key] = {
+                    'chrome_version': chrome_version,
+                    'path': path,
+                    'sha256': file_checksum(path),
+                    'resolved_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                }
+                self._save(entries)
+
+            _resolved[key] = path
+
+        self.logger.info(
+            f"드라이버 확인 ({source}, Chrome {key}): {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        return path
+
+
+def resolve_driver(config=None):
+    """
+    크롬드라이버 경로 확인 (DriverCache.resolve 단축 함수)
+
+    Args:
+        config (dict): 설정 (None이면 config.yaml 로드)
+
+    Returns:
+        str: 크롬드라이버 경로
+    """
+    return DriverCache(config).resolve()
@@ -0,0 +1,379 @@
+"""
+데이터 내보내기 모듈
+
+가격 이력 저장소에서 행을 청크 단위로 읽어 백그라운드 스레드에서 파일로 씁니다.
+전체 데이터를 한 번에 메모리에 올리지 않으며, 작업마다 진행률을 확인할 수 있습니다.
+
+지원 형식 (확장자로 결정):
+    .csv       CSV (UTF-8 BOM, Excel 호환)
+    .csv.gz    gzip 압축 CSV
+    .xlsx      Excel (openpyxl 쓰기 전용 모드, 시트당 최대 행 수 초과 시 다음 시트)
+    .parquet   Parquet (pyarrow, 청크마다 row group)
+
+실행:
+    python exporter.py data/price_history.parquet --size 270 --date-from 2024-01-01
+"""
+import os
+import csv
+import gzip
+import time
+import argparse
+import itertools
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from history_store import HistoryStore, PRICE_COLUMNS
+from metrics import track_queue
+from utils import setup_logger, load_config
+
+
+FORMATS = ('csv', 'csv.gz', 'xlsx', 'parquet')
+EXCEL_MAX_ROWS = 1048576
+
+
+def detect_format(path):
+    """
+    파일 확장자로 형식 결정
+
+    Args:
+        path (str): 파일 경로
+
+    Returns:
+        str: csv, csv.gz, xlsx, parquet
+    """
+    lower = path.lower()
+    for fmt in ('csv.gz', 'csv', 'xlsx', 'parquet'):
+        if lower.endswith(f'.{fmt}'):
+            return fmt
+    raise ValueError(f"지원하지 않는 형식입니다: {path} ({', '.join(FORMATS)})")
+
+
+def _write_csv(f, columns, chunks, progress):
+    """CSV 쓰기"""
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows(rows)
+        progress(len(rows))
+
+
+def _write_xlsx(path, columns, chunks, progress):
+    """Excel 쓰기 (쓰기 전용 모드)"""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("Excel 내보내기에는 openpyxl이 필요합니다 (pip install openpyxl)")
+
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = EXCEL_MAX_ROWS
+    for rows in chunks:
+        for row in rows:
+            if sheet_rows >= EXCEL_MAX_ROWS:
+                sheet = workbook.create_sheet(f"data{len(workbook.worksheets) + 1}")
+                sheet.append(columns)
+                sheet_rows = 1
+            sheet.append(row)
+            sheet_rows += 1
+        progress(len(rows))
+    if sheet is None:
+        workbook.create_sheet('data1').append(columns)
+    workbook.save(path)
+
+
+def _write_parquet(path, columns, chunks, progress):
+    """Parquet 쓰기 (청크마다 row group)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet 내보내기에는 pyarrow가 필요합니다 (pip install pyarrow)")
+
+    writer = None
+    try:
+        for rows in chunks:
+            table = pa.Table.from_pylist([dict(zip(columns, row)) for row in rows])
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+            writer.write_table(table.cast(writer.schema))
+            progress(len(rows))
+        if writer is None:
+            pq.write_table(pa.table({column: [] for column in columns}), path)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_rows(path, columns, chunks, fmt=None, progress=None):
+    """
+    행 청크를 파일로 쓰기 (임시 파일에 쓴 뒤 교체)
+
+    Args:
+        path (str): 저장할 파일 경로
+        columns (list): 열 이름 목록
+        chunks: 행 튜플 목록을 차례로 내는 반복자
+        fmt (str): 형식 (None이면 확장자로 결정)
+        progress: progress(rows) 콜백 (청크마다 호출)
+
+    Returns:
+        str: 저장한 파일 경로
+    """
+    fmt = fmt or detect_format(path)
+    progress = progress or (lambda rows: None)
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    try:
+        if fmt == 'csv':
+            with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+                _write_csv(f, columns, chunks, progress)
+        elif fmt == 'csv.gz':
+            with gzip.open(tmp_path, 'wt', compresslevel=6, encoding='utf-8-sig', newline='') as f:
+                _write_csv(f, columns, chunks, progress)
+        elif fmt == 'xlsx':
+            _write_xlsx(tmp_path, columns, chunks, progress)
+        elif fmt == 'parquet':
+            _write_parquet(tmp_path, columns, chunks, progress)
+        else:
+            raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def records_to_chunks(data, chunk_size=10000):
+    """
+    레코드 목록(딕셔너리 목록 또는 DataFrame)을 (열 이름, 행 청크 반복자)로 변환
+
+    Args:
+        data: 딕셔너리 목록 또는 DataFrame
+        chunk_size (int): 청크 크기
+
+    Returns:
+        tuple: (열 이름 목록, 행 청크 반복자)
+    """
+    if hasattr(data, 'itertuples'):
+        columns = [str(column) for column in data.columns]
+        rows = data.itertuples(index=False, name=None)
+    else:
+        data = list(data)
+        columns = list(data[0].keys()) if data else []
+        rows = (tuple(record.get(column) for column in columns) for record in data)
+
+    def chunks():
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    return columns, chunks()
+
+
+class ExportJob:
+    """내보내기 작업 상태"""
+
+    def __init__(self, job_id, path, fmt, filters, total):
+        """
+        초기화
+
+        Args:
+            job_id (int): 작업 ID
+            path (str): 저장할 파일 경로
+            fmt (str): 형식
+            filters (dict): 조회 조건
+            total (int): 전체 행 수 (진행률 계산용)
+        """
+        self.id = job_id
+        self.path = path
+        self.format = fmt
+        self.filters = filters
+        self.total = total
+        self.rows_written = 0
+        self.status = 'queued'
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+
+    @property
+    def progress(self):
+        """진행률 (0.0 ~ 1.0)"""
+        if self.status == 'done':
+            return 1.0
+        return min(1.0, self.rows_written / self.total) if self.total else 0.0
+
+    def to_dict(self):
+        """
+        API 응답용 딕셔너리
+
+        Returns:
+            dict: 작업 정보
+        """
+        return {
+            'id': self.id,
+            'path': self.path,
+            'format': self.format,
+            'filters': self.filters,
+            'status': self.status,
+            'rows_written': self.rows_written,
+            'total': self.total,
+            'progress': round(self.progress, 4),
+            'error': self.error,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class Exporter:
+    """가격 이력 백그라운드 내보내기"""
+
+    def __init__(self, store=None, workers=1, chunk_size=None):
+        """
+        초기화
+
+        Args:
+            store (HistoryStore): 가격 이력 저장소 (None이면 설정 파일 기준)
+            workers (int): 동시에 실행할 내보내기 수
+            chunk_size (int): 한 번에 읽고 쓰는 행 수
+        """
+        self.logger = setup_logger('Exporter', 'logs/export.log')
+        storage_config = load_config().get('storage', {})
+        self.store = store or HistoryStore(storage_config.get('history_db', 'data/history.db'))
+        self.chunk_size = chunk_size or storage_config.get('export_chunk_size', 10000)
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='Exporter')
+
+    def submit(self, path, fmt=None, **filters):
+        """
+        내보내기 예약 (바로 반환)
+
+        Args:
+            path (str): 저장할 파일 경로
+            fmt (str): 형식 (None이면 확장자로 결정)
+            **filters: product_url, size, date_from, date_to (날짜 또는 'YYYY-MM-DD HH:MM:SS')
+
+        Returns:
+            ExportJob: 작업
+        """
+        fmt = fmt or detect_format(path)
+        filters = {key: value for key, value in filters.items() if value}
+        job = ExportJob(next(self._ids), path, fmt, filters, self.store.count(**filters))
+        with self._lock:
+            self.jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job)
+        self.logger.info(f"내보내기 예약 #{job.id}: {path} ({job.total}건)")
+        return job
+
+    def _run(self, job):
+        """작업 실행 (백그라운드 스레드)"""
+        job.status = 'running'
+        job.started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        started = time.monotonic()
+
+        def progress(rows):
+            job.rows_written += rows
+
+        try:
+            chunks = self.store.iter_rows(chunk_size=self.chunk_size, **job.filters)
+            write_rows(job.path, list(PRICE_COLUMNS), chunks, job.format, progress)
+            job.status = 'done'
+            self.logger.info(
+                f"내보내기 완료 #{job.id}: {job.path} ({job.rows_written}건, {time.monotonic() - started:.1f}초)"
+            )
+        except Exception as e:
+            job.status = 'error'
+            job.error = str(e)
+            self.logger.error(f"내보내기 실패 #{job.id}: {e}")
+        finally:
+            job.finished_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return job
+
+    def get(self, job_id):
+        """
+        작업 조회
+
+        Args:
+            job_id (int): 작업 ID
+
+        Returns:
+            ExportJob: 작업 (없으면 None)
+        """
+        return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        """
+        작업 목록
+
+        Returns:
+            list: 작업 정보 목록
+        """
+        return [job.to_dict() for job in list(self.jobs.values())]
+
+    def close(self, wait=True):
+        """
+        종료
+
+        Args:
+            wait (bool): 진행 중인 작업이 끝날 때까지 대기
+        """
+        self._executor.shutdown(wait=wait)
+
+
+_default_exporter = None
+_default_lock = threading.Lock()
+
+
+def get_exporter():
+    """
+    프로세스 공용 내보내기 작업기
+
+    Returns:
+        Exporter: 내보내기 작업기
+    """
+    global _default_exporter
+    if _default_exporter is None:
+        with _default_lock:
+            if _default_exporter is None:
+                _default_exporter = Exporter()
+                track_queue('export', lambda: sum(
+                    job.status in ('queued', 'running') for job in list(_default_exporter.jobs.values())
+                ))
+    return _default_exporter
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='가격 이력 내보내기')
+    parser.add_argument('output', type=str, help=f"저장할 파일 ({', '.join(FORMATS)})")
+    parser.add_argument('--product-url', type=str, help='상품 URL')
+    parser.add_argument('--size', type=str, help='사이즈')
+    parser.add_argument('--date-from', type=str, help='시작 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--date-to', type=str, help='종료 날짜 (YYYY-MM-DD, 포함)')
+    parser.add_argument('--db', type=str, help='가격 이력 데이터베이스')
+
+    args = parser.parse_args()
+
+    exporter = Exporter(HistoryStore(args.db) if args.db else None)
+    job = exporter.submit(
+        args.output, product_url=args.product_url, size=args.size, date_from=args.date_from, date_to=args.date_to
+    )
+    while not job.future.done():
+        print(f"\r진행률: {job.progress * 100:5.1f}% ({job.rows_written:,}/{job.total:,}건)", end='', flush=True)
+        time.sleep(0.5)
+    print(f"\r진행률: {job.progress * 100:5.1f}% ({job.rows_written:,}/{job.total:,}건)")
+    exporter.close()
+
+    if job.status == 'done':
+        print(f"✅ 저장 완료: {job.path}")
+    else:
+        print(f"❌ 내보내기 실패: {job.error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+가짜 웹드라이버 모듈
+
+브라우저 없이 KreamCrawler/PriceMonitor/KreamAutoBidder 루프를 실행하기 위한
+WebDriver 대역입니다. 크롤러가 사용하는 API(get, find_element(s), 스크린샷 등)만 구현하며,
+페이지별 요소 텍스트와 가격 시퀀스를 미리 정해 둡니다. 가격 요소(kream_crawler.PRICE_SELECTORS)는
+실제 페이지처럼 이동 없이 갱신되며, 같은 가격 요소를 다시 읽으면 시퀀스의 다음 값으로 바뀝니다.
+네트워크가 없으므로 가상 시계(clock.VirtualClock)와 함께 쓰면 테스트/벤치마크에서
+초당 수천 번의 가격 확인을 실행할 수 있습니다.
+
+사용:
+    from fake_driver import FakeDriver, price_walk
+    driver = FakeDriver(prices={url: price_walk(150000)})
+    crawler = KreamCrawler(driver_factory=lambda: driver)
+"""
+import zlib
+import random
+from kream_crawler import PRICE_SELECTORS
+from utils import format_price
+
+
+# 1x1 투명 PNG (스크린샷 대역)
+BLANK_PNG = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000b49444154789c6360000200000500017a5eab3f0000000049454e44ae426082'
+)
+
+
+class NoSuchElementException(Exception):
+    """요소를 찾을 수 없음 (selenium의 같은 이름 예외 대역)"""
+
+
+def price_walk(start=150000, step=1000, spread=10000, seed=0):
+    """
+    랜덤 워크 가격 시퀀스 (끝없이 생성)
+
+    Args:
+        start (int): 시작 최저 판매가
+        step (int): 한 번에 움직이는 가격 단위
+        spread (int): 최저 판매가와 최고 입찰가/즉시 구매가의 차이
+        seed (int): 난수 시드 (같은 시드면 같은 시퀀스)
+
+    Yields:
+        dict: buy_now_price, highest_bid, lowest_ask
+    """
+    rng = random.Random(seed)
+    price = start
+    while True:
+        price = max(step, price + rng.choice((-2, -1, 0, 1, 2)) * step)
+        yield {'buy_now_price': price + spread // 2, 'highest_bid': price - spread // 2, 'lowest_ask': price}
+
+
+class FakeElement:
+    """가짜 요소"""
+
+    def __init__(self, driver, selector, text=''):
+        """
+        초기화
+
+        Args:
+            driver (FakeDriver): 이벤트를 기록할 드라이버
+            selector (str): 요소를 찾은 CSS 선택자
+            text (str): 요소 텍스트
+        """
+        self.driver = driver
+        self.selector = selector
+        self.text = text
+        self.value = ''
+
+    def click(self):
+        """클릭 (driver.events에 기록)"""
+        self.driver.events.append(('click', self.selector))
+
+    def clear(self):
+        """입력값 지우기"""
+        self.value = ''
+
+    def send_keys(self, *keys):
+        """입력값 뒤에 추가 (driver.events에 기록)"""
+        self.value += ''.join(str(key) for key in keys)
+        self.driver.events.append(('send_keys', self.selector, self.value))
+
+    def get_attribute(self, name):
+        """속성 값 ('value'만 지원, 나머지는 None)"""
+        return self.value if name == 'value' else None
+
+    def is_displayed(self):
+        """화면 표시 여부 (항상 True)"""
+        return True
+
+    def is_enabled(self):
+        """활성화 여부 (항상 True)"""
+        return True
+
+
+class FakeDriver:
+    """가짜 웹드라이버 (페이지 요소와 가격 시퀀스를 스크립트로 지정)"""
+
+    def __init__(self, pages=None, prices=None):
+        """
+        초기화
+
+        Args:
+            pages (dict): {URL: {CSS 선택자: 텍스트}} (모든 페이지 공통은 '*' 키)
+            prices (dict): {URL: 가격 딕셔너리 반복자 또는 목록} (가격을 읽을 때마다 다음 값,
+                           목록이 끝나면 마지막 값 유지, 없는 URL은 '*' 키 또는 price_walk())
+        """
+        self.pages = pages or {}
+        self.prices = {url: iter(sequence) for url, sequence in (prices or {}).items()}
+        self.current_prices = {}
+        self._price_reads = {}      # URL -> 현재 가격에서 이미 읽은 가격 선택자
+        self.current_url = 'about:blank'
+        self.title = ''
+        self.events = []
+        self.page_loads = 0
+        self.price_reads = 0
+        self.screenshots = 0
+        self.closed = False
+
+    # -- 탐색 --------------------------------------------------------------
+
+    def get(self, url):
+        self.current_url = url
+        self.page_loads += 1
+        self.events.append(('get', url))
+
+    def refresh(self):
+        self.page_loads += 1
+        self.events.append(('refresh', self.current_url))
+
+    @property
+    def page_source(self):
+        return ''.join(f'<div data-selector="{selector}">{text}</div>' for selector, text in self._elements().items())
+
+    # -- 요소 ----------------------------------------------------------------
+
+    def _next_prices(self):
+        """현재 페이지의 다음 가격"""
+        url = self.current_url
+        sequence = self.prices.get(url)
+        if sequence is None:
+            sequence = self.prices.get('*')
+        if sequence is None:
+            sequence = self.prices[url] = price_walk(seed=zlib.crc32(url.encode('utf-8')))
+        try:
+            self.current_prices[url] = next(sequence)
+        except StopIteration:
+            pass
+        self.price_reads += 1
+        return self.current_prices.get(url, {})
+
+    def _elements(self):
+        """현재 페이지의 {선택자: 텍스트}"""
+        elements = dict(self.pages.get('*', {}))
+        elements.update(self.pages.get(self.current_url, {}))
+        prices = self.current_prices.get(self.current_url, {})
+        for name, selector in PRICE_SELECTORS.items():
+            if name in prices:
+                elements[selector] = format_price(prices[name])
+        return elements
+
+    def _read_price(self, selector):
+        """가격 요소 읽기 전 갱신 (처음 읽거나 같은 요소를 다시 읽으면 다음 가격으로)"""
+        url = self.current_url
+        read = self._price_reads.get(url)
+        if read is None or selector in read:
+            self._next_prices()
+            read = self._price_reads[url] = set()
+        read.add(selector)
+
+    def find_elements(self, by='css selector', value=None):
+        if value in PRICE_SELECTORS.values():
+            self._read_price(value)
+        elements = self._elements()
+        if value in elements:
+            return [FakeElement(self, value, elements[value])]
+        return []
+
+    def find_element(self, by='css selector', value=None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"요소 없음: {value} ({self.current_url})")
+        return found[0]
+
+    # -- 스크립트 ------------------------------------------------------------
+
+    def execute_script(self, script, *args):
+        self.events.append(('script', script))
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    # -- 설정/종료 -----------------------------------------------------------
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def get_cookies(self):
+        return []
+
+    def add_cookie(self, cookie):
+        pass
+
+    def save_screenshot(self, filename):
+        with open(filename, 'wb') as f:
+            f.write(BLANK_PNG)
+        self.screenshots += 1
+        return True
+
+    def get_screenshot_as_png(self):
+        self.screenshots += 1
+        return BLANK_PNG
+
+    def quit(self):
+        self.closed = True
+
+
+def driver_factory(pages=None, prices=None):
+    """
+    KreamCrawler(driver_factory=...)에 넘길 생성 함수
+
+    Args:
+        pages (dict): FakeDriver pages
+        prices (dict): FakeDriver prices (크롤러마다 같은 시퀀스를 공유)
+
+    Returns:
+        함수: 호출할 때마다 새 FakeDriver 반환
+    """
+    shared = {url: iter(sequence) for url, sequence in (prices or {}).items()}
+
+    def create():
+        driver = FakeDriver(pages)
+        driver.prices = shared
+        return driver
+
+    return create
+
@@ -0,0 +1,211 @@
+"""
+가격 이력 CSV 일괄 가져오기 모듈
+
+PriceMonitor._save_history/exporter가 남긴 price_history_*.csv 파일들을
+HistoryStore로 병렬 가져오기 합니다. 각 파일은 누적 이력 전체를 다시 쓴 것이므로
+저장소의 (product_url, size, timestamp) UNIQUE 제약으로 중복을 무시하고, 파일을 청크 단위로 읽어
+바로 저장하므로 메모리는 청크 크기만큼만 씁니다. 시각은 모니터가 저장하는 형식(마이크로초 포함)으로
+맞춰 저장하므로 같은 샘플은 어느 경로로 들어와도 한 행입니다.
+가져온 파일은 기록해 두어 중단 후 다시 실행하면 남은 파일부터 이어서 처리합니다.
+
+product_url 열이 없는 예전 파일은 어느 상품인지 알 수 없으므로 --product-url을 주지 않으면
+빈 상품 URL('')로 저장됩니다. 이 행은 예전 파일끼리만 중복 제거되고, 모니터가 상품 URL과 함께
+저장한 같은 샘플과는 별개의 행으로 남습니다 (상품 URL 필터로 내보낼 때도 포함되지 않음).
+예전 파일이 한 상품의 것이면 --product-url로 지정해 가져오세요.
+"""
+import os
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from history_store import HistoryStore, TIMESTAMP_FORMAT
+from utils import setup_logger, load_config
+
+
+CSV_COLUMNS = ['product_url', 'timestamp', 'buy_now_price', 'highest_bid', 'lowest_ask', 'size']
+BUSY_TIMEOUT_MS = 60000
+
+
+def chunk_rows(chunk, product_url=''):
+    """
+    CSV 청크 → 저장할 행 튜플 목록
+
+    Args:
+        chunk (pandas.DataFrame): read_csv 청크
+        product_url (str): product_url 열이 없거나 비어 있는 행에 쓸 상품 URL
+
+    Returns:
+        list: PRICE_COLUMNS 순서의 튜플 목록 (timestamp는 저장 형식, 해석할 수 없는 값은 그대로)
+    """
+    chunk = chunk.reindex(columns=CSV_COLUMNS).dropna(subset=['timestamp'])
+    chunk['product_url'] = chunk['product_url'].fillna('').replace('', product_url or '')
+    chunk['size'] = chunk['size'].fillna('')
+    parsed = pd.to_datetime(chunk['timestamp'].str.strip(), format='ISO8601', errors='coerce')
+    timestamps = parsed.dt.strftime(TIMESTAMP_FORMAT).fillna(chunk['timestamp'])
+    prices = chunk[['buy_now_price', 'highest_bid', 'lowest_ask']].fillna(0).astype('int64')
+    return list(zip(
+        chunk['product_url'].tolist(),
+        chunk['size'].tolist(),
+        timestamps.tolist(),
+        prices['buy_now_price'].tolist(),
+        prices['highest_bid'].tolist(),
+        prices['lowest_ask'].tolist()
+    ))
+
+
+def import_history_file(path, db_path, chunk_size=50000, product_url=''):
+    """
+    가격 이력 CSV 파일 하나를 청크 단위로 읽어 저장 (작업 프로세스에서 실행)
+
+    중복은 저장소의 UNIQUE 제약(INSERT OR IGNORE)이 거르므로 파일 전체나
+    이미 본 키를 메모리에 두지 않고, 청크마다 한 트랜잭션으로 저장합니다.
+
+    Args:
+        path (str): CSV 파일 경로
+        db_path (str): SQLite 데이터베이스 경로
+        chunk_size (int): 한 번에 읽고 저장할 행 수
+        product_url (str): product_url 열이 없는 예전 파일의 상품 URL (없으면 빈 값)
+
+    Returns:
+        tuple: (path, 읽은 행 수, 새로 저장한 행 수)
+    """
+    store = HistoryStore(db_path)
+    # 다른 작업 프로세스가 커밋하는 동안 기다림
+    store.conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+    rows_read = 0
+    rows_inserted = 0
+    try:
+        reader = pd.read_csv(
+            path,
+            usecols=lambda c: c in CSV_COLUMNS,
+            dtype={'product_url': str, 'timestamp': str, 'size': str},
+            chunksize=chunk_size,
+            encoding='utf-8-sig'
+        )
+        for chunk in reader:
+            rows = chunk_rows(chunk, product_url)
+            rows_read += len(rows)
+            with store.conn:
+                rows_inserted += store.insert_many(rows, commit=False)
+    finally:
+        store.close()
+    return path, rows_read, rows_inserted
+
+
+class HistoryImporter:
+    """가격 이력 CSV 일괄 가져오기"""
+
+    def __init__(self, store=None, workers=None, batch_size=None):
+        """
+        초기화
+
+        Args:
+            store (HistoryStore): 저장소 (None이면 설정 파일 기준으로 생성)
+            workers (int): 파싱/저장 프로세스 수
+            batch_size (int): 트랜잭션당 저장 행 수 (파일을 이 크기의 청크로 읽음)
+        """
+        self.logger = setup_logger('HistoryImporter', 'logs/history_import.log')
+        self.config = load_config()
+        storage_config = self.config.get('storage', {})
+
+        self.store = store or HistoryStore(storage_config.get('history_db', 'data/history.db'))
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size or storage_config.get('import_batch_size', 50000)
+
+    def find_pending_files(self, data_dir='data'):
+        """
+        아직 가져오지 않은 이력 파일 목록
+
+        Args:
+            data_dir (str): 이력 파일 디렉토리
+
+        Returns:
+            list: (path, mtime, file_size) 튜플 목록
+        """
+        pending = []
+        for path in sorted(glob.glob(os.path.join(data_dir, 'price_history_*.csv'))):
+            stat = os.stat(path)
+            if not self.store.is_imported(path, stat.st_mtime, stat.st_size):
+                pending.append((path, stat.st_mtime, stat.st_size))
+        return pending
+
+    def run(self, data_dir='data', product_url=None):
+        """
+        가져오기 실행
+
+        파일마다 작업 프로세스가 청크 단위로 저장하고, 끝난 파일만 가져오기 완료로 기록합니다.
+        중간에 멈춘 파일은 다시 실행할 때 처음부터 읽지만 이미 저장된 행은 무시됩니다.
+
+        Args:
+            data_dir (str): 이력 파일 디렉토리
+            product_url (str): product_url 열이 없는 예전 파일의 상품 URL (None이면 빈 값으로 저장)
+
+        Returns:
+            dict: 처리 결과 요약
+        """
+        start_time = time.time()
+        pending = self.find_pending_files(data_dir)
+        if not pending:
+            self.logger.info("가져올 파일이 없습니다")
+            return {'files': 0, 'rows_read': 0, 'rows_inserted': 0, 'elapsed': 0.0}
+
+        self.logger.info(f"가져오기 시작: {len(pending)}개 파일, 프로세스 {self.workers}개")
+
+        file_stats = {path: (mtime, file_size) for path, mtime, file_size in pending}
+        paths = [path for path, _, _ in pending]
+        rows_read = 0
+        rows_inserted = 0
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(
+                import_history_file, paths, [self.store.db_path] * len(paths), [self.batch_size] * len(paths),
+                [product_url or ''] * len(paths)
+            )
+            for done, (path, read, inserted) in enumerate(results, 1):
+                rows_read += read
+                rows_inserted += inserted
+                mtime, file_size = file_stats[path]
+                self.store.mark_imported([(path, mtime, file_size, read)])
+                self.logger.info(f"진행: {done}/{len(pending)} 파일, 신규 {rows_inserted}건")
+
+        elapsed = time.time() - start_time
+        summary = {
+            'files': len(pending),
+            'rows_read': rows_read,
+            'rows_inserted': rows_inserted,
+            'elapsed': elapsed
+        }
+        self.logger.info(
+            f"가져오기 완료: {len(pending)}개 파일, 읽은 행 {rows_read}건, "
+            f"신규 {rows_inserted}건 ({elapsed:.1f}초)"
+        )
+        return summary
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='가격 이력 CSV 일괄 가져오기')
+    parser.add_argument('--data-dir', type=str, default='data', help='이력 파일 디렉토리')
+    parser.add_argument('--db', type=str, help='SQLite 데이터베이스 경로')
+    parser.add_argument('--workers', type=int, help='파싱/저장 프로세스 수')
+    parser.add_argument('--batch-size', type=int, help='트랜잭션당 저장 행 수')
+    parser.add_argument('--product-url', type=str,
+                        help='product_url 열이 없는 예전 파일의 상품 URL (없으면 빈 값으로 저장)')
+
+    args = parser.parse_args()
+
+    store = HistoryStore(args.db) if args.db else None
+    importer = HistoryImporter(store=store, workers=args.workers, batch_size=args.batch_size)
+    summary = importer.run(args.data_dir, args.product_url)
+
+    print("\n=== 가져오기 결과 ===")
+    print(f"파일 수: {summary['files']}개")
+    print(f"읽은 행: {summary['rows_read']}건")
+    print(f"신규 저장: {summary['rows_inserted']}건")
+    print(f"소요 시간: {summary['elapsed']:.1f}초")
+    print(f"저장소 전체: {importer.store.count()}건")
+
+
+if __name__ == "__main__":
+    main()
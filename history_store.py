@@ -0,0 +1,219 @@
+"""
+가격 이력 저장소 모듈 (SQLite)
+
+시각은 모두 TIMESTAMP_FORMAT(마이크로초 포함) 문자열로 저장하므로 모니터가 저장한 행과
+CSV에서 가져온 같은 시각의 행이 (product_url, size, timestamp) UNIQUE 제약으로 중복 제거됩니다.
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+
+PRICE_COLUMNS = ('product_url', 'size', 'timestamp', 'buy_now_price', 'highest_bid', 'lowest_ask')
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS price_history (
+    product_url TEXT NOT NULL DEFAULT '',
+    size TEXT NOT NULL DEFAULT '',
+    timestamp TEXT NOT NULL,
+    buy_now_price INTEGER NOT NULL DEFAULT 0,
+    highest_bid INTEGER NOT NULL DEFAULT 0,
+    lowest_ask INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (product_url, size, timestamp)
+);
+CREATE INDEX IF NOT EXISTS idx_price_history_size_ts ON price_history (size, timestamp);
+CREATE INDEX IF NOT EXISTS idx_price_history_ts ON price_history (timestamp);
+
+CREATE TABLE IF NOT EXISTS imported_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    file_size INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    imported_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+"""
+
+
+def normalize_timestamp(value):
+    """
+    시각을 저장 형식(TIMESTAMP_FORMAT) 문자열로 변환
+
+    Args:
+        value: datetime 또는 ISO 형식 문자열 (마이크로초 생략 가능)
+
+    Returns:
+        str: 'YYYY-MM-DD HH:MM:SS.ffffff' (해석할 수 없는 문자열은 그대로)
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return value
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+class HistoryStore:
+    """인덱스가 있는 가격 이력 저장소"""
+
+    def __init__(self, db_path='data/history.db'):
+        """
+        초기화
+
+        Args:
+            db_path (str): SQLite 데이터베이스 경로
+        """
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._migrate()
+
+    def _migrate(self):
+        """
+        예전 저장소의 마이크로초 없는 시각('YYYY-MM-DD HH:MM:SS')을 저장 형식으로 변환 (한 번만)
+
+        같은 키가 이미 저장 형식으로 있으면 예전 행은 중복이므로 삭제합니다.
+        """
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+            return
+        legacy = "timestamp GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]'"
+        with self.conn:
+            self.conn.execute(f"UPDATE OR IGNORE price_history SET timestamp = timestamp || '.000000' WHERE {legacy}")
+            self.conn.execute(f'DELETE FROM price_history WHERE {legacy}')
+            self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def insert_many(self, rows, commit=True):
+        """
+        가격 이력 일괄 저장 (중복은 무시)
+
+        Args:
+            rows: PRICE_COLUMNS 순서의 튜플 목록 (timestamp는 TIMESTAMP_FORMAT 문자열)
+            commit (bool): 즉시 커밋 여부
+
+        Returns:
+            int: 새로 저장된 행 수
+        """
+        before = self.conn.total_changes
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO price_history '
+            '(product_url, size, timestamp, buy_now_price, highest_bid, lowest_ask) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            rows
+        )
+        if commit:
+            self.conn.commit()
+        return self.conn.total_changes - before
+
+    def add(self, price_data, product_url=''):
+        """
+        가격 샘플 1건 저장
+
+        Args:
+            price_data (dict): PriceMonitor의 가격 기록
+            product_url (str): 상품 URL
+        """
+        self.insert_many([(
+            product_url,
+            price_data.get('size') or '',
+            normalize_timestamp(price_data['timestamp']),
+            int(price_data.get('buy_now_price') or 0),
+            int(price_data.get('highest_bid') or 0),
+            int(price_data.get('lowest_ask') or 0),
+        )])
+
+    def is_imported(self, path, mtime, file_size):
+        """
+        파일이 이미 가져와졌는지 확인
+
+        Args:
+            path (str): 파일 경로
+            mtime (float): 파일 수정 시간
+            file_size (int): 파일 크기
+
+        Returns:
+            bool: 동일한 파일이 이미 가져와졌으면 True
+        """
+        row = self.conn.execute(
+            'SELECT mtime, file_size FROM imported_files WHERE path = ?', (path,)
+        ).fetchone()
+        return row is not None and row[0] == mtime and row[1] == file_size
+
+    def mark_imported(self, files, commit=True):
+        """
+        가져오기 완료 파일 기록
+
+        Args:
+            files: (path, mtime, file_size, row_count) 튜플 목록
+            commit (bool): 즉시 커밋 여부
+        """
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO imported_files (path, mtime, file_size, row_count) '
+            'VALUES (?, ?, ?, ?)',
+            files
+        )
+        if commit:
+            self.conn.commit()
+
+    def _where(self, product_url=None, size=None, date_from=None, date_to=None):
+        """필터 조건 SQL과 파라미터 (날짜는 'YYYY-MM-DD', date_to 포함)"""
+        clauses, params = [], []
+        for column, value in (('product_url', product_url), ('size', size)):
+            if value:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if date_from:
+            clauses.append('timestamp >= ?')
+            params.append(str(date_from))
+        if date_to:
+            clauses.append("timestamp < date(?, '+1 day')")
+            params.append(str(date_to))
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+    def count(self, **filters):
+        """
+        저장된 가격 샘플 수
+
+        Args:
+            **filters: product_url, size, date_from, date_to
+
+        Returns:
+            int: 행 수
+        """
+        where, params = self._where(**filters)
+        return self.conn.execute(f'SELECT COUNT(*) FROM price_history {where}', params).fetchone()[0]
+
+    def iter_rows(self, chunk_size=10000, **filters):
+        """
+        가격 이력을 청크 단위로 순회 (별도 연결 사용, 메모리 사용량 일정)
+
+        Args:
+            chunk_size (int): 한 번에 읽을 행 수
+            **filters: product_url, size, date_from, date_to
+
+        Yields:
+            list: PRICE_COLUMNS 순서의 튜플 목록
+        """
+        where, params = self._where(**filters)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(
+                f"SELECT {', '.join(PRICE_COLUMNS)} FROM price_history {where} ORDER BY timestamp", params
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            conn.close()
+
+    def close(self):
+        """데이터베이스 연결 종료"""
+        self.conn.close()
@@ -0,0 +1,259 @@
+"""
+입찰 대기(hot standby) 모듈
+
+목표마다 로그인된 전용 브라우저를 입찰 폼에 미리 띄워 두고(사이즈 선택 포함),
+백그라운드에서 주기적으로 새로고침합니다. 목표 가격에 도달하면
+가격 입력과 제출만 수행하므로 페이지 이동/대기 시간이 없어집니다.
+새로고침은 예비 브라우저에서 폼을 준비한 뒤 잠금 안에서 교체만 하므로
+새로고침 중에도 제출이 기다리지 않습니다. 목표마다 작은 스레드 풀에서 따로 새로고침하므로
+한 목표의 로그인 대기가 다른 목표의 새로고침을 막지 않습니다.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from clock import SYSTEM_CLOCK
+from kream_crawler import KreamCrawler
+from utils import setup_logger, load_config
+
+
+class HotSlot:
+    """입찰 폼에 대기 중인 브라우저"""
+
+    def __init__(self, product_url, size, crawler, now):
+        """
+        초기화
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+            crawler (KreamCrawler): 전용 크롤러
+            now (float): 준비 완료 시각 (clock.monotonic())
+        """
+        self.product_url = product_url
+        self.size = size
+        self.crawler = crawler
+        self.spare = None          # 새로고침용 예비 브라우저 (잠금 안에서 꺼낸 쪽이 사용/종료)
+        self.lock = threading.Lock()
+        self.last_refresh = now
+        self.ready = True
+        self.closed = False
+        self.refreshing = False    # 새로고침 작업이 예약/진행 중 (예약할 때 설정, 작업이 끝나면 해제)
+
+
+class HotStandbyPool:
+    """입찰 대기 브라우저 풀"""
+
+    def __init__(self, config=None, crawler_factory=None, headless=False, driver_factory=None, clock=None):
+        """
+        초기화
+
+        Args:
+            config (dict): 설정 (None이면 config.yaml 로드)
+            crawler_factory: 크롤러 생성 함수 (None이면 아래 설정을 쓰는 KreamCrawler)
+            headless (bool): 헤드리스 모드 사용 여부
+            driver_factory: 웹드라이버 생성 함수 (None이면 Chrome, 테스트에서는 fake_driver)
+            clock: 시계 (새로고침 주기 기준, None이면 실제 시계)
+        """
+        self.logger = setup_logger('HotStandby', 'logs/auto_bidder.log')
+        self.config = config if config is not None else load_config()
+        self.headless = headless
+        self.driver_factory = driver_factory
+        self.clock = clock or SYSTEM_CLOCK
+        self.crawler_factory = crawler_factory or self._create_crawler
+        bidding_config = self.config.get('bidding', {})
+        self.refresh_interval = bidding_config.get('hot_refresh_interval', 300)
+        self.refresh_workers = bidding_config.get('hot_refresh_workers', 4)
+
+        self.slots = {}
+        self._stop = threading.Event()
+        self._refresher = None
+        self._executor = None
+
+    def _create_crawler(self):
+        """기본 크롤러 생성 (풀과 같은 드라이버 생성 함수/시계 사용)"""
+        return KreamCrawler(headless=self.headless, driver_factory=self.driver_factory, clock=self.clock)
+
+    def arm(self, product_url, size):
+        """
+        목표용 전용 브라우저를 로그인 후 입찰 폼에 대기시킴
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+
+        Returns:
+            bool: 대기 성공 여부
+        """
+        key = (product_url, size)
+        if key in self.slots:
+            return True
+
+        crawler = self._prepare(product_url, size)
+        if crawler is None:
+            return False
+
+        self.slots[key] = HotSlot(product_url, size, crawler, self.clock.monotonic())
+        self.logger.info(f"입찰 대기 시작: {product_url} (사이즈: {size})")
+        self._start_refresher()
+        return True
+
+    def _prepare(self, product_url, size, crawler=None):
+        """
+        브라우저를 입찰 폼에 준비 (crawler가 없으면 새로 만들어 로그인)
+
+        Returns:
+            KreamCrawler: 준비된 크롤러 (실패하면 닫고 None)
+        """
+        crawler = crawler or self.crawler_factory()
+        try:
+            if crawler.driver is None:
+                crawler.setup_driver()
+            if not crawler.is_logged_in and not crawler.login():
+                crawler.close()
+                return None
+            if not crawler.open_bid_form(product_url, size):
+                crawler.close()
+                return None
+        except Exception as e:
+            self.logger.error(f"입찰 대기 준비 실패: {e}")
+            crawler.close()
+            return None
+        return crawler
+
+    def disarm(self, product_url, size):
+        """
+        목표의 대기 브라우저 종료
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+        """
+        slot = self.slots.pop((product_url, size), None)
+        if slot:
+            with slot.lock:
+                slot.closed = True
+                slot.crawler.close()
+                # 새로고침 중인 예비 브라우저는 새로고침 스레드가 교체 단계에서 닫음
+                spare, slot.spare = slot.spare, None
+            if spare is not None:
+                spare.close()
+
+    def is_armed(self, product_url, size):
+        """
+        대기 중인 브라우저가 있는지 확인
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+
+        Returns:
+            bool: 즉시 제출 가능 여부
+        """
+        slot = self.slots.get((product_url, size))
+        return slot is not None and slot.ready
+
+    def submit(self, product_url, size, price):
+        """
+        대기 중인 입찰 폼에 가격 입력 후 제출
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+            price (int): 입찰 가격
+
+        Returns:
+            bool: 제출 성공 여부
+        """
+        slot = self.slots.get((product_url, size))
+        if slot is None:
+            return False
+
+        with slot.lock:
+            success = slot.crawler.submit_bid_form(price)
+            # 제출 후 폼은 백그라운드 스레드가 다시 준비
+            slot.ready = False
+        return success
+
+    def capture(self, product_url, size, event):
+        """
+        대기 브라우저의 현재 화면 스크린샷 (제출 직후 결과 화면 기록용, 제출 후에 호출)
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+            event (str): 이벤트 이름
+
+        Returns:
+            bool: 저장 대기열에 넣었는지 여부
+        """
+        slot = self.slots.get((product_url, size))
+        if slot is None:
+            return False
+        with slot.lock:
+            return slot.crawler.capture(event, product_url)
+
+    def _refresh_slot(self, slot):
+        """예비 브라우저에 입찰 폼을 새로 준비한 뒤 대기 브라우저와 교체 (잠금은 교체할 때만)"""
+        with slot.lock:
+            if slot.closed:
+                return
+            spare, slot.spare = slot.spare, None
+        fresh = self._prepare(slot.product_url, slot.size, spare)
+        if fresh is None:
+            # 기존 폼은 그대로 두고 다음 주기에 다시 시도 (제출 후라면 ready=False 유지)
+            self.logger.error(f"입찰 폼 새로고침 실패: {slot.product_url} (사이즈: {slot.size})")
+            slot.last_refresh = self.clock.monotonic()
+            return
+
+        with slot.lock:
+            if slot.closed:
+                fresh.close()
+                return
+            slot.crawler, slot.spare = fresh, slot.crawler
+            slot.ready = True
+            slot.last_refresh = self.clock.monotonic()
+
+    def _refresh_task(self, slot):
+        """스레드 풀 작업: 목표 하나 새로고침 (끝나면 다음 주기에 다시 예약 가능)"""
+        try:
+            self._refresh_slot(slot)
+        except Exception as e:
+            self.logger.error(f"입찰 폼 새로고침 오류: {e}")
+        finally:
+            slot.refreshing = False
+
+    def _start_refresher(self):
+        """백그라운드 새로고침 스레드 시작"""
+        if self._refresher and self._refresher.is_alive():
+            return
+
+        self._stop.clear()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, self.refresh_workers), thread_name_prefix='HotStandbyRefresh'
+            )
+        self._refresher = threading.Thread(target=self._refresh_loop, name='HotStandbyRefresher', daemon=True)
+        self._refresher.start()
+
+    def _refresh_loop(self):
+        """오래된 대기 브라우저를 목표별 작업으로 예약 (이 스레드는 새로고침을 기다리지 않음)"""
+        while not self._stop.wait(1):
+            now = self.clock.monotonic()
+            for slot in list(self.slots.values()):
+                if slot.refreshing or slot.closed:
+                    continue
+                elapsed = now - slot.last_refresh
+                if elapsed >= self.refresh_interval or (not slot.ready and elapsed >= 1):
+                    slot.refreshing = True
+                    self._executor.submit(self._refresh_task, slot)
+
+    def close(self):
+        """모든 대기 브라우저 종료"""
+        self._stop.set()
+        if self._refresher:
+            self._refresher.join(timeout=5)
+        for key in list(self.slots):
+            self.disarm(*key)
+        if self._executor:
+            # 진행 중인 새로고침은 교체 단계에서 closed를 보고 새 브라우저를 닫음
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -1,26 +1,36 @@
 """
 KREAM 크롤러 모듈
+
+selenium은 브라우저를 실제로 시작할 때(setup_driver) 불러오며,
+크롬드라이버 경로는 driver_cache가 Chrome 버전별로 캐시합니다.
+driver_factory를 넘기면 Chrome 대신 그 드라이버를 사용합니다 (fake_driver.FakeDriver 등).
 """
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 import time
+from clock import SYSTEM_CLOCK
+from metrics import FETCH_SECONDS, FETCH_ERRORS, DRIVER_STARTS, DRIVER_QUITS
+from screenshots import get_screenshots
 from utils import setup_logger, load_config, get_env, parse_price
 
 
+# 가격 요소 CSS 선택자 (⚠️ KREAM의 실제 HTML 구조에 맞게 수정 필요)
+PRICE_SELECTORS = {
+    'buy_now_price': '.buy-now-price',
+    'highest_bid': '.highest-bid-price',
+    'lowest_ask': '.lowest-ask-price',
+}
+
+
 class KreamCrawler:
     """KREAM 웹사이트 크롤러"""
     
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, driver_factory=None, clock=None):
         """
         초기화
         
         Args:
             headless (bool): 헤드리스 모드 사용 여부
+            driver_factory: 웹드라이버 생성 함수 (None이면 Chrome)
+            clock: 시계 (None이면 실제 시계, 시뮬레이션에서는 clock.VirtualClock)
         """
         self.logger = setup_logger('KreamCrawler', 'logs/crawler.log')
         self.config = load_config()
@@ -28,9 +38,27 @@ class KreamCrawler:
         self.wait = None
         self.headless = headless
         self.is_logged_in = False
+        self.driver_factory = driver_factory
+        self.clock = clock or SYSTEM_CLOCK
+        browser_config = self.config.get('browser', {})
+        self.page_settle = browser_config.get('page_settle', 2)
+        self.login_wait = browser_config.get('login_wait', 30)
         
     def setup_driver(self):
         """웹드라이버 설정"""
+        if self.driver_factory is not None:
+            # 페이지/로그인 대기는 그대로 clock으로 기다림 (가상 시계면 실제로 기다리지 않음)
+            self.driver = self.driver_factory()
+            DRIVER_STARTS.inc()
+            self.logger.info(f"웹드라이버 설정 완료 ({type(self.driver).__name__})")
+            return
+        
+        from selenium import webdriver
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from driver_cache import resolve_driver
+        
         try:
             chrome_options = Options()
             
@@ -47,8 +75,9 @@ class KreamCrawler:
             chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
-            service = Service(ChromeDriverManager().install())
+            service = Service(resolve_driver(self.config))
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            DRIVER_STARTS.inc()
             
             # 자동화 감지 우회 스크립트
             self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
@@ -73,6 +102,34 @@ class KreamCrawler:
             self.logger.error(f"웹드라이버 설정 실패: {e}")
             raise
     
+    def _open(self, url):
+        """
+        페이지 이동 후 렌더링 대기 (driver.get은 로드 완료까지 기다림)
+        
+        Args:
+            url (str): 이동할 URL
+        """
+        self.driver.get(url)
+        if self.page_settle:
+            self.clock.sleep(self.page_settle)
+    
+    def _read_texts(self, selectors):
+        """
+        선택자별 요소 텍스트 (없는 요소는 None)
+        
+        Args:
+            selectors (dict): {이름: CSS 선택자}
+            
+        Returns:
+            dict: {이름: 텍스트}
+        """
+        texts = {}
+        for name, selector in selectors.items():
+            # 'css selector' == selenium By.CSS_SELECTOR (selenium은 setup_driver에서만 불러옴)
+            elements = self.driver.find_elements('css selector', selector)
+            texts[name] = elements[0].text if elements else None
+        return texts
+    
     def login(self, email=None, password=None):
         """
         KREAM 로그인
@@ -93,15 +150,15 @@ class KreamCrawler:
                 return False
             
             self.logger.info("로그인 시작")
-            self.driver.get('https://kream.co.kr/login')
-            time.sleep(2)
+            self._open('https://kream.co.kr/login')
             
             # 여기에 실제 로그인 로직 구현
             # 주의: KREAM의 실제 HTML 구조에 맞게 수정 필요
             
-            self.logger.info("⚠️  수동 로그인이 필요할 수 있습니다")
-            self.logger.info("브라우저에서 수동으로 로그인해주세요 (30초 대기)")
-            time.sleep(30)
+            if self.login_wait:
+                self.logger.info("⚠️  수동 로그인이 필요할 수 있습니다")
+                self.logger.info(f"브라우저에서 수동으로 로그인해주세요 ({self.login_wait}초 대기)")
+                self.clock.sleep(self.login_wait)
             
             self.is_logged_in = True
             self.logger.info("로그인 완료")
@@ -123,8 +180,7 @@ class KreamCrawler:
         """
         try:
             self.logger.info(f"상품 정보 조회: {product_url}")
-            self.driver.get(product_url)
-            time.sleep(3)
+            self._open(product_url)
             
             # 여기에 실제 상품 정보 크롤링 로직 구현
             # 실제 KREAM의 HTML 구조에 맞게 셀렉터 수정 필요
@@ -135,7 +191,7 @@ class KreamCrawler:
                 'brand': '브랜드',
                 'model_number': '모델번호',
                 'current_price': 0,
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': self.clock.now().strftime('%Y-%m-%d %H:%M:%S')
             }
             
             self.logger.info(f"상품 정보 조회 완료: {product_info['name']}")
@@ -155,25 +211,98 @@ class KreamCrawler:
         Returns:
             dict: 입찰 가격 정보
         """
+        started = time.perf_counter()
         try:
             self.logger.info(f"입찰 가격 조회 (사이즈: {size})")
             
-            # 실제 입찰 가격 크롤링 로직 구현 필요
+            # ⚠️ 사이즈 선택 로직 구현 필요, 가격 요소는 PRICE_SELECTORS를 실제 구조에 맞게 수정
+            texts = self._read_texts(PRICE_SELECTORS)
+            prices = {name: parse_price(texts.get(name) or '') for name in PRICE_SELECTORS}
+            # 요소를 찾지 못한 경우만 실패 (0원 등 정상적으로 읽은 0은 제외)
+            missing = [name for name in PRICE_SELECTORS if texts.get(name) is None]
+            if missing:
+                self.logger.warning(f"가격을 읽지 못했습니다: {', '.join(missing)}")
+                self.capture('parse_failure')
             bid_info = {
-                'buy_now_price': 0,      # 즉시 구매가
-                'highest_bid': 0,         # 최고 입찰가
-                'lowest_ask': 0,          # 최저 판매가
+                'buy_now_price': prices['buy_now_price'],  # 즉시 구매가
+                'highest_bid': prices['highest_bid'],      # 최고 입찰가
+                'lowest_ask': prices['lowest_ask'],        # 최저 판매가
                 'size': size,
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': self.clock.now().strftime('%Y-%m-%d %H:%M:%S')
             }
             
             self.logger.info(f"입찰 가격 조회 완료: {bid_info}")
+            FETCH_SECONDS.observe(time.perf_counter() - started)
             return bid_info
             
         except Exception as e:
+            FETCH_ERRORS.inc()
             self.logger.error(f"입찰 가격 조회 실패: {e}")
             return None
     
+    def open_bid_form(self, product_url, size):
+        """
+        입찰 폼 열기 (사이즈 선택까지)
+        
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+            
+        Returns:
+            bool: 준비 성공 여부
+        """
+        try:
+            # 상품 페이지로 이동
+            self._open(product_url)
+            
+            # ⚠️ 여기에 실제 입찰 폼 이동 로직 구현 필요
+            # 1. 사이즈 선택
+            # 2. 판매 버튼 클릭
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"입찰 폼 열기 실패: {e}")
+            return False
+    
+    def submit_bid_form(self, price):
+        """
+        열려 있는 입찰 폼에 가격 입력 후 제출
+        
+        Args:
+            price (int): 입찰 가격
+            
+        Returns:
+            bool: 제출 성공 여부
+        """
+        try:
+            # ⚠️ 여기에 실제 입찰 로직 구현 필요
+            # KREAM의 실제 입찰 프로세스에 맞게 구현
+            # 3. 가격 입력
+            # 4. 입찰 확인
+            
+            self.logger.warning("⚠️  실제 입찰 로직은 구현되지 않았습니다")
+            self.logger.warning("실제 사용을 위해서는 KREAM의 HTML 구조에 맞게 구현이 필요합니다")
+            
+            return False  # 테스트 모드에서는 False 반환
+            
+        except Exception as e:
+            self.logger.error(f"입찰 제출 실패: {e}")
+            return False
+    
+    def capture(self, event, page=None):
+        """
+        이벤트 스크린샷 (화면만 받고 바로 반환, 저장은 백그라운드에서 처리)
+        
+        Args:
+            event (str): 이벤트 이름 (target_hit, bid_submitted, parse_failure)
+            page (str): 페이지 식별 정보 (None이면 현재 URL)
+            
+        Returns:
+            bool: 저장 대기열에 넣었는지 여부
+        """
+        return get_screenshots().capture(self.driver, event, page, self.clock.now())
+    
     def take_screenshot(self, filename):
         """
         스크린샷 저장
@@ -188,9 +317,12 @@ class KreamCrawler:
             self.logger.error(f"스크린샷 저장 실패: {e}")
     
     def close(self):
-        """브라우저 종료"""
+        """브라우저 종료 (다시 setup_driver()로 시작할 수 있음)"""
         if self.driver:
             self.driver.quit()
+            self.driver = None
+            self.is_logged_in = False
+            DRIVER_QUITS.inc()
             self.logger.info("브라우저 종료")
 
 
@@ -0,0 +1,269 @@
+"""
+로깅 파이프라인 모듈
+
+모든 로거는 메모리 큐에 기록만 하고, 콘솔/파일 출력은 백그라운드 스레드(QueueListener)가
+담당합니다. 같은 이름으로 여러 번 설정해도 핸들러는 한 번만 붙고, 로그 파일은 크기 또는
+시간 기준으로 교체되며 이전 파일은 gzip으로 압축됩니다. 형식은 텍스트 또는 JSON lines이며
+extra={'product_url': ..., 'size': ..., 'price': ..., 'latency_ms': ...}로 넘긴 필드가 함께 기록됩니다.
+
+오버헤드 측정:
+    python log_pipeline.py bench
+"""
+import os
+import gzip
+import json
+import time
+import queue
+import atexit
+import shutil
+import argparse
+import logging
+import threading
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from config_service import get_config_service
+
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# LogRecord 기본 속성 (나머지는 extra로 넘긴 이벤트 필드)
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'log_file'}
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON lines 형식 (extra 필드 포함)"""
+
+    def format(self, record):
+        event = {
+            'ts': self.formatTime(record, DATE_FORMAT),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS:
+                event[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            event['exc'] = record.exc_text
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+def _gzip_namer(name):
+    """교체된 로그 파일 이름 (.gz)"""
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source, dest):
+    """교체된 로그 파일을 압축하고 원본 삭제"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class _CountingQueueHandler(QueueHandler):
+    """로거별 기록 수를 세고, 큐가 가득 차면 기다리지 않고 버림"""
+
+    def __init__(self, pipeline, log_file):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+        self.log_file = log_file
+
+    def prepare(self, record):
+        # 메시지 포맷은 백그라운드 스레드에서 (호출 스레드는 큐 삽입만)
+        record.log_file = self.log_file
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            self.pipeline.emitted[record.name] += 1
+        except queue.Full:
+            self.pipeline.dropped += 1
+
+
+class _RoutingHandler(logging.Handler):
+    """백그라운드 스레드에서 콘솔과 로그 파일별 핸들러로 분배"""
+
+    def __init__(self, pipeline):
+        super().__init__()
+        self.pipeline = pipeline
+
+    def handle(self, record):
+        if self.pipeline.console:
+            self.pipeline.console.handle(record)
+        if record.log_file:
+            self.pipeline.file_handler(record.log_file).handle(record)
+        return True
+
+
+class LogPipeline:
+    """프로세스 공용 로깅 파이프라인"""
+
+    def __init__(self, config=None):
+        """
+        초기화
+
+        Args:
+            config (dict): logging 설정 섹션 (None이면 config.yaml 기준)
+        """
+        if config is None:
+            config = get_config_service().get().get('logging', {})
+        self.json = config.get('format', 'text') == 'json'
+        self.max_bytes = config.get('max_bytes', 10 * 1024 * 1024)
+        self.backup_count = config.get('backup_count', 5)
+        self.when = config.get('when')
+        self.compress = config.get('compress', True)
+
+        self.formatter = JsonFormatter() if self.json else logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+        self.console = None
+        if config.get('console', True):
+            self.console = logging.StreamHandler()
+            self.console.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT))
+
+        self.queue = queue.Queue(maxsize=config.get('queue_size', 10000))
+        self.emitted = Counter()
+        self.dropped = 0
+        self._files = {}
+        self._queue_handlers = {}
+        self._lock = threading.Lock()
+        self.listener = QueueListener(self.queue, _RoutingHandler(self))
+        self.listener.start()
+
+    def file_handler(self, log_file):
+        """
+        로그 파일 핸들러 (파일당 하나, 백그라운드 스레드에서만 사용)
+
+        Args:
+            log_file (str): 로그 파일 경로
+
+        Returns:
+            logging.Handler: 교체 기능이 있는 파일 핸들러
+        """
+        handler = self._files.get(log_file)
+        if handler is None:
+            if os.path.dirname(log_file):
+                os.makedirs(os.path.dirname(log_file), exist_ok=True)
+            if self.when:
+                handler = TimedRotatingFileHandler(
+                    log_file, when=self.when, backupCount=self.backup_count, encoding='utf-8'
+                )
+            else:
+                handler = RotatingFileHandler(
+                    log_file, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding='utf-8'
+                )
+            if self.compress:
+                handler.namer = _gzip_namer
+                handler.rotator = _gzip_rotator
+            handler.setFormatter(self.formatter)
+            self._files[log_file] = handler
+        return handler
+
+    def get_logger(self, name, log_file=None, level=logging.INFO):
+        """
+        로거 설정 (여러 번 호출해도 핸들러는 하나)
+
+        Args:
+            name (str): 로거 이름
+            log_file (str): 로그 파일 경로
+            level: 로그 레벨
+
+        Returns:
+            logging.Logger: 설정된 로거
+        """
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        with self._lock:
+            handler = self._queue_handlers.get(name)
+            if handler is None or handler.log_file != log_file:
+                if handler is not None:
+                    logger.removeHandler(handler)
+                handler = _CountingQueueHandler(self, log_file)
+                self._queue_handlers[name] = handler
+                logger.addHandler(handler)
+                logger.propagate = False
+        return logger
+
+    def stats(self):
+        """
+        로그 양 통계
+
+        Returns:
+            dict: {'emitted': {로거: 건수}, 'dropped': 버린 건수, 'pending': 큐 대기 건수}
+        """
+        return {'emitted': dict(self.emitted), 'dropped': self.dropped, 'pending': self.queue.qsize()}
+
+    def close(self):
+        """큐에 남은 기록을 모두 쓰고 종료"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+        for handler in self._files.values():
+            handler.close()
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline():
+    """
+    프로세스 공용 파이프라인 (처음 호출 시 시작, 종료 시 자동 정리)
+
+    Returns:
+        LogPipeline: 파이프라인
+    """
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = LogPipeline()
+                atexit.register(_pipeline.close)
+    return _pipeline
+
+
+def bench(count=100000):
+    """
+    로그 호출 오버헤드 측정 (호출 스레드 기준)
+
+    Args:
+        count (int): 기록 건수
+    """
+    pipeline = LogPipeline({'console': False, 'queue_size': count + 1})
+    log_file = os.path.join('logs', 'log_bench.log')
+    logger = pipeline.get_logger('LogBench', log_file)
+    event = {'product_url': 'https://kream.co.kr/products/0', 'size': '270', 'price': 150000, 'latency_ms': 12}
+
+    started = time.perf_counter()
+    for i in range(count):
+        logger.info("가격 업데이트", extra=event)
+    elapsed = time.perf_counter() - started
+
+    logger.setLevel(logging.WARNING)
+    started = time.perf_counter()
+    for i in range(count):
+        logger.info("가격 업데이트", extra=event)
+    filtered = time.perf_counter() - started
+
+    pipeline.close()
+    print(f"기록 {count}건: 호출당 {elapsed / count * 1e6:.1f}µs (레벨로 걸러진 호출 {filtered / count * 1e6:.2f}µs)")
+    print(f"통계: {pipeline.stats()}")
+    os.remove(log_file)
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='로깅 파이프라인')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench_parser = subparsers.add_parser('bench', help='로그 호출 오버헤드 측정')
+    bench_parser.add_argument('--count', type=int, default=100000, help='기록 건수')
+
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        bench(args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,10 @@ KREAM 자동 판매 입찰 프로그램 메인
 """
 import sys
 from utils import create_directories, setup_logger, load_config, get_env
-from auto_bidder import KreamAutoBidder
+from profiler import install_signal_handlers
+from metrics import start_server
+
+# auto_bidder/portfolio는 입력을 받은 뒤 불러옴 (시작 시간 단축)
 
 
 def print_banner():
@@ -26,6 +29,23 @@ def get_user_input():
     """사용자 입력 받기"""
     print("\n=== 입찰 설정 ===\n")
     
+    targets_file = input("목표 목록 파일 (YAML/CSV, 단일 목표는 Enter): ").strip()
+    if targets_file:
+        from portfolio import load_targets
+        
+        try:
+            targets = load_targets(targets_file)
+        except Exception as e:
+            print(f"❌ 목표 목록을 읽을 수 없습니다: {e}")
+            sys.exit(1)
+        
+        max_spend = input("전체 지출 한도 (원, 없으면 Enter): ").strip()
+        return {
+            'targets_file': targets_file,
+            'targets': targets,
+            'max_spend': int(max_spend) if max_spend.isdigit() else None
+        }
+    
     product_url = input("상품 URL: ").strip()
     if not product_url:
         print("❌ 상품 URL을 입력해주세요")
@@ -58,6 +78,15 @@ def get_user_input():
 def confirm_settings(settings):
     """설정 확인"""
     print("\n=== 입찰 설정 확인 ===")
+    if 'targets' in settings:
+        print(f"목표 목록: {settings['targets_file']} ({len(settings['targets'])}개)")
+        for target in settings['targets']:
+            print(f"  - {target['product_url']} / {target['size']} / {target['target_price']:,}원")
+        if settings['max_spend']:
+            print(f"전체 지출 한도: {settings['max_spend']:,}원")
+        confirm = input("\n이 설정으로 진행하시겠습니까? (y/n): ").strip().lower()
+        return confirm == 'y'
+    
     print(f"상품 URL: {settings['product_url']}")
     print(f"사이즈: {settings['size']}")
     print(f"목표 가격: {settings['target_price']:,}원")
@@ -67,6 +96,17 @@ def confirm_settings(settings):
     return confirm == 'y'
 
 
+def check_unknown_bids():
+    """이전 실행에서 결과가 기록되지 않은 입찰 안내"""
+    from bid_ledger import BidLedger, print_unknown_bids
+    ledger = BidLedger()
+    try:
+        ledger.recover()
+        print_unknown_bids(ledger)
+    finally:
+        ledger.close()
+
+
 def main():
     """메인 함수"""
     # 배너 출력
@@ -78,6 +118,8 @@ def main():
     # 로거 설정
     logger = setup_logger('Main', 'logs/main.log')
     logger.info("프로그램 시작")
+    install_signal_handlers()
+    start_server()
     
     # 환경 변수 확인
     email = get_env('KREAM_EMAIL')
@@ -87,6 +129,8 @@ def main():
         print("\n⚠️  경고: .env 파일에 계정 정보가 설정되지 않았습니다")
         print("자동 로그인이 불가능할 수 있습니다\n")
     
+    check_unknown_bids()
+    
     try:
         # 사용자 입력
         settings = get_user_input()
@@ -102,6 +146,12 @@ def main():
         print("중단하려면 Ctrl+C를 누르세요")
         print("="*50 + "\n")
         
+        if 'targets' in settings:
+            from portfolio import PortfolioBidder
+            PortfolioBidder(settings['targets'], max_total_spend=settings['max_spend']).run()
+            return
+        
+        from auto_bidder import KreamAutoBidder
         bidder = KreamAutoBidder()
         bidder.monitor_and_bid(
             product_url=settings['product_url'],
@@ -0,0 +1,520 @@
+"""
+메트릭 모듈
+
+모니터링/입찰 프로세스의 카운터, 게이지, 히스토그램을 텍스트 노출 형식
+(Prometheus text format 0.0.4)으로 로컬 포트에 제공합니다.
+
+값 갱신은 스레드별 셀에만 쓰므로 가격 확인 경로에서 잠금을 잡지 않고,
+여러 스레드의 셀은 수집(scrape) 시점에 합산합니다.
+큐 길이, 브라우저 메모리처럼 그때그때 읽으면 되는 값은 함수 게이지로 수집 시점에 계산합니다.
+
+수집:
+    curl http://127.0.0.1:9108/metrics
+    (데몬은 API 포트의 /metrics)
+"""
+import os
+import time
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from clock import SYSTEM_CLOCK
+from log_pipeline import get_pipeline
+from utils import setup_logger, load_config
+
+
+# 기본 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_value(value):
+    """노출 형식 숫자"""
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value):
+    """라벨 값 이스케이프 (역슬래시, 따옴표, 줄바꿈)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    """노출 형식 라벨 ({key="value",...})"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+class _Cells(threading.local):
+    """스레드별 값 셀 (스레드마다 처음 쓸 때 같은 인자로 __init__이 다시 호출되어 셀 등록)"""
+
+    def __init__(self, owner):
+        self.cell = owner._new_cell()
+
+
+class _Metric:
+    """메트릭 공통 (라벨별 자식 관리)"""
+
+    kind = None
+    suffix = ''
+
+    def __init__(self, name, documentation, labelnames=(), labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.label_values = tuple(labels)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        """
+        라벨 값별 자식 메트릭 (한 번 만든 자식은 재사용)
+
+        Args:
+            **labels: 라벨 이름=값
+
+        Returns:
+            라벨이 붙은 메트릭
+        """
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._child(tuple(zip(self.labelnames, key)))
+                    self._children[key] = child
+        return child
+
+    def _child(self, labels):
+        return type(self)(self.name, self.documentation, labels=labels)
+
+    def _series(self):
+        """(라벨, 자식) 목록"""
+        if self.labelnames:
+            return [(child.label_values, child) for child in list(self._children.values())]
+        return [(self.label_values, self)]
+
+    def collect(self):
+        """
+        노출 형식 줄 목록
+
+        Returns:
+            list: 텍스트 줄
+        """
+        name = f"{self.name}{self.suffix}"
+        lines = [f"# HELP {name} {self.documentation}", f"# TYPE {name} {self.kind}"]
+        for labels, child in self._series():
+            lines.extend(child._samples(labels))
+        return lines
+
+
+class _ShardedMetric(_Metric):
+    """스레드별 셀에 기록하고 수집 시점에 합산하는 메트릭"""
+
+    width = 1
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cells = []
+        self._retired = [0] * self.width
+        self._local = _Cells(self)
+
+    def _new_cell(self):
+        cell = [0] * self.width
+        with self._lock:
+            self._cells.append((threading.current_thread(), cell))
+        return cell
+
+    def _totals(self):
+        """모든 스레드 합계 (종료된 스레드의 셀은 합쳐서 정리)"""
+        with self._lock:
+            alive = []
+            for thread, cell in self._cells:
+                if thread.is_alive():
+                    alive.append((thread, cell))
+                else:
+                    for i, value in enumerate(cell):
+                        self._retired[i] += value
+            self._cells = alive
+            totals = list(self._retired)
+        for _, cell in alive:
+            for i, value in enumerate(cell):
+                totals[i] += value
+        return totals
+
+
+class Counter(_ShardedMetric):
+    """단조 증가 카운터"""
+
+    kind = 'counter'
+    suffix = '_total'
+
+    def inc(self, amount=1):
+        """
+        증가 (잠금 없음)
+
+        Args:
+            amount (float): 증가량
+        """
+        self._local.cell[0] += amount
+
+    @property
+    def value(self):
+        """현재 값 (모든 스레드 합)"""
+        return self._totals()[0]
+
+    def _samples(self, labels):
+        return [f"{self.name}_total{_format_labels(labels)} {_format_value(self.value)}"]
+
+
+class Gauge(_Metric):
+    """임의 값 게이지 (직접 설정 또는 수집 시점 함수)"""
+
+    kind = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._value = 0
+        self._function = None
+
+    def set(self, value):
+        """
+        값 설정
+
+        Args:
+            value (float): 값
+        """
+        self._value = value
+
+    def set_function(self, function):
+        """
+        수집 시점에 값을 계산할 함수 등록
+
+        Args:
+            function: 인자 없이 숫자를 반환하는 함수 (None을 반환하면 생략)
+        """
+        self._function = function
+
+    @property
+    def value(self):
+        """현재 값"""
+        if self._function is None:
+            return self._value
+        return self._function()
+
+    def _samples(self, labels):
+        try:
+            value = self.value
+        except Exception:
+            value = None
+        if value is None:
+            return []
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}"]
+
+
+class Histogram(_ShardedMetric):
+    """누적 구간 히스토그램"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), labels=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # 셀: [구간별 개수..., +Inf 개수, 합계]
+        self.width = len(self.buckets) + 2
+        super().__init__(name, documentation, labelnames, labels)
+
+    def _child(self, labels):
+        return Histogram(self.name, self.documentation, labels=labels, buckets=self.buckets)
+
+    def observe(self, value):
+        """
+        값 기록 (잠금 없음)
+
+        Args:
+            value (float): 관측값 (초 등)
+        """
+        cell = self._local.cell
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def time(self):
+        """
+        소요 시간을 기록하는 컨텍스트 매니저
+
+        Returns:
+            컨텍스트 매니저
+        """
+        return _Timer(self)
+
+    def snapshot(self):
+        """
+        모든 스레드 합계
+
+        Returns:
+            tuple: (구간별 개수 목록(+Inf 포함), 전체 개수, 합계)
+        """
+        totals = self._totals()
+        counts = totals[:-1]
+        return counts, sum(counts), totals[-1]
+
+    def _samples(self, labels):
+        counts, count, total = self.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            bucket_labels = labels + (('le', _format_value(float(bound))),)
+            lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(float(total))}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class _Timer:
+    """Histogram.time() 컨텍스트"""
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class Registry:
+    """메트릭 목록"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, documentation, labelnames, **kwargs):
+        """같은 이름이면 기존 메트릭 반환"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """카운터 등록 (이름에 _total은 붙이지 않음)"""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        """게이지 등록"""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """히스토그램 등록"""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        """
+        텍스트 노출 형식
+
+        Returns:
+            str: 전체 메트릭
+        """
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+# ---------------------------------------------------------------------------
+# 프로세스 공용 메트릭
+# ---------------------------------------------------------------------------
+
+FETCH_SECONDS = REGISTRY.histogram('kream_fetch_seconds', '가격 조회 소요 시간 (초)')
+FETCH_ERRORS = REGISTRY.counter('kream_fetch_errors', '가격 조회 실패 횟수')
+POLLS = REGISTRY.counter('kream_polls', '가격 확인 주기 실행 횟수', ('component',))
+SCHEDULER_LAG = REGISTRY.histogram(
+    'kream_scheduler_lag_seconds', '예정 시각 대비 가격 확인 지연 (초)', ('component',),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0),
+)
+CACHE_LOOKUPS = REGISTRY.counter('kream_cache_lookups', '스냅샷 캐시 조회 (result=hit/miss)', ('cache', 'result'))
+BID_TRIGGER_SECONDS = REGISTRY.histogram('kream_bid_trigger_seconds', '목표 가격 감지 → 입찰 제출 지연 (초)')
+BIDS = REGISTRY.counter('kream_bids', '입찰 시도 (result=success/failed/duplicate)', ('result',))
+QUEUE_DEPTH = REGISTRY.gauge('kream_queue_depth', '내부 큐 대기 건수', ('queue',))
+DRIVER_STARTS = REGISTRY.counter('kream_driver_starts', '웹드라이버 시작 횟수 (크롤러 수보다 많으면 재시작)')
+DRIVER_QUITS = REGISTRY.counter('kream_driver_quits', '웹드라이버 종료 횟수')
+SCREENSHOTS = REGISTRY.counter(
+    'kream_screenshots', '이벤트 스크린샷 (result=saved/duplicate/cooldown/dropped/error)', ('result',)
+)
+BROWSER_RSS = REGISTRY.gauge('kream_browser_rss_bytes', '자식 브라우저/드라이버 프로세스 메모리 합계 (바이트)')
+PROCESS_RSS = REGISTRY.gauge('process_resident_memory_bytes', '현재 프로세스 메모리 (바이트)')
+UPTIME = REGISTRY.gauge('process_uptime_seconds', '프로세스 실행 시간 (초)')
+
+
+class PollTimer:
+    """가격 확인 주기 측정 (실행 횟수, 예정 시각 대비 지연)"""
+
+    __slots__ = ('polls', 'lag', 'planned', 'clock')
+
+    def __init__(self, component, clock=None):
+        """
+        초기화
+
+        Args:
+            component (str): 구성 요소 이름 (monitor, bidder, portfolio)
+            clock: 시계 (None이면 실제 시계)
+        """
+        self.polls = POLLS.labels(component=component)
+        self.lag = SCHEDULER_LAG.labels(component=component)
+        self.planned = None
+        self.clock = clock or SYSTEM_CLOCK
+
+    def tick(self):
+        """주기 시작 시 호출"""
+        self.polls.inc()
+        if self.planned is not None:
+            self.lag.observe(max(0.0, self.clock.monotonic() - self.planned))
+            self.planned = None
+
+    def plan(self, interval):
+        """
+        대기 직전 호출 (다음 주기 예정 시각 기록)
+
+        Args:
+            interval (float): 대기 시간 (초)
+        """
+        self.planned = self.clock.monotonic() + interval
+
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+_started_at = time.time()
+
+
+def _rss(pid='self'):
+    """프로세스 메모리 (/proc, 리눅스)"""
+    with open(f'/proc/{pid}/statm', 'r') as f:
+        return int(f.read().split()[1]) * _PAGE_SIZE
+
+
+def _children(pid):
+    """직계 자식 프로세스 목록 (/proc, 리눅스)"""
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                # comm에 공백/괄호가 있을 수 있으므로 마지막 ')' 이후에서 ppid를 읽음
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return children
+
+
+def _process_rss():
+    """현재 프로세스 메모리 (리눅스가 아니면 생략)"""
+    try:
+        return _rss()
+    except OSError:
+        return None
+
+
+def _browser_rss():
+    """자식 프로세스(크롬드라이버, Chrome) 전체 메모리 (리눅스가 아니면 생략)"""
+    if not os.path.isdir('/proc'):
+        return None
+    total = 0
+    pending = _children(os.getpid())
+    while pending:
+        pid = pending.pop()
+        try:
+            total += _rss(pid)
+        except OSError:
+            continue
+        pending.extend(_children(pid))
+    return total
+
+
+LOG_DROPPED = REGISTRY.gauge('kream_log_dropped', '로그 큐가 가득 차 버린 기록 수')
+
+PROCESS_RSS.set_function(_process_rss)
+BROWSER_RSS.set_function(_browser_rss)
+UPTIME.set_function(lambda: time.time() - _started_at)
+LOG_DROPPED.set_function(lambda: get_pipeline().dropped)
+QUEUE_DEPTH.labels(queue='log').set_function(lambda: get_pipeline().queue.qsize())
+
+
+def track_queue(name, function):
+    """
+    큐 길이 게이지 등록
+
+    Args:
+        name (str): 큐 이름 (log, trace, export 등)
+        function: 인자 없이 대기 건수를 반환하는 함수
+    """
+    QUEUE_DEPTH.labels(queue=name).set_function(function)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+_server = None
+
+
+def start_server(host=None, port=None):
+    """
+    메트릭 서버 시작 (백그라운드 스레드, metrics.enabled가 false면 시작하지 않음)
+
+    포트를 이미 다른 프로세스가 쓰고 있으면 경고만 남기고 계속 실행합니다.
+
+    Args:
+        host (str): 바인딩 주소 (None이면 설정 기준)
+        port (int): 포트 (None이면 설정 기준)
+
+    Returns:
+        ThreadingHTTPServer: 서버 (시작하지 않았으면 None)
+    """
+    global _server
+    metrics_config = load_config().get('metrics', {})
+    if _server is not None or not metrics_config.get('enabled', True):
+        return _server
+
+    logger = setup_logger('Metrics', 'logs/metrics.log')
+    host = host or metrics_config.get('host', '127.0.0.1')
+    port = port if port is not None else metrics_config.get('port', 9108)
+    try:
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning(f"메트릭 서버를 시작할 수 없습니다 ({host}:{port}): {e}")
+        return None
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name='MetricsServer', daemon=True).start()
+    logger.info(f"메트릭 서버 시작: http://{host}:{_server.server_address[1]}/metrics")
+    return _server
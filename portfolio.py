@@ -0,0 +1,353 @@
+"""
+포트폴리오 입찰 모듈
+
+YAML/CSV로 정의한 여러 입찰 목표를 한 프로세스에서 동시에 감시합니다.
+공유 크롤러 풀과 스냅샷 캐시로 가격을 조회하고, 목표별 상태
+(armed, triggered, filled, cancelled)와 전체 지출 한도를 관리합니다.
+"""
+import os
+import csv
+import time
+import argparse
+from collections import Counter
+import yaml
+from auto_bidder import KreamAutoBidder
+from bid_engine import ARMED, TRIGGERED, FILLED, CANCELLED, STATE_NAMES
+from checkpoint import Checkpointer, resume_delay
+from crawler_pool import CrawlerPool
+from profiler import install_signal_handlers
+from metrics import PollTimer, start_server
+from snapshot_cache import SnapshotCache
+from utils import setup_logger, watch_config, format_price
+
+
+TARGET_FIELDS = ('product_url', 'size', 'target_price', 'max_price', 'min_price', 'price_step')
+
+
+def load_targets(path):
+    """
+    입찰 목표 목록 로드
+
+    Args:
+        path (str): YAML 또는 CSV 파일 경로
+
+    Returns:
+        list: 목표 딕셔너리 목록
+    """
+    if os.path.splitext(path)[1].lower() == '.csv':
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or []
+        rows = data.get('targets', []) if isinstance(data, dict) else data
+
+    targets = []
+    for row in rows:
+        target = {}
+        for field in TARGET_FIELDS:
+            value = row.get(field)
+            if value in (None, ''):
+                continue
+            target[field] = str(value) if field in ('product_url', 'size') else int(value)
+        if 'product_url' not in target or 'size' not in target or 'target_price' not in target:
+            raise ValueError(f"product_url, size, target_price는 필수입니다: {row}")
+        targets.append(target)
+    return targets
+
+
+class PortfolioBidder:
+    """여러 목표를 동시에 감시하는 입찰기"""
+
+    def __init__(self, targets, max_total_spend=None, crawlers=None, bidder=None, crawler_factory=None):
+        """
+        초기화
+
+        Args:
+            targets (list): 목표 딕셔너리 목록
+            max_total_spend (int): 전체 지출 한도 (None이면 설정 파일 기준)
+            crawlers (int): 가격 조회용 크롤러 수
+            bidder (KreamAutoBidder): 입찰 실행기 (시계, 드라이버 생성 함수, 데이터 디렉토리도 이 입찰기를 따름)
+            crawler_factory: 가격 조회용 크롤러 생성 함수 (None이면 입찰기와 같은 드라이버/시계의 KreamCrawler)
+        """
+        self.logger = setup_logger('Portfolio', 'logs/portfolio.log')
+        self.bidder = bidder or KreamAutoBidder()
+        self.config = self.bidder.config
+        portfolio_config = self.config.get('portfolio', {})
+
+        self.clock = self.bidder.clock
+        self.engine = self.bidder.engine
+        self.threshold_index = self.bidder.threshold_index
+        self.check_interval = self.config.get('crawler', {}).get('check_interval', 60)
+        self._spend_override = max_total_spend
+        self.max_total_spend = max_total_spend or portfolio_config.get('max_total_spend')
+        self.pool = CrawlerPool(
+            crawlers or portfolio_config.get('crawlers', 2), self.config, crawler_factory,
+            driver_factory=self.bidder.driver_factory, clock=self.clock
+        )
+        self.cache = SnapshotCache(ttl=self.check_interval, name='portfolio')
+
+        self.spent = 0
+        self.last_prices = {}
+        self.waiting_ids = set()   # 도달했지만 체결되지 않은 목표 (거절/지출 한도/제출 실패)
+        self.target_ids = []
+        for target in targets:
+            self.add_target(**target)
+        self.next_due = None
+        self.checkpoint = Checkpointer(
+            'portfolio', [[t['product_url'], t['size'], t['target_price']] for t in targets], self.config, self.clock,
+            self.bidder.data_dir
+        )
+        watch_config(self._on_config_change)
+
+    def _on_config_change(self, config, old_config):
+        """설정 파일 변경 반영 (확인 주기, 지출 한도)"""
+        self.config = config
+        self.check_interval = config.get('crawler', {}).get('check_interval', 60)
+        self.cache.ttl = self.check_interval
+        if not self._spend_override:
+            self.max_total_spend = config.get('portfolio', {}).get('max_total_spend')
+        self.logger.info(
+            f"설정 변경: 확인 주기 {self.check_interval}초, "
+            f"지출 한도 {format_price(self.max_total_spend) if self.max_total_spend else '없음'}"
+        )
+
+    def add_target(self, product_url, size, target_price, max_price=None, min_price=None, price_step=None):
+        """
+        목표 추가 (armed 상태)
+
+        Returns:
+            int: 목표 ID
+        """
+        target_id = self.engine.add_target(product_url, size, target_price, max_price, min_price, price_step)
+        self.threshold_index.add((product_url, size), target_price, target_id)
+        self.target_ids.append(target_id)
+        return target_id
+
+    def cancel(self, target_id):
+        """
+        목표 취소
+
+        Args:
+            target_id (int): 목표 ID
+        """
+        if self.engine.state[target_id] in (FILLED, CANCELLED):
+            return
+        self.engine.set_state(target_id, CANCELLED)
+        self.threshold_index.remove(self.engine.get_key(target_id), int(self.engine.target[target_id]), target_id)
+        self.waiting_ids.discard(target_id)
+
+    def state_counts(self):
+        """
+        상태별 목표 수
+
+        Returns:
+            dict: {상태 이름: 개수}
+        """
+        counts = Counter(self.engine.state[self.target_ids].tolist())
+        return {name: counts.get(state, 0) for state, name in STATE_NAMES.items()}
+
+    def active_keys(self):
+        """
+        감시 중인 목표의 (상품 URL, 사이즈) 목록
+
+        Returns:
+            list: 키 목록
+        """
+        keys = []
+        seen = set()
+        for target_id in self.target_ids:
+            if self.engine.state[target_id] != ARMED:
+                continue
+            key = self.engine.get_key(target_id)
+            if key not in seen:
+                seen.add(key)
+                keys.append(key)
+        return keys
+
+    def tick(self, prices, trace_id=None):
+        """
+        가격 스냅샷 1회 처리
+
+        Args:
+            prices (dict): {(product_url, size): 최저 판매가}
+            trace_id (int): 추적 ID (None이면 새로 발급)
+
+        Returns:
+            int: 이번 틱에 체결된 목표 수
+        """
+        tracer = self.bidder.tracer
+        if trace_id is None:
+            trace_id = tracer.new_trace()
+
+        detected_at = time.monotonic()
+        with tracer.span(trace_id, 'decide'):
+            candidates = set(self.waiting_ids)
+            for key, price in prices.items():
+                candidates.update(self.threshold_index.crossed(key, self.last_prices.get(key), price))
+                if price > 0:
+                    self.last_prices[key] = price
+            candidates = sorted(candidates)
+            intents = self.engine.evaluate(prices, candidates=candidates)
+
+        filled = 0
+        for intent in intents:
+            if self.max_total_spend and self.spent + intent.price > self.max_total_spend:
+                self.logger.info(
+                    f"지출 한도 초과로 입찰 보류: {format_price(intent.price)} "
+                    f"(사용 {format_price(self.spent)} / 한도 {format_price(self.max_total_spend)})"
+                )
+                continue
+
+            self.engine.set_state(intent.target_id, TRIGGERED)
+            with tracer.span(trace_id, 'submit'):
+                success = self.bidder.place_bid(
+                    intent.product_url, intent.size, intent.price,
+                    triggered_at=detected_at, target_price=int(self.engine.target[intent.target_id])
+                )
+
+            if success:
+                self.engine.set_state(intent.target_id, FILLED)
+                self.threshold_index.remove(
+                    (intent.product_url, intent.size), int(self.engine.target[intent.target_id]), intent.target_id
+                )
+                self.spent += intent.price
+                filled += 1
+                self.logger.info(f"✅ 입찰 성공: {intent.product_url} 사이즈 {intent.size}, {format_price(intent.price)}")
+            else:
+                self.engine.set_state(intent.target_id, ARMED)
+
+        # 엔진이 거절했거나 보류/실패한 목표는 가격이 목표 위로 올라갈 때까지 다음 틱에도 평가
+        self.waiting_ids = set(self.engine.waiting(candidates))
+        return filled
+
+    def checkpoint_state(self):
+        """
+        체크포인트에 저장할 실행 상태
+
+        Returns:
+            dict: 목표별 상태, 지출, 마지막 가격, 도달했지만 체결되지 않은 목표, 다음 확인 예정 시각
+        """
+        index = {target_id: i for i, target_id in enumerate(self.target_ids)}
+        return {
+            'states': self.engine.state[self.target_ids].tolist(),
+            'spent': self.spent,
+            'last_prices': [[url, size, price] for (url, size), price in self.last_prices.items()],
+            'retry': sorted(index[target_id] for target_id in self.waiting_ids if target_id in index),
+            'next_due': self.next_due,
+        }
+
+    def restore(self, state):
+        """
+        체크포인트 상태 복원 (체결/취소된 목표는 다시 감시하지 않음)
+
+        Args:
+            state (dict): checkpoint_state() 결과
+        """
+        for target_id, target_state in zip(self.target_ids, state.get('states', [])):
+            if target_state in (FILLED, CANCELLED):
+                self.engine.set_state(target_id, target_state)
+                self.threshold_index.remove(
+                    self.engine.get_key(target_id), int(self.engine.target[target_id]), target_id
+                )
+        self.spent = state.get('spent', 0)
+        self.last_prices = {(url, size): price for url, size, price in state.get('last_prices', [])}
+        self.engine.update_prices(self.last_prices)
+        self.waiting_ids = {self.target_ids[i] for i in state.get('retry', []) if i < len(self.target_ids)}
+        self.logger.info(
+            f"이전 실행에서 이어서 감시: 상태 {self.state_counts()}, 지출 {format_price(self.spent)}"
+        )
+
+    def run(self, resume=True):
+        """
+        모든 목표가 체결/취소될 때까지 감시
+
+        Args:
+            resume (bool): 체크포인트가 있으면 이어서 실행
+        """
+        running = False
+        try:
+            state = self.checkpoint.load() if resume else None
+            if state:
+                self.restore(state)
+            self.bidder.setup()
+            self.pool.start()
+            self.logger.info(f"포트폴리오 입찰 시작: 목표 {len(self.target_ids)}개")
+            poll = PollTimer('portfolio', self.clock)
+            running = True
+            delay = resume_delay(state, self.check_interval, self.clock)
+            if delay and self.active_keys():
+                poll.plan(delay)
+                self.clock.sleep(delay)
+
+            while True:
+                poll.tick()
+                try:
+                    keys = self.active_keys()
+                    if not keys:
+                        self.logger.info("감시 중인 목표가 없습니다")
+                        break
+
+                    trace_id = self.bidder.tracer.new_trace()
+                    with self.bidder.tracer.span(trace_id, 'fetch'):
+                        snapshots = self.pool.fetch(keys)
+                    for (product_url, size), bid_info in snapshots.items():
+                        self.cache.put(product_url, size, bid_info, self.clock.time())
+
+                    prices = {key: bid_info['lowest_ask'] for key, bid_info in snapshots.items()}
+                    self.tick(prices, trace_id)
+
+                    counts = self.state_counts()
+                    self.logger.info(
+                        f"조회 {len(snapshots)}/{len(keys)}건, 상태: {counts}, "
+                        f"지출: {format_price(self.spent)}"
+                    )
+                    poll.plan(self.check_interval)
+                    self.next_due = self.clock.time() + self.check_interval
+                    self.checkpoint.maybe_save(self.checkpoint_state)
+                    self.clock.sleep(self.check_interval)
+
+                except KeyboardInterrupt:
+                    self.logger.info("사용자가 포트폴리오 입찰을 중단했습니다")
+                    break
+                except Exception as e:
+                    self.logger.error(f"포트폴리오 감시 중 오류: {e}")
+                    poll.plan(self.check_interval)
+                    self.clock.sleep(self.check_interval)
+
+        finally:
+            if running:
+                self.checkpoint.save(self.checkpoint_state())
+            self.pool.close()
+            self.bidder.close()
+            self._print_summary()
+
+    def _print_summary(self):
+        """포트폴리오 요약 출력"""
+        print(f"\n{'='*50}")
+        print("포트폴리오 요약")
+        print(f"{'='*50}")
+        for name, count in self.state_counts().items():
+            print(f"{name}: {count}개")
+        print(f"총 지출: {format_price(self.spent)}")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='KREAM 포트폴리오 자동 입찰')
+    parser.add_argument('--targets', type=str, required=True, help='목표 목록 파일 (YAML/CSV)')
+    parser.add_argument('--max-spend', type=int, help='전체 지출 한도 (원)')
+    parser.add_argument('--crawlers', type=int, help='가격 조회용 크롤러 수')
+    parser.add_argument('--fresh', action='store_true', help='체크포인트를 무시하고 처음부터 시작')
+
+    args = parser.parse_args()
+    install_signal_handlers()
+    start_server()
+
+    targets = load_targets(args.targets)
+    portfolio = PortfolioBidder(targets, max_total_spend=args.max_spend, crawlers=args.crawlers)
+    portfolio.run(resume=not args.fresh)
+
+
+if __name__ == "__main__":
+    main()
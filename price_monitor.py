@@ -1,31 +1,90 @@
 """
 가격 모니터링 모듈
 """
-import time
+import os
 import argparse
-from datetime import datetime
-import pandas as pd
+import threading
+from clock import SYSTEM_CLOCK
 from kream_crawler import KreamCrawler
-from utils import setup_logger, load_config, save_to_csv, format_price
+from history_store import HistoryStore
+from checkpoint import Checkpointer, resume_delay
+from profiler import get_profiler, install_signal_handlers
+from metrics import PollTimer, start_server
+from utils import setup_logger, load_config, watch_config, format_price, data_path
 
 
 class PriceMonitor:
     """가격 모니터링 클래스"""
     
-    def __init__(self, product_url, size=None):
+    def __init__(self, product_url, size=None, check_interval=None, headless=False, resume=True, driver_factory=None,
+                 clock=None, data_dir=None):
         """
         초기화
         
         Args:
             product_url (str): 상품 URL
             size (str): 사이즈
+            check_interval (int): 가격 확인 주기 (초), None이면 설정 파일 기준
+            headless (bool): 헤드리스 모드 사용 여부
+            resume (bool): 체크포인트가 있으면 이어서 실행 (확인 일정, 마지막 가격)
+            driver_factory: 웹드라이버 생성 함수 (None이면 Chrome, 테스트에서는 fake_driver)
+            clock: 시계 (None이면 실제 시계, 시뮬레이션에서는 clock.VirtualClock)
+            data_dir (str): 가격 이력 저장소/체크포인트/내보내기 파일 위치 (None이면 설정 파일 기준,
+                            시뮬레이션 시계면 clock.data_dir)
         """
         self.logger = setup_logger('PriceMonitor', 'logs/price_monitor.log')
         self.config = load_config()
         self.product_url = product_url
         self.size = size
-        self.crawler = KreamCrawler()
+        self.check_interval = check_interval
+        self.clock = clock or SYSTEM_CLOCK
+        self.data_dir = data_dir or self.clock.data_dir
+        self.crawler = KreamCrawler(headless=headless, driver_factory=driver_factory, clock=self.clock)
+        history_db = self.config.get('storage', {}).get('history_db', 'data/history.db')
+        self.store = HistoryStore(data_path(history_db, self.data_dir))
+        self.started_at = None
         self.price_history = []
+        self.last_bid = None
+        self.next_due = None
+        self.resume = resume
+        self.checkpoint = Checkpointer('monitor', [product_url, size], self.config, self.clock, self.data_dir)
+        self._stop = threading.Event()
+        watch_config(self._on_config_change)
+        get_profiler().track(f"price_history[{product_url} {size or '전체'}]", self, 'price_history')
+    
+    def _on_config_change(self, config, old_config):
+        """설정 파일 변경 반영 (다음 확인 주기부터 적용)"""
+        self.config = config
+        if self.check_interval is None:
+            self.logger.info(f"설정 변경: 확인 주기 {self._check_interval()}초")
+    
+    def _check_interval(self):
+        """현재 확인 주기 (초)"""
+        return self.check_interval or self.config.get('crawler', {}).get('check_interval', 60)
+    
+    def stop(self):
+        """모니터링 중지 요청 (다른 스레드에서 호출)"""
+        self._stop.set()
+    
+    def _checkpoint_state(self):
+        """체크포인트에 저장할 실행 상태"""
+        return {'started_at': self.started_at, 'last_bid': self.last_bid, 'next_due': self.next_due}
+    
+    def _restore(self, poll):
+        """체크포인트에서 이어서 실행 (마지막 가격, 다음 확인 예정 시각까지 대기)"""
+        state = self.checkpoint.load() if self.resume else None
+        if not state:
+            return
+        self.started_at = state.get('started_at') or self.started_at
+        self.last_bid = state.get('last_bid')
+        delay = resume_delay(state, self._check_interval(), self.clock)
+        self.logger.info(
+            f"이전 실행에서 이어서 모니터링 (마지막 가격 {format_price((self.last_bid or {}).get('buy_now_price', 0))}, "
+            f"다음 확인까지 {delay:.0f}초)"
+        )
+        if delay:
+            poll.plan(delay)
+            self.clock.wait(self._stop, delay)
         
     def start_monitoring(self, duration=None):
         """
@@ -47,10 +106,14 @@ class PriceMonitor:
             self.logger.info(f"모니터링 시작: {product_info['name']}")
             self.logger.info(f"사이즈: {self.size or '전체'}")
             
-            check_interval = self.config.get('crawler', {}).get('check_interval', 60)
-            start_time = time.time()
+            start_time = self.clock.time()
+            self.started_at = self.clock.now().strftime('%Y-%m-%d %H:%M:%S')
+            poll = PollTimer('monitor', self.clock)
+            self._restore(poll)
             
-            while True:
+            while not self._stop.is_set():
+                check_interval = self._check_interval()
+                poll.tick()
                 try:
                     # 가격 정보 가져오기
                     bid_info = self.crawler.get_bid_prices(self.size)
@@ -58,13 +121,18 @@ class PriceMonitor:
                     if bid_info:
                         # 가격 기록
                         price_data = {
-                            'timestamp': datetime.now(),
+                            'timestamp': self.clock.now(),
                             'buy_now_price': bid_info['buy_now_price'],
                             'highest_bid': bid_info['highest_bid'],
                             'lowest_ask': bid_info['lowest_ask'],
                             'size': self.size
                         }
                         self.price_history.append(price_data)
+                        self.store.add(price_data, self.product_url)
+                        self.logger.info(
+                            "가격 업데이트",
+                            extra={'product_url': self.product_url, 'size': self.size, 'price': bid_info['lowest_ask']}
+                        )
                         
                         # 콘솔 출력
                         print(f"\n[{price_data['timestamp'].strftime('%H:%M:%S')}] 가격 업데이트")
@@ -74,32 +142,41 @@ class PriceMonitor:
                         
                         # 가격 변동 알림
                         self._check_price_change(bid_info)
-                        
-                        # 주기적으로 데이터 저장
-                        if len(self.price_history) % 10 == 0:
-                            self._save_history()
+                        self.last_bid = {
+                            'timestamp': price_data['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
+                            'buy_now_price': bid_info['buy_now_price'],
+                            'highest_bid': bid_info['highest_bid'],
+                            'lowest_ask': bid_info['lowest_ask'],
+                        }
                     
                     # 지속 시간 체크
-                    if duration and (time.time() - start_time) >= duration:
+                    if duration and (self.clock.time() - start_time) >= duration:
                         self.logger.info("모니터링 시간 종료")
                         break
                     
                     # 대기
                     self.logger.info(f"{check_interval}초 후 다시 확인...")
-                    time.sleep(check_interval)
+                    poll.plan(check_interval)
+                    self.next_due = self.clock.time() + check_interval
+                    self.checkpoint.maybe_save(self._checkpoint_state)
+                    self.clock.wait(self._stop, check_interval)
                     
                 except KeyboardInterrupt:
                     self.logger.info("사용자가 모니터링을 중단했습니다")
                     break
                 except Exception as e:
                     self.logger.error(f"모니터링 중 오류: {e}")
-                    time.sleep(check_interval)
+                    poll.plan(check_interval)
+                    self.clock.wait(self._stop, check_interval)
             
         except Exception as e:
             self.logger.error(f"모니터링 실패: {e}")
         finally:
+            if self.started_at:
+                self.checkpoint.save(self._checkpoint_state())
             self._save_history()
             self.crawler.close()
+            self.store.close()
     
     def _check_price_change(self, current_bid):
         """
@@ -108,10 +185,11 @@ class PriceMonitor:
         Args:
             current_bid (dict): 현재 입찰 정보
         """
-        if len(self.price_history) < 2:
+        # 직전 가격 (재시작 직후에는 체크포인트의 마지막 가격)
+        if self.last_bid is None:
             return
         
-        prev_price = self.price_history[-2]['buy_now_price']
+        prev_price = self.last_bid['buy_now_price']
         curr_price = current_bid['buy_now_price']
         
         if curr_price < prev_price:
@@ -124,16 +202,30 @@ class PriceMonitor:
             print(f"  ⬆️  가격 상승: {format_price(change)}")
     
     def _save_history(self):
-        """가격 이력 저장"""
+        """
+        이번 모니터링의 가격 이력 파일 내보내기 (백그라운드)
+        
+        샘플은 수집할 때마다 가격 이력 저장소에 기록되며, 파일 쓰기는
+        내보내기 작업기가 청크 단위로 처리하므로 모니터링 루프를 막지 않습니다.
+        data_dir을 쓰는 실행은 이 모니터의 저장소에서 바로 내보냅니다 (저장소를 닫기 전에 완료).
+        """
         if not self.price_history:
             return
         
         try:
-            df = pd.DataFrame(self.price_history)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'data/price_history_{timestamp}.csv'
-            save_to_csv(df, filename)
-            self.logger.info(f"가격 이력 저장 완료 ({len(self.price_history)}건)")
+            from exporter import Exporter, get_exporter
+            
+            export_format = self.config.get('storage', {}).get('export_format', 'csv')
+            timestamp = self.clock.now().strftime('%Y%m%d_%H%M%S')
+            export_dir = data_path(self.config.get('storage', {}).get('export_dir', 'data/exports'), self.data_dir)
+            filename = os.path.join(export_dir, f'price_history_{timestamp}.{export_format}')
+            exporter = Exporter(store=self.store) if self.data_dir else get_exporter()
+            exporter.submit(
+                filename, product_url=self.product_url, size=self.size, date_from=self.started_at
+            )
+            if self.data_dir:
+                exporter.close()
+            self.logger.info(f"가격 이력 내보내기 예약: {filename} ({len(self.price_history)}건)")
         except Exception as e:
             self.logger.error(f"가격 이력 저장 실패: {e}")
     
@@ -147,6 +239,7 @@ class PriceMonitor:
         if not self.price_history:
             return {}
         
+        import pandas as pd
         df = pd.DataFrame(self.price_history)
         
         stats = {
@@ -166,10 +259,13 @@ def main():
     parser.add_argument('--product-url', type=str, required=True, help='상품 URL')
     parser.add_argument('--size', type=str, help='사이즈 (예: 270)')
     parser.add_argument('--duration', type=int, help='모니터링 시간 (초)')
+    parser.add_argument('--fresh', action='store_true', help='체크포인트를 무시하고 처음부터 시작')
     
     args = parser.parse_args()
+    install_signal_handlers()
+    start_server()
     
-    monitor = PriceMonitor(args.product_url, args.size)
+    monitor = PriceMonitor(args.product_url, args.size, resume=not args.fresh)
     monitor.start_monitoring(args.duration)
     
     # 통계 출력
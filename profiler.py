@@ -0,0 +1,309 @@
+"""
+실행 중 프로파일링 모듈
+
+오래 실행 중인 모니터링/입찰 프로세스를 멈추거나 재시작하지 않고 조사합니다.
+
+- CPU: 정해진 시간 동안 백그라운드 스레드가 모든 스레드의 호출 스택을 주기적으로 수집하여
+  함수별 self/누적 샘플 수와 flamegraph용 collapsed 스택을 logs/에 기록합니다.
+- 메모리: tracemalloc 스냅샷을 찍고 직전 스냅샷과의 차이(코드 위치별 증가량)와
+  등록한 자료구조(price_history, bid_history 등)의 크기 변화를 logs/에 기록합니다.
+
+실행 방법:
+    kill -USR1 <pid>      # CPU 프로파일 (profiling.window초)
+    kill -USR2 <pid>      # 메모리 스냅샷
+    데몬: POST /profile {"seconds": 30}, POST /profile/memory, GET /profile
+"""
+import os
+import sys
+import time
+import signal
+import weakref
+import linecache
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from utils import setup_logger, load_config
+
+
+class Profiler:
+    """CPU 샘플링 프로파일과 메모리 스냅샷"""
+
+    def __init__(self, config=None):
+        """
+        초기화
+
+        Args:
+            config (dict): profiling 설정 섹션 (None이면 config.yaml 기준)
+        """
+        if config is None:
+            config = load_config().get('profiling', {})
+        self.logger = setup_logger('Profiler', 'logs/profiler.log')
+        self.output_dir = config.get('dir', 'logs')
+        self.window = config.get('window', 30)
+        self.interval = config.get('interval', 0.01)
+        self.top = config.get('top', 30)
+        self.frames = config.get('frames', 10)
+        self.profile_thread = None
+        self.profile_ends_at = None
+        self.last_profile = None
+        self.last_memory = None
+        self._snapshot = None
+        self._sizes = {}
+        self._tracked = {}
+        self._lock = threading.Lock()
+
+    def _path(self, prefix, extension):
+        """타임스탬프가 붙은 출력 파일 경로"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return os.path.join(self.output_dir, f"{prefix}_{stamp}_{os.getpid()}.{extension}")
+
+    def track(self, name, owner, attr):
+        """
+        메모리 스냅샷에 크기를 기록할 자료구조 등록 (owner는 약한 참조로 보관)
+
+        Args:
+            name (str): 표시 이름 (예: "price_history[상품 URL]")
+            owner: 자료구조를 가진 객체
+            attr (str): 속성 이름 (len()으로 크기 확인)
+        """
+        with self._lock:
+            self._tracked[name] = (weakref.ref(owner), attr)
+
+    def tracked_sizes(self):
+        """
+        등록한 자료구조 크기 (사라진 객체는 목록에서 제거)
+
+        Returns:
+            dict: {이름: 원소 수}
+        """
+        sizes = {}
+        with self._lock:
+            for name, (ref, attr) in list(self._tracked.items()):
+                owner = ref()
+                if owner is None:
+                    del self._tracked[name]
+                    continue
+                sizes[name] = len(getattr(owner, attr, ()))
+        return sizes
+
+    def start_profile(self, seconds=None):
+        """
+        CPU 프로파일 시작 (바로 반환, 끝나면 결과 파일 기록)
+
+        Args:
+            seconds (float): 수집 시간 (None이면 설정 기준)
+
+        Returns:
+            dict: 프로파일 상태
+        """
+        seconds = float(seconds or self.window)
+        if seconds <= 0:
+            raise ValueError("seconds는 0보다 커야 합니다")
+        with self._lock:
+            if self.profile_thread is None or not self.profile_thread.is_alive():
+                self.profile_ends_at = time.time() + seconds
+                self.profile_thread = threading.Thread(
+                    target=self._sample, args=(seconds,), name='Profiler', daemon=True
+                )
+                self.profile_thread.start()
+                self.logger.info(f"CPU 프로파일 시작 ({seconds:.0f}초)")
+        return self.status()
+
+    def _sample(self, seconds):
+        """호출 스택 수집 (백그라운드 스레드)"""
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        self_counts = Counter()
+        total_counts = Counter()
+        stacks = Counter()
+        samples = 0
+
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if not stack:
+                    continue
+                self_counts[stack[0]] += 1
+                total_counts.update(set(stack))
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stacks[';'.join([names.get(ident, str(ident))] + stack[::-1])] += 1
+                samples += 1
+            time.sleep(self.interval)
+
+        try:
+            self.last_profile = self._write_profile(seconds, samples, self_counts, total_counts, stacks)
+            self.logger.info(f"CPU 프로파일 저장: {self.last_profile} (샘플 {samples}개)")
+        except OSError as e:
+            self.logger.error(f"CPU 프로파일 저장 실패: {e}")
+
+    def _write_profile(self, seconds, samples, self_counts, total_counts, stacks):
+        """프로파일 결과 파일 기록"""
+        path = self._path('profile', 'txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"CPU 프로파일: {seconds:.0f}초, 간격 {self.interval * 1000:.0f}ms, 샘플 {samples}개\n")
+            f.write("(대기 중인 스레드도 샘플에 포함되므로 sleep/wait 함수가 상위에 보일 수 있습니다)\n")
+            for title, counts in (('self', self_counts), ('누적', total_counts)):
+                f.write(f"\n=== 상위 함수 ({title}) ===\n")
+                for name, count in counts.most_common(self.top):
+                    f.write(f"{count:8d} {count / max(samples, 1) * 100:6.1f}%  {name}\n")
+        with open(f"{path[:-len('.txt')]}.collapsed", 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def memory_snapshot(self):
+        """
+        메모리 스냅샷 (처음 호출 시 tracemalloc 시작, 이후 직전 스냅샷과 비교)
+
+        Returns:
+            dict: 결과 파일 경로, 자료구조 크기, 증가량 상위 위치
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.logger.info(f"tracemalloc 시작 (스택 {self.frames}단계, 다음 스냅샷부터 증가량 비교)")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, linecache.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        sizes = self.tracked_sizes()
+        current, peak = tracemalloc.get_traced_memory()
+
+        with self._lock:
+            previous, previous_sizes = self._snapshot, self._sizes
+            self._snapshot, self._sizes = snapshot, sizes
+
+        growth = []
+        path = self._path('memory', 'txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"메모리 스냅샷: 추적 중 {current / 1024 / 1024:.1f}MB (최대 {peak / 1024 / 1024:.1f}MB)\n")
+
+            f.write("\n=== 자료구조 크기 ===\n")
+            for name, size in sorted(sizes.items()):
+                delta = size - previous_sizes.get(name, size)
+                f.write(f"{size:10d} ({delta:+d})  {name}\n")
+
+            if previous is not None:
+                f.write("\n=== 직전 스냅샷 대비 증가량 ===\n")
+                for stat in snapshot.compare_to(previous, 'lineno')[:self.top]:
+                    f.write(f"{stat}\n")
+                    growth.append({'location': str(stat.traceback[0]), 'size_diff': stat.size_diff,
+                                   'count_diff': stat.count_diff})
+
+            f.write("\n=== 할당량 상위 위치 ===\n")
+            for stat in snapshot.statistics('lineno')[:self.top]:
+                f.write(f"{stat}\n")
+
+            top = snapshot.statistics('traceback')[:3]
+            for stat in top:
+                f.write(f"\n--- {stat.size / 1024:.1f}KB, {stat.count}개 ---\n")
+                f.write('\n'.join(stat.traceback.format()) + '\n')
+
+        self.last_memory = path
+        self.logger.info(f"메모리 스냅샷 저장: {path} (추적 중 {current / 1024 / 1024:.1f}MB)")
+        return {'path': path, 'traced_mb': round(current / 1024 / 1024, 2), 'sizes': sizes, 'growth': growth}
+
+    def stop_memory(self):
+        """tracemalloc 종료 (추적 오버헤드 제거)"""
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshot, self._sizes = None, {}
+        self.logger.info("tracemalloc 종료")
+
+    def status(self):
+        """
+        프로파일링 상태
+
+        Returns:
+            dict: 상태 정보
+        """
+        running = self.profile_thread is not None and self.profile_thread.is_alive()
+        return {
+            'profiling': running,
+            'profile_remaining': max(0.0, self.profile_ends_at - time.time()) if running else 0.0,
+            'last_profile': self.last_profile,
+            'tracemalloc': tracemalloc.is_tracing(),
+            'last_memory': self.last_memory,
+            'tracked': self.tracked_sizes(),
+        }
+
+    def install_signal_handlers(self):
+        """
+        SIGUSR1(CPU 프로파일), SIGUSR2(메모리 스냅샷) 처리 등록
+
+        메인 스레드에서만 등록할 수 있으며, 시그널을 지원하지 않는 환경(Windows)에서는 무시합니다.
+
+        Returns:
+            bool: 등록 여부
+        """
+        if not hasattr(signal, 'SIGUSR1') or threading.current_thread() is not threading.main_thread():
+            return False
+
+        def on_profile(signum, frame):
+            # 시그널 처리기는 메인 스레드가 잠금을 잡은 채 끼어들 수 있으므로 잠금은 별도 스레드에서
+            threading.Thread(target=self._profile_safely, name='ProfileStart', daemon=True).start()
+
+        def on_memory(signum, frame):
+            # 스냅샷은 별도 스레드에서 (가격 확인 주기를 막지 않음)
+            threading.Thread(target=self._memory_safely, name='MemorySnapshot', daemon=True).start()
+
+        signal.signal(signal.SIGUSR1, on_profile)
+        signal.signal(signal.SIGUSR2, on_memory)
+        self.logger.info(f"프로파일링 시그널 등록 (pid {os.getpid()}: USR1=CPU, USR2=메모리)")
+        return True
+
+    def _profile_safely(self):
+        """CPU 프로파일 시작 (오류는 로그만)"""
+        try:
+            self.start_profile()
+        except Exception as e:
+            self.logger.error(f"CPU 프로파일 시작 실패: {e}")
+
+    def _memory_safely(self):
+        """메모리 스냅샷 (오류는 로그만)"""
+        try:
+            self.memory_snapshot()
+        except Exception as e:
+            self.logger.error(f"메모리 스냅샷 실패: {e}")
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler():
+    """
+    프로세스 공용 프로파일러
+
+    Returns:
+        Profiler: 프로파일러
+    """
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = Profiler()
+    return _profiler
+
+
+def install_signal_handlers():
+    """
+    프로세스 공용 프로파일러의 시그널 처리 등록 (profiling.signals가 false면 등록하지 않음)
+
+    Returns:
+        bool: 등록 여부
+    """
+    if not load_config().get('profiling', {}).get('signals', True):
+        return False
+    return get_profiler().install_signal_handlers()
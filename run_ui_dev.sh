@@ -16,6 +16,16 @@ else
     exit 1
 fi
 
+# 백엔드 데몬 실행 (이미 실행 중이면 그대로 사용)
+if ! pgrep -f "python daemon.py" > /dev/null; then
+    echo "🔧 백엔드 데몬 시작 중... (로그: logs/daemon.out)"
+    mkdir -p logs
+    nohup python daemon.py > logs/daemon.out 2>&1 &
+else
+    echo "✅ 백엔드 데몬이 이미 실행 중입니다"
+fi
+echo ""
+
 # Streamlit 개발 모드 실행
 echo "🚀 개발 모드로 웹 UI를 시작합니다..."
 echo ""
@@ -0,0 +1,266 @@
+"""
+스크린샷 수집 모듈
+
+목표 가격 도달, 입찰 제출, 가격 파싱 실패 같은 이벤트가 생기면 화면을 자동으로 남깁니다.
+감시 스레드에서는 브라우저에서 PNG를 받아 큐에 넣기만 하고(웹드라이버는 스레드 간 공유 불가),
+해시 계산, 중복 제거, 압축, 파일 쓰기, 디렉토리 크기 관리는 백그라운드 스레드가 처리합니다.
+
+- 중복 제거: 지각 해시(dHash, Pillow 필요)의 해밍 거리가 screenshots.dedup_distance 이하인
+  최근 캡처가 있으면 저장하지 않음 (Pillow가 없으면 내용 해시가 같을 때만)
+- 압축: screenshots.format(webp, jpeg, png)으로 다시 인코딩 (Pillow가 없으면 PNG 그대로)
+- 크기 제한: 디렉토리가 screenshots.max_mb를 넘으면 가장 오래 사용하지 않은 파일부터 삭제
+  (중복으로 걸러진 캡처는 기존 파일을 사용한 것으로 봄)
+"""
+import io
+import os
+import re
+import time
+import atexit
+import queue
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from metrics import SCREENSHOTS, track_queue
+from utils import setup_logger, load_config
+
+
+EVENTS = ('target_hit', 'bid_submitted', 'parse_failure')
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg', 'png': 'png'}
+
+
+def dhash(image, size=8):
+    """
+    지각 해시 (difference hash)
+
+    Args:
+        image (PIL.Image.Image): 이미지
+        size (int): 해시 한 변의 크기 (size * size 비트)
+
+    Returns:
+        int: 해시
+    """
+    from PIL import Image
+
+    small = image.convert('L').resize((size + 1, size), Image.BILINEAR)
+    pixels = small.tobytes()
+    bits = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+class ScreenshotPipeline:
+    """이벤트 스크린샷 백그라운드 저장"""
+
+    def __init__(self, config=None):
+        """
+        초기화
+
+        Args:
+            config (dict): 설정 (None이면 config.yaml 로드)
+        """
+        self.logger = setup_logger('Screenshots', 'logs/screenshots.log')
+        screenshot_config = (config if config is not None else load_config()).get('screenshots', {})
+        self.enabled = screenshot_config.get('enabled', True)
+        self.events = set(screenshot_config.get('events', EVENTS))
+        self.dir = screenshot_config.get('dir', 'screenshots')
+        self.max_bytes = int(screenshot_config.get('max_mb', 200) * 1024 * 1024)
+        self.format = screenshot_config.get('format', 'webp')
+        self.quality = screenshot_config.get('quality', 60)
+        self.dedup_distance = screenshot_config.get('dedup_distance', 6)
+        self.cooldown = screenshot_config.get('cooldown', 30)
+
+        self._queue = queue.Queue(maxsize=screenshot_config.get('queue', 16))
+        self._last_capture = {}
+        self._recent = deque(maxlen=256)   # (해시, 파일 경로)
+        self._files = OrderedDict()        # 파일 경로 -> 크기 (오래 사용하지 않은 순)
+        self._total = 0
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def capture(self, driver, event, page=None, now=None):
+        """
+        이벤트 스크린샷 요청 (호출한 스레드에서는 PNG만 받고 바로 반환)
+
+        Args:
+            driver: 웹드라이버
+            event (str): 이벤트 이름 (target_hit, bid_submitted, parse_failure)
+            page (str): 페이지 식별 정보 (파일 이름, 재캡처 간격 기준, None이면 현재 URL)
+            now (datetime): 이벤트 시각 (None이면 현재 시각)
+
+        Returns:
+            bool: 저장 대기열에 넣었는지 여부
+        """
+        if not self.enabled or event not in self.events or driver is None:
+            return False
+
+        now = now or datetime.now()
+        page = page or getattr(driver, 'current_url', '') or ''
+        key = (event, page)
+        last = self._last_capture.get(key)
+        if last is not None and 0 <= (now - last).total_seconds() < self.cooldown:
+            SCREENSHOTS.labels(result='cooldown').inc()
+            return False
+        self._last_capture[key] = now
+
+        try:
+            png = driver.get_screenshot_as_png()
+        except Exception as e:
+            SCREENSHOTS.labels(result='error').inc()
+            self.logger.error(f"스크린샷 캡처 실패 ({event}): {e}")
+            return False
+
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((png, event, page, now))
+        except queue.Full:
+            SCREENSHOTS.labels(result='dropped').inc()
+            self.logger.warning(f"스크린샷 대기열이 가득 차 버림: {event} {page}")
+            return False
+        return True
+
+    def _ensure_worker(self):
+        """처음 캡처할 때 기존 파일을 읽고 작업 스레드 시작"""
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._scan()
+            self._worker = threading.Thread(target=self._run, name='Screenshots', daemon=True)
+            self._worker.start()
+
+    def _scan(self):
+        """디렉토리의 기존 파일을 마지막 사용(수정) 시각 순으로 등록"""
+        os.makedirs(self.dir, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.dir):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        for _, path, size in sorted(entries):
+            self._files[path] = size
+            self._total += size
+
+    def _run(self):
+        """작업 스레드"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self._store(*item)
+            except Exception as e:
+                SCREENSHOTS.labels(result='error').inc()
+                self.logger.error(f"스크린샷 저장 실패 ({item[1]}): {e}")
+
+    def _store(self, png, event, page, now):
+        """해시 → 중복 확인 → 압축 → 저장 → 크기 제한"""
+        image = None
+        try:
+            from PIL import Image
+            image = Image.open(io.BytesIO(png))
+            image.load()
+            digest = dhash(image)
+            distance = self.dedup_distance
+        except ImportError:
+            digest = int.from_bytes(hashlib.sha1(png).digest()[:8], 'big')
+            distance = 0
+
+        for seen, path in self._recent:
+            if bin(seen ^ digest).count('1') <= distance and path in self._files:
+                self._touch(path)
+                SCREENSHOTS.labels(result='duplicate').inc()
+                self.logger.info(f"비슷한 스크린샷이 있어 저장하지 않음 ({event}): {path}")
+                return
+
+        data, extension = png, 'png'
+        if image is not None and self.format != 'png':
+            buffer = io.BytesIO()
+            image.convert('RGB').save(buffer, format=self.format.upper(), quality=self.quality)
+            # 단순한 화면은 PNG가 더 작을 수 있음
+            if buffer.tell() < len(png):
+                data, extension = buffer.getvalue(), EXTENSIONS.get(self.format, self.format)
+
+        slug = re.sub(r'[^0-9A-Za-z]+', '-', page.rstrip('/').rsplit('/', 1)[-1])[:40].strip('-') or 'page'
+        path = os.path.join(self.dir, f"{now.strftime('%Y%m%d_%H%M%S')}_{event}_{slug}_{digest:016x}.{extension}")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        self._files[path] = len(data)
+        self._total += len(data)
+        self._recent.append((digest, path))
+        SCREENSHOTS.labels(result='saved').inc()
+        self.logger.info(f"스크린샷 저장 ({event}): {path} ({len(png) // 1024}KB → {len(data) // 1024}KB)")
+        self._evict()
+
+    def _touch(self, path):
+        """파일 사용 표시 (삭제 순서에서 가장 뒤로)"""
+        self._files.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """디렉토리 크기가 한도를 넘으면 오래 사용하지 않은 파일부터 삭제"""
+        while self._total > self.max_bytes and len(self._files) > 1:
+            path, size = self._files.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(path)
+                self.logger.info(f"스크린샷 삭제 (용량 한도): {path}")
+            except FileNotFoundError:
+                pass
+
+    def status(self):
+        """
+        현재 상태
+
+        Returns:
+            dict: 대기 건수, 파일 수, 디렉토리 크기
+        """
+        return {'queued': self._queue.qsize(), 'files': len(self._files), 'bytes': self._total}
+
+    def close(self, timeout=5.0):
+        """
+        대기 중인 스크린샷을 저장한 뒤 종료
+
+        Args:
+            timeout (float): 최대 대기 시간 (초)
+        """
+        if self._worker is None:
+            return
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._worker.join(max(0.0, deadline - time.monotonic()))
+        self._worker = None
+
+
+_default_pipeline = None
+_default_lock = threading.Lock()
+
+
+def get_screenshots():
+    """
+    프로세스 공용 스크린샷 수집기
+
+    Returns:
+        ScreenshotPipeline: 스크린샷 수집기
+    """
+    global _default_pipeline
+    if _default_pipeline is None:
+        with _default_lock:
+            if _default_pipeline is None:
+                _default_pipeline = ScreenshotPipeline()
+                atexit.register(_default_pipeline.close)
+                track_queue('screenshot', lambda: _default_pipeline._queue.qsize())
+    return _default_pipeline
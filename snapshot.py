@@ -0,0 +1,162 @@
+"""
+일괄 가격 스냅샷 모듈
+
+(상품 URL, 사이즈) 목록의 현재 즉시 구매가/최고 입찰가/최저 판매가를 한 번만 조회하여
+하나의 표로 저장합니다. 크롤러 풀 크기만큼만 동시에 조회하고, 같은 상품의 여러 사이즈는
+한 번의 페이지 이동으로 함께 조회하며, crawler.max_requests_per_minute 한도를 따릅니다.
+
+입력 파일 (product_url, size 열):
+    CSV, YAML(목록 또는 items: 목록), 텍스트("상품 URL 사이즈" 한 줄에 하나)
+
+실행:
+    python snapshot.py items.csv --output data/morning.xlsx --workers 4
+"""
+import os
+import csv
+import time
+import argparse
+from datetime import datetime
+import yaml
+from crawler_pool import CrawlerPool
+from exporter import write_rows
+from utils import setup_logger, load_config, create_directories
+
+
+SNAPSHOT_COLUMNS = (
+    'product_url', 'size', 'buy_now_price', 'highest_bid', 'lowest_ask', 'latency_ms', 'fetched_at', 'status'
+)
+
+
+def load_items(path):
+    """
+    조회할 (상품 URL, 사이즈) 목록 로드 (중복 제거, 순서 유지)
+
+    Args:
+        path (str): CSV, YAML 또는 텍스트 파일 경로
+
+    Returns:
+        list: (product_url, size) 목록
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = [(row.get('product_url'), row.get('size')) for row in csv.DictReader(f)]
+    elif extension in ('.yaml', '.yml'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or []
+        data = data.get('items', []) if isinstance(data, dict) else data
+        rows = [(row.get('product_url'), row.get('size')) for row in data]
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = [tuple(line.split()[:2]) for line in f if line.strip() and not line.startswith('#')]
+
+    items = []
+    seen = set()
+    for row in rows:
+        if len(row) != 2 or not row[0] or row[1] in (None, ''):
+            raise ValueError(f"product_url과 size가 필요합니다: {row}")
+        key = (str(row[0]).strip(), str(row[1]).strip())
+        if key not in seen:
+            seen.add(key)
+            items.append(key)
+    return items
+
+
+def take_snapshot(items, workers=None, login=False, headless=True, config=None, crawler_factory=None):
+    """
+    가격 일괄 조회
+
+    Args:
+        items (list): (product_url, size) 목록
+        workers (int): 동시에 사용할 크롤러 수 (None이면 portfolio.crawlers)
+        login (bool): 크롤러마다 로그인 여부
+        headless (bool): 헤드리스 모드 사용 여부
+        config (dict): 설정 (None이면 config.yaml 로드)
+        crawler_factory: 크롤러 생성 함수 (None이면 KreamCrawler)
+
+    Returns:
+        tuple: (행 목록, 통계 딕셔너리)
+    """
+    config = config if config is not None else load_config()
+    workers = workers or config.get('portfolio', {}).get('crawlers', 2)
+    products = len({product_url for product_url, _ in items})
+
+    if crawler_factory is None:
+        from kream_crawler import KreamCrawler
+
+        def crawler_factory():
+            return KreamCrawler(headless=headless)
+
+    started = time.monotonic()
+    pool = CrawlerPool(min(workers, products) or 1, config, crawler_factory, login=login)
+    try:
+        pool.start()
+        setup_seconds = time.monotonic() - started
+        snapshots = pool.fetch(items)
+    finally:
+        pool.close()
+    wall_seconds = time.monotonic() - started
+
+    fetched_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rows = []
+    latencies = []
+    for product_url, size in items:
+        bid_info = snapshots.get((product_url, size))
+        if bid_info is None:
+            rows.append((product_url, size, None, None, None, None, fetched_at, 'failed'))
+            continue
+        latency_ms = round(bid_info.get('fetch_latency', 0) * 1000, 1)
+        latencies.append(latency_ms)
+        rows.append((
+            product_url, size, bid_info['buy_now_price'], bid_info['highest_bid'], bid_info['lowest_ask'],
+            latency_ms, fetched_at, 'ok'
+        ))
+
+    latencies.sort()
+    stats = {
+        'items': len(items),
+        'products': products,
+        'ok': len(latencies),
+        'failed': len(items) - len(latencies),
+        'workers': pool.size,
+        'setup_seconds': setup_seconds,
+        'wall_seconds': wall_seconds,
+        'latency_p50_ms': latencies[len(latencies) // 2] if latencies else None,
+        'latency_p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None,
+        'latency_max_ms': latencies[-1] if latencies else None,
+    }
+    return rows, stats
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='KREAM 일괄 가격 스냅샷')
+    parser.add_argument('items', type=str, help='조회 목록 파일 (CSV/YAML/텍스트: product_url, size)')
+    parser.add_argument('--output', type=str, help='저장할 파일 (csv, csv.gz, xlsx, parquet, 기본: data/snapshot_<시각>.csv)')
+    parser.add_argument('--workers', type=int, help='동시에 사용할 크롤러 수 (기본: portfolio.crawlers)')
+    parser.add_argument('--login', action='store_true', help='크롤러마다 로그인')
+    parser.add_argument('--show-browser', action='store_true', help='브라우저 창 표시')
+
+    args = parser.parse_args()
+    create_directories()
+    logger = setup_logger('Snapshot', 'logs/snapshot.log')
+
+    items = load_items(args.items)
+    output = args.output or f"data/snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    print(f"조회 대상: {len(items)}건 ({len({url for url, _ in items})}개 상품)")
+
+    rows, stats = take_snapshot(items, args.workers, args.login, not args.show_browser)
+    write_rows(output, list(SNAPSHOT_COLUMNS), [rows])
+    logger.info(f"스냅샷 저장: {output} ({stats})")
+
+    print("\n=== 스냅샷 완료 ===")
+    print(f"성공 {stats['ok']}건 / 실패 {stats['failed']}건 (크롤러 {stats['workers']}개)")
+    print(f"전체 시간: {stats['wall_seconds']:.1f}초 (브라우저 준비 {stats['setup_seconds']:.1f}초)")
+    if stats['latency_p50_ms'] is not None:
+        print(f"항목별 조회 시간: p50 {stats['latency_p50_ms']:.0f}ms, "
+              f"p95 {stats['latency_p95_ms']:.0f}ms, 최대 {stats['latency_max_ms']:.0f}ms")
+    print(f"저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
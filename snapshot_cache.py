@@ -0,0 +1,114 @@
+"""
+가격 스냅샷 캐시 모듈
+
+(상품 URL, 사이즈)별 최신 가격 정보를 조회 시각과 함께 보관하여
+여러 목표/화면이 같은 조회 결과를 공유하도록 합니다.
+오래된 스냅샷의 갱신은 키마다 한 번만 진행되도록 표시(begin_refresh)합니다.
+"""
+import time
+import threading
+from metrics import CACHE_LOOKUPS
+
+
+class SnapshotCache:
+    """가격 스냅샷 캐시"""
+
+    def __init__(self, ttl=60, name='snapshot'):
+        """
+        초기화
+
+        Args:
+            ttl (float): 스냅샷 유효 시간 (초)
+            name (str): 캐시 이름 (메트릭 라벨)
+        """
+        self.ttl = ttl
+        self._hits = CACHE_LOOKUPS.labels(cache=name, result='hit')
+        self._misses = CACHE_LOOKUPS.labels(cache=name, result='miss')
+        self._data = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def put(self, product_url, size, bid_info, fetched_at=None):
+        """
+        스냅샷 저장
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+            bid_info (dict): get_bid_prices() 결과
+            fetched_at (float): 조회 시각 (time.time())
+        """
+        with self._lock:
+            self._data[(product_url, size)] = (bid_info, fetched_at if fetched_at is not None else time.time())
+            self._refreshing.discard((product_url, size))
+
+    def get(self, product_url, size):
+        """
+        스냅샷 조회
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+
+        Returns:
+            tuple: (bid_info, fetched_at) 또는 (None, None)
+        """
+        return self._data.get((product_url, size), (None, None))
+
+    def is_fresh(self, product_url, size, now=None):
+        """
+        스냅샷이 유효 시간 안인지 확인
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+            now (float): 기준 시각 (time.time())
+
+        Returns:
+            bool: 유효 여부
+        """
+        _, fetched_at = self.get(product_url, size)
+        fresh = fetched_at is not None and (now if now is not None else time.time()) - fetched_at < self.ttl
+        (self._hits if fresh else self._misses).inc()
+        return fresh
+
+    def begin_refresh(self, product_url, size):
+        """
+        갱신 시작 표시 (같은 키의 중복 갱신 방지)
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+
+        Returns:
+            bool: 이번 호출이 갱신을 맡았으면 True (이미 진행 중이면 False)
+        """
+        with self._lock:
+            if (product_url, size) in self._refreshing:
+                return False
+            self._refreshing.add((product_url, size))
+            return True
+
+    def end_refresh(self, product_url, size):
+        """
+        갱신 종료 표시 (조회 실패 시)
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+        """
+        with self._lock:
+            self._refreshing.discard((product_url, size))
+
+    def is_refreshing(self, product_url, size):
+        """
+        갱신 진행 중 여부
+
+        Args:
+            product_url (str): 상품 URL
+            size (str): 사이즈
+
+        Returns:
+            bool: 진행 중 여부
+        """
+        return (product_url, size) in self._refreshing
@@ -0,0 +1,51 @@
+"""
+테스트 공용 설정
+
+모든 테스트는 임시 디렉토리에서 실행되므로 data/, logs/, screenshots/ 등
+상대 경로로 쓰는 파일이 저장소에 남지 않습니다.
+"""
+import os
+import sys
+import pytest
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from log_pipeline import get_pipeline  # noqa: E402
+
+PRODUCT_URL = 'https://kream.co.kr/products/12345'
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """저장소 설정을 복사한 임시 작업 디렉토리 (프로세스 공용 스크린샷 수집기/추적기는 끔)"""
+    with open(os.path.join(ROOT, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    config['screenshots']['enabled'] = False
+    config['tracing']['enabled'] = False
+    with open(tmp_path / 'config.yaml', 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, allow_unicode=True)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('KREAM_EMAIL', 'test@example.com')
+    monkeypatch.setenv('KREAM_PASSWORD', 'test')
+    yield tmp_path
+    # 로그 파일은 처음 기록할 때 현재 디렉토리 기준으로 열리므로 작업 디렉토리를 되돌리기 전에 기록을 마침
+    get_pipeline().queue.join()
+
+
+def quotes(*asks, spread=10000):
+    """
+    최저 판매가 목록 → FakeDriver 가격 시퀀스
+
+    Args:
+        *asks (int): 가격을 읽을 때마다 차례로 돌려줄 최저 판매가
+        spread (int): 최저 판매가와 최고 입찰가/즉시 구매가의 차이
+
+    Returns:
+        list: FakeDriver prices 값
+    """
+    return [
+        {'buy_now_price': ask + spread // 2, 'highest_bid': ask - spread // 2, 'lowest_ask': ask}
+        for ask in asks
+    ]
@@ -0,0 +1,216 @@
+"""
+자동 입찰 루프 테스트 (FakeDriver + VirtualClock)
+"""
+from datetime import datetime
+from auto_bidder import KreamAutoBidder
+from bid_ledger import BidLedger
+from clock import VirtualClock
+from fake_driver import FakeDriver, driver_factory
+from hot_bidder import HotStandbyPool
+from portfolio import PortfolioBidder
+from conftest import PRODUCT_URL, quotes
+
+
+def make_bidder(workdir, asks, submit=True, polls=10, clock=None):
+    """가격 시퀀스를 읽는 자동 입찰기 (제출은 submit 결과로 대체, polls번 확인 후 중지)"""
+    clock = clock or VirtualClock(datetime(2024, 1, 1, 9, 0))
+    ledger = BidLedger(str(workdir / 'bids.db'), {'ledger': {}}, clock)
+    bidder = KreamAutoBidder(
+        ledger=ledger, headless=True,
+        driver_factory=driver_factory(prices={PRODUCT_URL: quotes(*asks)}), clock=clock, data_dir=str(workdir)
+    )
+    bidder.crawler.submit_bid_form = lambda price: submit
+    get_bid_prices = bidder.crawler.get_bid_prices
+
+    def limited(size=None):
+        bidder.fetched_at.append(clock.time())
+        if len(bidder.fetched_at) >= polls:
+            bidder.stop()
+        return get_bid_prices(size)
+
+    bidder.fetched_at = []
+
+    bidder.crawler.get_bid_prices = limited
+    return bidder, ledger
+
+
+def test_bids_once_when_price_crosses_target(workdir):
+    bidder, ledger = make_bidder(workdir, [160000, 155000, 149000, 148000])
+    try:
+        bidder.monitor_and_bid(PRODUCT_URL, '270', 150000, max_price=160000, check_interval=60, resume=False)
+    finally:
+        ledger.close()
+
+    # 세 번째 확인(가상 시각 +120초)에서 한 번만 입찰하고 종료
+    assert [bid['price'] for bid in bidder.bid_history] == [149000]
+    assert bidder.fetched_at[-1] - bidder.fetched_at[0] == 120
+    assert len(bidder.fetched_at) == 3
+
+
+def test_failed_submit_is_retried_next_poll(workdir):
+    bidder, ledger = make_bidder(workdir, [149000], submit=False, polls=3)
+    try:
+        bidder.monitor_and_bid(PRODUCT_URL, '270', 150000, max_price=160000, check_interval=60, resume=False)
+    finally:
+        ledger.close()
+
+    # 테스트 모드(제출 실패)는 원장에서 다시 입찰할 수 있는 상태
+    assert [bid['status'] for bid in bidder.bid_history] == ['test'] * 3
+
+
+def test_resume_from_checkpoint(workdir):
+    clock = VirtualClock(datetime(2024, 1, 1, 9, 0))
+    first, ledger = make_bidder(workdir, [160000], polls=3, clock=clock)
+    try:
+        first.monitor_and_bid(PRODUCT_URL, '270', 150000, max_price=160000, check_interval=60)
+    finally:
+        ledger.close()
+    assert first.bid_history == []
+
+    # 재시작: 남은 대기 시간만 기다린 뒤 이어서 감시하고, 체결되면 다음 실행은 입찰하지 않음
+    clock.advance(10)
+    second, ledger = make_bidder(workdir, [149000], polls=3, clock=clock)
+    try:
+        second.monitor_and_bid(PRODUCT_URL, '270', 150000, max_price=160000, check_interval=60)
+    finally:
+        ledger.close()
+    assert second.fetched_at[0] == first.fetched_at[-1] + 60
+    assert [bid['price'] for bid in second.bid_history] == [149000]
+
+    third, ledger = make_bidder(workdir, [140000], polls=3, clock=clock)
+    try:
+        third.monitor_and_bid(PRODUCT_URL, '270', 150000, max_price=160000, check_interval=60)
+    finally:
+        ledger.close()
+    assert third.fetched_at == [] and third.bid_history == []
+
+
+def test_rejected_target_is_reevaluated_while_reached(workdir):
+    # 145000: 목표(150000)에는 도달했지만 최대 가격(140000) 초과로 엔진이 거절
+    # 135000: 가격이 목표 아래에 머무는 동안 다시 평가해 입찰해야 함
+    bidder, ledger = make_bidder(workdir, [145000, 135000])
+    try:
+        bidder.monitor_and_bid(PRODUCT_URL, '270', 150000, max_price=140000, check_interval=60, resume=False)
+    finally:
+        ledger.close()
+
+    assert [bid['price'] for bid in bidder.bid_history] == [135000]
+    assert bidder.bid_history[0]['status'] == 'success'
+
+
+def test_portfolio_reevaluates_rejected_target(workdir):
+    bidder, ledger = make_bidder(workdir, [])
+    placed = []
+    bidder.place_bid = lambda url, size, price, **kwargs: placed.append(price) or True
+    try:
+        portfolio = PortfolioBidder(
+            [{'product_url': PRODUCT_URL, 'size': '270', 'target_price': 150000, 'max_price': 140000}],
+            crawlers=1, bidder=bidder
+        )
+        key = (PRODUCT_URL, '270')
+        assert portfolio.tick({key: 145000}) == 0
+        assert portfolio.tick({key: 135000}) == 1
+    finally:
+        ledger.close()
+
+    assert placed == [135000]
+
+
+def test_bid_submitted_captured_after_latency(workdir):
+    bidder, ledger = make_bidder(workdir, [140000])
+    events = []
+    bidder.crawler.capture = lambda event, page=None: events.append((event, len(bidder.bid_latencies)))
+    try:
+        bidder.monitor_and_bid(PRODUCT_URL, '270', 150000, max_price=160000, check_interval=60, resume=False)
+    finally:
+        ledger.close()
+
+    # 제출 → 지연 시간 기록 → 캡처 순서 (캡처가 지연 시간에 포함되지 않음)
+    assert events == [('bid_submitted', 1), ('target_hit', 1)]
+
+
+def test_post_submit_failure_keeps_ledger_outcome(workdir):
+    bidder, ledger = make_bidder(workdir, [149000], polls=3)
+
+    def broken_capture(event, page=None):
+        raise RuntimeError('capture failed')
+
+    bidder.crawler.capture = broken_capture
+    try:
+        bidder.monitor_and_bid(PRODUCT_URL, '270', 150000, max_price=160000, check_interval=60, resume=False)
+        assert ledger.flush()
+        summary = ledger.summary()
+    finally:
+        ledger.close()
+
+    # 제출 후 캡처가 실패해도 입찰은 성공으로 기록되고 다시 나가지 않음
+    assert [bid['status'] for bid in bidder.bid_history] == ['success']
+    assert summary['by_status'] == {'success': 1}
+
+
+def test_portfolio_waiting_targets_follow_price(workdir):
+    bidder, ledger = make_bidder(workdir, [])
+    placed = []
+    bidder.place_bid = lambda url, size, price, **kwargs: placed.append(price) or True
+    try:
+        portfolio = PortfolioBidder(
+            [{'product_url': PRODUCT_URL, 'size': '270', 'target_price': 150000, 'max_price': 140000}],
+            crawlers=1, bidder=bidder
+        )
+        key = (PRODUCT_URL, '270')
+        target_id = portfolio.target_ids[0]
+        portfolio.tick({key: 145000})
+        assert portfolio.waiting_ids == {target_id}
+        # 목표 위로 올라가면 대기 목록에서 빠지고, 다시 내려오면 crossed()로 새로 감지
+        portfolio.tick({key: 155000})
+        assert portfolio.waiting_ids == set()
+        assert portfolio.tick({key: 135000}) == 1
+        assert portfolio.waiting_ids == set()
+    finally:
+        ledger.close()
+
+    assert placed == [135000]
+
+
+def test_portfolio_pool_uses_fake_driver_and_virtual_clock(workdir):
+    clock = VirtualClock(datetime(2024, 1, 1, 9, 0))
+    bidder, ledger = make_bidder(workdir, [149000], clock=clock)
+    try:
+        portfolio = PortfolioBidder(
+            [{'product_url': PRODUCT_URL, 'size': '270', 'target_price': 150000}], crawlers=1, bidder=bidder
+        )
+        pool = portfolio.pool
+        pool.start()
+        try:
+            started = clock.time()
+            prices = pool.fetch([(PRODUCT_URL, '270')])
+        finally:
+            pool.close()
+    finally:
+        ledger.close()
+
+    assert prices[(PRODUCT_URL, '270')]['lowest_ask'] == 149000
+    # 요청 간격(request_delay)은 실제로 기다리지 않고 가상 시계로 흘러감
+    assert clock.time() - started >= pool.request_delay > 0
+
+
+def test_hot_submit_result_decides_capture(workdir):
+    clock = VirtualClock(datetime(2024, 1, 1, 9, 0))
+    bidder, ledger = make_bidder(workdir, [], clock=clock)
+    bidder.hot_pool = HotStandbyPool({'bidding': {}}, headless=True, driver_factory=FakeDriver, clock=clock)
+    events = []
+    bidder.hot_pool.capture = lambda url, size, event: events.append((size, event))
+    try:
+        assert bidder.hot_pool.arm(PRODUCT_URL, '270') and bidder.hot_pool.arm(PRODUCT_URL, '275')
+        bidder.hot_pool.slots[(PRODUCT_URL, '270')].crawler.submit_bid_form = lambda price: False
+        bidder.hot_pool.slots[(PRODUCT_URL, '275')].crawler.submit_bid_form = lambda price: True
+
+        assert not bidder.place_bid(PRODUCT_URL, '270', 149000, target_price=150000)
+        assert bidder.place_bid(PRODUCT_URL, '275', 149000, target_price=150000)
+    finally:
+        bidder.hot_pool.close()
+        ledger.close()
+
+    # 제출하지 못한 대기 브라우저는 결과 화면을 캡처하지 않음
+    assert events == [('275', 'bid_submitted')]
+    assert [(bid['size'], bid['status']) for bid in bidder.bid_history] == [('270', 'test'), ('275', 'success')]
@@ -0,0 +1,39 @@
+"""
+입찰 결정 엔진/백테스트 테스트
+"""
+import numpy as np
+from backtest import GRID_COLUMNS, build_grid, simulate_series
+from bid_engine import BidDecisionEngine, BidIntent
+
+
+def test_evaluate_returns_intents_for_hits_only():
+    engine = BidDecisionEngine({'bidding': {}})
+    hit = engine.add_target('a', '270', target_price=100000, max_price=120000, price_step=1000)
+    engine.add_target('b', '270', target_price=90000, max_price=120000)
+
+    intents = engine.evaluate({('a', '270'): 99500, ('b', '270'): 95000, ('unknown', '270'): 1})
+
+    assert len(intents) == 1
+    assert list(intents) == [BidIntent(hit, 'a', '270', 99000, 99500)]
+
+
+def test_min_price_above_ask_skips_target():
+    engine = BidDecisionEngine({'bidding': {}})
+    target_id = engine.add_target('a', '270', target_price=60000, max_price=60000, min_price=50000)
+
+    assert not engine.evaluate({('a', '270'): 40000})
+    assert engine.waiting([target_id]) == [target_id]
+
+    intents = engine.evaluate({('a', '270'): 55000})
+    assert [intent.price for intent in intents] == [55000]
+
+
+def test_backtest_min_price_waits_for_ask_above_floor():
+    grid = build_grid([60000], [60000], [1000], min_prices=[50000])
+    grid_arrays = {column: grid[column].to_numpy() for column in GRID_COLUMNS}
+    market = np.array([40000, 55000, 58000], dtype=np.float64)
+
+    result = simulate_series(market, np.array([0]), grid_arrays)
+
+    assert result['fills'].tolist() == [1]
+    assert result['fill_price_sum'].tolist() == [55000]
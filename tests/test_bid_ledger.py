@@ -0,0 +1,72 @@
+"""
+입찰 원장 멱등성/복구 테스트
+"""
+from datetime import datetime
+import pytest
+from bid_ledger import BidLedger, LedgerError
+from clock import VirtualClock
+from conftest import PRODUCT_URL
+
+CONFIG = {'ledger': {'idempotency_window': 3600, 'commit_interval': 0.001}}
+
+
+def open_ledger(workdir, clock):
+    return BidLedger(str(workdir / 'bids.db'), CONFIG, clock)
+
+
+def test_same_bid_is_not_submitted_twice(workdir):
+    clock = VirtualClock(datetime(2024, 1, 1, 9, 0))
+    ledger = open_ledger(workdir, clock)
+    try:
+        key = ledger.begin(PRODUCT_URL, '270', 149000, 150000)
+        assert key is not None
+        assert ledger.begin(PRODUCT_URL, '270', 149000, 150000) is None
+        ledger.finish(key, 'success')
+        assert ledger.begin(PRODUCT_URL, '270', 149000, 150000) is None
+
+        # 다른 가격이나 다음 시간 구간은 새 입찰
+        assert ledger.begin(PRODUCT_URL, '270', 148000, 150000) is not None
+        clock.advance(3600)
+        assert ledger.begin(PRODUCT_URL, '270', 149000, 150000) is not None
+    finally:
+        ledger.close()
+
+
+def test_failed_bid_can_be_retried(workdir):
+    ledger = open_ledger(workdir, VirtualClock(datetime(2024, 1, 1, 9, 0)))
+    try:
+        key = ledger.begin(PRODUCT_URL, '270', 149000, 150000)
+        ledger.finish(key, 'failed')
+        assert ledger.begin(PRODUCT_URL, '270', 149000, 150000) == key
+        assert ledger.flush()
+        assert ledger.summary()['total'] == 1
+    finally:
+        ledger.close()
+
+
+def test_pending_intent_blocks_resubmit_after_restart(workdir):
+    clock = VirtualClock(datetime(2024, 1, 1, 9, 0))
+    ledger = open_ledger(workdir, clock)
+    # 의도가 커밋된 뒤 결과를 기록하기 전에 종료
+    ledger.begin(PRODUCT_URL, '270', 149000, 150000)
+    assert ledger.flush()
+    ledger._queue.put(None)
+    ledger._writer.join()
+
+    restarted = open_ledger(workdir, clock)
+    try:
+        in_flight = restarted.recover()
+        assert [(bid['price'], bid['status']) for bid in in_flight] == [(149000, 'pending')]
+        assert restarted.begin(PRODUCT_URL, '270', 149000, 150000) is None
+        assert restarted.summary()['by_status'] == {'unknown': 1}
+        assert restarted.summary()['unknown'] == 1
+        assert [bid['price'] for bid in restarted.needs_review()] == [149000]
+    finally:
+        restarted.close()
+
+
+def test_begin_on_closed_ledger_refuses_to_bid(workdir):
+    ledger = open_ledger(workdir, VirtualClock(datetime(2024, 1, 1, 9, 0)))
+    ledger.close()
+    with pytest.raises(LedgerError):
+        ledger.begin(PRODUCT_URL, '270', 149000, 150000)
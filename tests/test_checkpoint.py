@@ -0,0 +1,34 @@
+"""
+체크포인트 저장/복원 테스트
+"""
+from checkpoint import Checkpointer, resume_delay
+from clock import VirtualClock
+
+CONFIG = {'checkpoint': {'interval': 10, 'max_age': 3600}}
+
+
+def test_roundtrip_and_resume_delay(workdir):
+    clock = VirtualClock(1_000_000)
+    checkpoint = Checkpointer('monitor', ['url', '270'], CONFIG, clock, str(workdir))
+    checkpoint.save({'next_due': clock.time() + 60, 'last_price': 150000})
+
+    clock.advance(20)
+    state = Checkpointer('monitor', ['url', '270'], CONFIG, clock, str(workdir)).load()
+    assert state['last_price'] == 150000
+    assert resume_delay(state, 60, clock) == 40
+
+
+def test_rejects_other_key_and_stale(workdir):
+    clock = VirtualClock(1_000_000)
+    Checkpointer('monitor', ['url', '270'], CONFIG, clock, str(workdir)).save({'last_price': 1})
+
+    assert Checkpointer('monitor', ['url', '275'], CONFIG, clock, str(workdir)).load() is None
+    clock.advance(3601)
+    assert Checkpointer('monitor', ['url', '270'], CONFIG, clock, str(workdir)).load() is None
+
+
+def test_rejects_checkpoint_from_the_future(workdir):
+    # 시뮬레이션(미래 시각)에서 저장한 체크포인트를 실제 시계 실행이 이어받지 않음
+    Checkpointer('monitor', ['url', '270'], CONFIG, VirtualClock(2_000_000), str(workdir)).save({'last_price': 1})
+
+    assert Checkpointer('monitor', ['url', '270'], CONFIG, VirtualClock(1_000_000), str(workdir)).load() is None
@@ -0,0 +1,69 @@
+"""
+데몬 HTTP API 테스트 (임시 data_dir을 쓰는 실제 BidderDaemon)
+"""
+import os
+import threading
+from http.server import ThreadingHTTPServer
+import pytest
+from bid_ledger import BidLedger
+from daemon import BidderDaemon, ApiHandler
+from daemon_client import DaemonClient
+from utils import load_config
+from conftest import PRODUCT_URL
+
+
+@pytest.fixture
+def api(workdir):
+    """임시 포트에서 실행 중인 데몬과 클라이언트"""
+    data_dir = workdir / 'data'
+    data_dir.mkdir()
+    daemon = BidderDaemon(load_config(), data_dir=str(data_dir))
+    # 핸들러 클래스 속성은 프로세스 공용이므로 테스트 전용 하위 클래스에 데몬을 연결
+    handler = type('TestApiHandler', (ApiHandler,), {'daemon': daemon})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield daemon, DaemonClient(f"http://127.0.0.1:{server.server_port}", timeout=10)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(5)
+        daemon.shutdown()
+
+
+def test_export_path_is_confined_to_export_dir(api, workdir):
+    daemon, client = api
+
+    for path in ('../escape.csv', '/tmp/escape.csv', 'nested/../../escape.csv', '.'):
+        with pytest.raises(ValueError, match='안의 파일'):
+            client.start_export(path=path)
+    with pytest.raises(ValueError, match='알 수 없는 필드'):
+        client.start_export(path='ok.csv', store='other.db')
+    with pytest.raises(TypeError):
+        daemon.start_export(path='ok.csv', store='other.db')
+
+    # 내보내기 파일과 가격 이력 저장소 모두 data_dir 아래
+    job = client.start_export(path='nested/ok.csv', size='270')
+    path = os.path.realpath(workdir / 'data' / 'exports' / 'nested' / 'ok.csv')
+    assert job['path'] == path
+    daemon._get_exporter().get(job['id']).future.result(10)
+    assert client.export_status(job['id'])['status'] == 'done'
+    assert os.path.exists(path) and os.path.exists(workdir / 'data' / 'history.db')
+    assert not os.path.exists(workdir / 'data' / 'data')
+
+
+def test_history_summary_reports_unknown_bids(workdir):
+    # 제출 직후 종료된 입찰은 다음 데몬 시작 시 복구되어 unknown으로 집계
+    data_dir = workdir / 'data'
+    data_dir.mkdir()
+    ledger = BidLedger(str(data_dir / 'bids.db'), load_config())
+    ledger.begin(PRODUCT_URL, '270', 149000, 150000)
+    ledger.close()
+
+    daemon = BidderDaemon(load_config(), data_dir=str(data_dir))
+    try:
+        assert daemon.bid_summary()['unknown'] == 1
+        assert daemon.ledger.needs_review()[0]['product_url'] == PRODUCT_URL
+    finally:
+        daemon.shutdown()
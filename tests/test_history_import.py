@@ -0,0 +1,106 @@
+"""
+가격 이력 가져오기 테스트
+"""
+import os
+from datetime import datetime, timedelta
+from exporter import Exporter
+from history_import import HistoryImporter
+from history_store import HistoryStore
+from conftest import PRODUCT_URL
+
+
+def add_samples(store, count, product_url=PRODUCT_URL):
+    start = datetime(2024, 1, 1, 9, 0)
+    for i in range(count):
+        store.add({
+            'timestamp': start + timedelta(minutes=i), 'size': '270',
+            'buy_now_price': 155000, 'highest_bid': 145000, 'lowest_ask': 150000 + i
+        }, product_url)
+
+
+def test_reimporting_export_adds_no_duplicates(workdir):
+    store = HistoryStore(str(workdir / 'history.db'))
+    add_samples(store, 50)
+    export_dir = workdir / 'exports'
+    exporter = Exporter(store=store)
+    exporter.submit(str(export_dir / 'price_history_20240101_090000.csv'))
+    exporter.close()
+
+    summary = HistoryImporter(store=store, workers=1).run(str(export_dir))
+
+    assert summary['files'] == 1 and summary['rows_read'] == 50
+    assert summary['rows_inserted'] == 0
+    assert store.count() == 50
+    store.close()
+
+
+def test_legacy_file_without_product_url(workdir):
+    store = HistoryStore(str(workdir / 'history.db'))
+    os.makedirs(workdir / 'data')
+    with open(workdir / 'data' / 'price_history_20240101_090000.csv', 'w', encoding='utf-8-sig') as f:
+        f.write('timestamp,buy_now_price,highest_bid,lowest_ask,size\n')
+        f.write('2024-01-01 09:00:00,155000,145000,150000,270\n')
+        f.write('2024-01-01 09:00:00,155000,145000,150000,270\n')
+        f.write('2024-01-01 09:01:00,155000,145000,151000,270\n')
+
+    importer = HistoryImporter(store=store, workers=1)
+    assert importer.run(str(workdir / 'data'))['rows_inserted'] == 2
+    # 가져온 파일은 다시 처리하지 않음
+    assert importer.run(str(workdir / 'data'))['files'] == 0
+    assert store.count() == 2
+    store.close()
+
+
+def test_overlapping_files_in_parallel_chunks(workdir):
+    # 모니터가 남긴 누적 파일들: 뒤 파일이 앞 파일의 행을 모두 다시 포함
+    store = HistoryStore(str(workdir / 'history.db'))
+    os.makedirs(workdir / 'data')
+    lines = [f'2024-01-01 09:{minute:02d}:00,155000,145000,{150000 + minute},270\n' for minute in range(60)]
+    for i, count in enumerate((20, 40, 60)):
+        with open(workdir / 'data' / f'price_history_2024010{i}_090000.csv', 'w', encoding='utf-8-sig') as f:
+            f.write('timestamp,buy_now_price,highest_bid,lowest_ask,size\n')
+            f.writelines(lines[:count])
+
+    summary = HistoryImporter(store=store, workers=2, batch_size=7).run(str(workdir / 'data'))
+
+    assert summary['rows_read'] == 120
+    assert summary['rows_inserted'] == 60
+    assert store.count() == 60
+    store.close()
+
+
+def test_csv_timestamps_match_monitor_rows(workdir):
+    # 모니터가 저장한 행과 마이크로초 없는 예전 CSV의 같은 샘플은 한 행
+    store = HistoryStore(str(workdir / 'history.db'))
+    add_samples(store, 2)
+    os.makedirs(workdir / 'data')
+    with open(workdir / 'data' / 'price_history_20240101_090000.csv', 'w', encoding='utf-8-sig') as f:
+        f.write('timestamp,buy_now_price,highest_bid,lowest_ask,size\n')
+        f.write('2024-01-01 09:00:00,155000,145000,150000,270\n')
+        f.write('2024-01-01T09:01:00,155000,145000,150001,270\n')
+        f.write('2024-01-01 09:02:00,155000,145000,150002,270\n')
+
+    summary = HistoryImporter(store=store, workers=1).run(str(workdir / 'data'), product_url=PRODUCT_URL)
+
+    assert summary['rows_inserted'] == 1
+    assert store.count(product_url=PRODUCT_URL) == 3
+    timestamps = [row[2] for rows in store.iter_rows() for row in rows]
+    assert timestamps == [f'2024-01-01 09:0{minute}:00.000000' for minute in range(3)]
+    store.close()
+
+
+def test_legacy_store_timestamps_are_migrated(workdir):
+    db_path = str(workdir / 'history.db')
+    store = HistoryStore(db_path)
+    add_samples(store, 1)
+    store.insert_many([
+        (PRODUCT_URL, '270', '2024-01-01 09:00:00', 155000, 145000, 150000),
+        (PRODUCT_URL, '270', '2024-01-01 09:05:00', 155000, 145000, 150005),
+    ])
+    store.conn.execute('PRAGMA user_version = 0')
+    store.close()
+
+    store = HistoryStore(db_path)
+    timestamps = [row[2] for rows in store.iter_rows() for row in rows]
+    assert timestamps == ['2024-01-01 09:00:00.000000', '2024-01-01 09:05:00.000000']
+    store.close()
@@ -0,0 +1,94 @@
+"""
+입찰 대기(hot standby) 테스트 (FakeDriver)
+"""
+import time
+import threading
+from clock import VirtualClock
+from fake_driver import FakeDriver
+from hot_bidder import HotStandbyPool
+from kream_crawler import KreamCrawler
+from conftest import PRODUCT_URL
+
+
+class SlowFormCrawler(KreamCrawler):
+    """입찰 폼 준비가 오래 걸리는 크롤러 (새로고침 중 제출 확인용)"""
+
+    slow = False
+    opening = threading.Event()
+    release = threading.Event()
+
+    def open_bid_form(self, product_url, size):
+        if type(self).slow:
+            type(self).opening.set()
+            type(self).release.wait(5)
+        return super().open_bid_form(product_url, size)
+
+    def submit_bid_form(self, price):
+        return True
+
+
+def test_refresh_does_not_block_submit(workdir):
+    clock = VirtualClock(1_000_000)
+    pool = HotStandbyPool(
+        {'bidding': {}}, lambda: SlowFormCrawler(headless=True, driver_factory=FakeDriver, clock=clock), clock=clock
+    )
+    assert pool.arm(PRODUCT_URL, '270')
+    pool._stop.set()
+    SlowFormCrawler.slow = True
+    slot = pool.slots[(PRODUCT_URL, '270')]
+    armed = slot.crawler
+
+    refresher = threading.Thread(target=pool._refresh_slot, args=(slot,))
+    refresher.start()
+    try:
+        # 새로고침이 폼을 준비하는 동안에도 제출은 잠금을 기다리지 않음
+        assert SlowFormCrawler.opening.wait(5)
+        assert pool.submit(PRODUCT_URL, '270', 150000)
+    finally:
+        SlowFormCrawler.release.set()
+        refresher.join(5)
+
+    assert slot.ready and slot.crawler is not armed and slot.spare is armed
+    drivers = [armed.driver, slot.crawler.driver]
+    pool.close()
+    assert all(driver.closed for driver in drivers) and armed.driver is None
+
+
+class BlockingSizeCrawler(KreamCrawler):
+    """특정 사이즈의 입찰 폼 준비가 멈추는 크롤러 (목표별 새로고침 확인용)"""
+
+    blocked_size = None
+    blocked = threading.Event()
+    release = threading.Event()
+
+    def open_bid_form(self, product_url, size):
+        if size == type(self).blocked_size:
+            type(self).blocked.set()
+            type(self).release.wait(5)
+        return super().open_bid_form(product_url, size)
+
+
+def test_slow_slot_does_not_stall_other_refreshes(workdir):
+    clock = VirtualClock(1_000_000)
+    pool = HotStandbyPool(
+        {'bidding': {'hot_refresh_interval': 60}},
+        lambda: BlockingSizeCrawler(headless=True, driver_factory=FakeDriver, clock=clock), clock=clock
+    )
+    try:
+        assert pool.arm(PRODUCT_URL, '270') and pool.arm(PRODUCT_URL, '275')
+        stuck, other = pool.slots[(PRODUCT_URL, '270')], pool.slots[(PRODUCT_URL, '275')]
+        armed = other.crawler
+
+        # 새로고침 주기는 가상 시계 기준
+        BlockingSizeCrawler.blocked_size = '270'
+        clock.advance(60)
+        assert BlockingSizeCrawler.blocked.wait(5)
+        for _ in range(50):
+            if other.crawler is not armed:
+                break
+            time.sleep(0.1)
+        assert other.crawler is not armed and other.ready
+        assert stuck.refreshing
+    finally:
+        BlockingSizeCrawler.release.set()
+        pool.close()
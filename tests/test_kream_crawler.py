@@ -0,0 +1,52 @@
+"""
+크롤러 가격 읽기 테스트 (FakeDriver)
+"""
+from clock import VirtualClock
+from fake_driver import FakeDriver
+from kream_crawler import KreamCrawler
+from conftest import PRODUCT_URL
+
+
+def read_prices(workdir, quote):
+    """가격 딕셔너리 하나를 읽고 (결과, 캡처한 이벤트) 반환"""
+    crawler = KreamCrawler(
+        headless=True, driver_factory=lambda: FakeDriver(prices={PRODUCT_URL: [quote]}), clock=VirtualClock(1_000_000)
+    )
+    events = []
+    crawler.capture = lambda event, page=None: events.append(event)
+    crawler.setup_driver()
+    crawler.driver.get(PRODUCT_URL)
+    try:
+        return crawler.get_bid_prices('270'), events
+    finally:
+        crawler.close()
+
+
+def test_zero_price_is_not_parse_failure(workdir):
+    bid_info, events = read_prices(workdir, {'buy_now_price': 0, 'highest_bid': 0, 'lowest_ask': 0})
+
+    assert bid_info['lowest_ask'] == 0
+    assert events == []
+
+
+def test_missing_element_is_parse_failure(workdir):
+    bid_info, events = read_prices(workdir, {'buy_now_price': 155000, 'lowest_ask': 150000})
+
+    assert bid_info['lowest_ask'] == 150000
+    assert bid_info['highest_bid'] == 0
+    assert events == ['parse_failure']
+
+
+def test_page_waits_follow_clock_and_close_resets_driver(workdir):
+    clock = VirtualClock(1_000_000)
+    crawler = KreamCrawler(headless=True, driver_factory=FakeDriver, clock=clock)
+    crawler.setup_driver()
+    driver = crawler.driver
+
+    # 가짜 드라이버도 렌더링 대기는 그대로 하되 가상 시계로만 흘러감
+    assert crawler.get_product_info(PRODUCT_URL)['url'] == PRODUCT_URL
+    assert clock.elapsed == crawler.page_settle > 0
+
+    crawler.close()
+    assert driver.closed and crawler.driver is None and not crawler.is_logged_in
+    crawler.close()
@@ -0,0 +1,54 @@
+"""
+가격 모니터링 루프 테스트 (FakeDriver + VirtualClock)
+"""
+import os
+import tempfile
+from datetime import datetime
+from clock import VirtualClock
+from fake_driver import driver_factory
+from history_store import HistoryStore
+from price_monitor import PriceMonitor
+from conftest import PRODUCT_URL, quotes
+
+
+def run_monitor(clock, asks, duration, **kwargs):
+    """가격 시퀀스를 duration초 동안 감시"""
+    monitor = PriceMonitor(
+        PRODUCT_URL, '270', check_interval=60, headless=True,
+        driver_factory=driver_factory(prices={PRODUCT_URL: quotes(*asks)}), clock=clock, **kwargs
+    )
+    monitor.start_monitoring(duration=duration)
+    return monitor
+
+
+def test_simulation_writes_to_clock_data_dir(workdir, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(workdir / 'tmp'))
+    os.makedirs(workdir / 'tmp')
+    clock = VirtualClock(datetime(2024, 1, 1, 9, 0))
+
+    monitor = run_monitor(clock, [150000, 149000, 151000], duration=24 * 3600)
+
+    # 하루치(60초 간격) 확인을 대기 없이 실행하고, 실제 data/ 디렉토리는 건드리지 않음
+    assert len(monitor.price_history) == 24 * 60 + 1
+    assert not (workdir / 'data').exists()
+    assert os.path.dirname(clock.data_dir) == str(workdir / 'tmp')
+    files = sorted(os.listdir(clock.data_dir))
+    assert 'history.db' in files and 'checkpoints' in files
+    assert any(name.startswith('price_history_') for name in os.listdir(os.path.join(clock.data_dir, 'exports')))
+    store = HistoryStore(os.path.join(clock.data_dir, 'history.db'))
+    try:
+        assert store.count(product_url=PRODUCT_URL) == 24 * 60 + 1
+    finally:
+        store.close()
+
+
+def test_resume_from_checkpoint(workdir):
+    clock = VirtualClock(datetime(2024, 1, 1, 9, 0))
+    first = run_monitor(clock, [150000], duration=600, data_dir=str(workdir / 'sim'))
+    assert first.last_bid['lowest_ask'] == 150000
+
+    # 다음 실행은 마지막 가격을 이어받아 가격 변동을 바로 판단
+    clock.advance(30)
+    second = run_monitor(clock, [140000], duration=60, data_dir=str(workdir / 'sim'))
+    assert second.started_at == first.started_at
+    assert second.last_bid['lowest_ask'] == 140000
@@ -0,0 +1,28 @@
+"""
+프로파일러 시그널 처리 테스트
+"""
+import os
+import signal
+import time
+import pytest
+from profiler import Profiler
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGUSR1'), reason='SIGUSR1 미지원')
+def test_sigusr1_while_lock_held_does_not_deadlock(workdir):
+    profiler = Profiler({'dir': str(workdir), 'window': 0.05, 'interval': 0.01})
+    handlers = signal.getsignal(signal.SIGUSR1), signal.getsignal(signal.SIGUSR2)
+    try:
+        assert profiler.install_signal_handlers()
+        # 메인 스레드가 잠금을 잡고 있는 중에 시그널이 와도 처리기는 바로 반환해야 함
+        with profiler._lock:
+            os.kill(os.getpid(), signal.SIGUSR1)
+            time.sleep(0.01)
+        deadline = time.monotonic() + 5
+        while profiler.profile_thread is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert profiler.profile_thread is not None
+        profiler.profile_thread.join(5)
+    finally:
+        signal.signal(signal.SIGUSR1, handlers[0])
+        signal.signal(signal.SIGUSR2, handlers[1])
@@ -0,0 +1,33 @@
+"""
+구간 추적기 테스트
+"""
+import json
+import threading
+from tracing import Tracer
+
+
+def test_concurrent_flush_writes_every_span_once(workdir):
+    path = workdir / 'trace.jsonl'
+    tracer = Tracer(str(path), enabled=True, flush_interval=0.001)
+    errors = []
+
+    def flush_repeatedly():
+        try:
+            for _ in range(200):
+                tracer.flush()
+        except Exception as e:
+            errors.append(e)
+
+    flushers = [threading.Thread(target=flush_repeatedly) for _ in range(4)]
+    for thread in flushers:
+        thread.start()
+    for trace_id in range(20000):
+        tracer.record(trace_id, 'decide', 0, 1)
+    for thread in flushers:
+        thread.join()
+    tracer.close()
+
+    assert errors == []
+    with open(path, 'r', encoding='utf-8') as f:
+        ids = [json.loads(line)['t'] for line in f]
+    assert len(ids) == len(set(ids)) == 20000
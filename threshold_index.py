@@ -0,0 +1,108 @@
+"""
+목표 가격 정렬 인덱스 모듈
+
+(상품, 사이즈)별로 목표 가격을 정렬해 두고, 최저 판매가가 P1에서 P2로
+움직였을 때 새로 도달한 목표만 이분 탐색으로 찾아냅니다.
+"""
+from bisect import bisect_left, insort
+
+
+class ThresholdIndex:
+    """(상품, 사이즈)별 목표 가격 정렬 인덱스"""
+
+    def __init__(self):
+        """초기화"""
+        self._index = {}
+
+    def add(self, key, target_price, target_id):
+        """
+        목표 추가
+
+        Args:
+            key (tuple): (product_url, size)
+            target_price (int): 목표 가격
+            target_id (int): 목표 ID
+        """
+        insort(self._index.setdefault(key, []), (target_price, target_id))
+
+    def remove(self, key, target_price, target_id):
+        """
+        목표 제거
+
+        Args:
+            key (tuple): (product_url, size)
+            target_price (int): 목표 가격
+            target_id (int): 목표 ID
+
+        Returns:
+            bool: 제거 여부
+        """
+        entries = self._index.get(key)
+        if not entries:
+            return False
+
+        pos = bisect_left(entries, (target_price, target_id))
+        if pos < len(entries) and entries[pos] == (target_price, target_id):
+            del entries[pos]
+            if not entries:
+                del self._index[key]
+            return True
+        return False
+
+    def reached(self, key, price):
+        """
+        현재 가격으로 도달한 목표 (목표 가격 >= 현재 가격)
+
+        Args:
+            key (tuple): (product_url, size)
+            price (int): 최저 판매가
+
+        Returns:
+            list: 목표 ID 목록
+        """
+        entries = self._index.get(key)
+        if not entries or price <= 0:
+            return []
+
+        pos = bisect_left(entries, (price, -1))
+        return [target_id for _, target_id in entries[pos:]]
+
+    def crossed(self, key, old_price, new_price):
+        """
+        가격이 old_price에서 new_price로 내려가며 새로 도달한 목표
+
+        new_price <= 목표 가격 < old_price 범위의 목표만 반환합니다.
+        old_price가 없으면(첫 조회) 현재 도달한 목표 전체를 반환합니다.
+
+        Args:
+            key (tuple): (product_url, size)
+            old_price (int): 이전 최저 판매가
+            new_price (int): 현재 최저 판매가
+
+        Returns:
+            list: 목표 ID 목록
+        """
+        if not old_price:
+            return self.reached(key, new_price)
+
+        entries = self._index.get(key)
+        if not entries or new_price <= 0 or new_price >= old_price:
+            return []
+
+        lo = bisect_left(entries, (new_price, -1))
+        hi = bisect_left(entries, (old_price, -1), lo)
+        return [target_id for _, target_id in entries[lo:hi]]
+
+    def count(self, key=None):
+        """
+        등록된 목표 수
+
+        Args:
+            key (tuple): (product_url, size) (None이면 전체)
+
+        Returns:
+            int: 목표 수
+        """
+        if key is not None:
+            return len(self._index.get(key, ()))
+        return sum(len(entries) for entries in self._index.values())
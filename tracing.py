@@ -0,0 +1,277 @@
+"""
+지연 시간 추적 모듈
+
+가격 조회 → 입찰 결정 → 입찰 제출 단계마다 단조 시계(monotonic) 기반 구간(span)을 기록합니다.
+한 번의 가격 확인(tick)에 속한 구간은 같은 추적 ID를 공유하며,
+기록은 메모리 큐에 넣기만 하고 파일(JSONL) 쓰기는 백그라운드 스레드가 담당합니다.
+
+리포트:
+    python tracing.py report logs/trace.jsonl
+"""
+import os
+import json
+import time
+import argparse
+import itertools
+import threading
+from collections import deque, defaultdict
+from metrics import track_queue
+from utils import load_config
+
+
+class _Span:
+    """구간 측정 컨텍스트"""
+
+    __slots__ = ('tracer', 'trace_id', 'stage', 'start')
+
+    def __init__(self, tracer, trace_id, stage):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._events.append((self.trace_id, self.stage, self.start, time.perf_counter_ns() - self.start))
+        return False
+
+
+class _NullSpan:
+    """추적 비활성화 시 사용하는 빈 구간"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """구간 추적기"""
+
+    def __init__(self, path=None, enabled=None, flush_interval=1.0):
+        """
+        초기화
+
+        Args:
+            path (str): 추적 파일 경로 (None이면 설정 파일 기준)
+            enabled (bool): 활성화 여부 (None이면 설정 파일 기준)
+            flush_interval (float): 파일 쓰기 주기 (초)
+        """
+        tracing_config = load_config().get('tracing', {})
+        self.enabled = tracing_config.get('enabled', True) if enabled is None else enabled
+        self.path = path or tracing_config.get('file', 'logs/trace.jsonl')
+        self.flush_interval = flush_interval
+
+        self._ids = itertools.count(1)
+        self._prefix = f"{os.getpid():x}"
+        self._events = deque()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._writer = None
+
+        if self.enabled:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._writer = threading.Thread(target=self._write_loop, name='TraceWriter', daemon=True)
+            self._writer.start()
+
+    def new_trace(self):
+        """
+        새 추적 ID 발급
+
+        Returns:
+            int: 추적 ID
+        """
+        return next(self._ids)
+
+    def span(self, trace_id, stage):
+        """
+        구간 측정 컨텍스트
+
+        Args:
+            trace_id (int): 추적 ID
+            stage (str): 단계 이름 (fetch, decide, submit 등)
+
+        Returns:
+            컨텍스트 매니저
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, trace_id, stage)
+
+    def record(self, trace_id, stage, start_ns, duration_ns):
+        """
+        이미 측정한 구간 기록
+
+        Args:
+            trace_id (int): 추적 ID
+            stage (str): 단계 이름
+            start_ns (int): 시작 시각 (time.perf_counter_ns())
+            duration_ns (int): 소요 시간 (ns)
+        """
+        if self.enabled:
+            self._events.append((trace_id, stage, start_ns, duration_ns))
+
+    def flush(self):
+        """큐에 쌓인 구간을 파일에 기록 (기록 스레드와 close/입찰 종료가 동시에 호출해도 안전)"""
+        if not self._events:
+            return
+
+        # 꺼내기와 쓰기를 한 스레드씩 처리 (기록은 잠금 없이 append만 하므로 입찰 경로는 막지 않음)
+        with self._flush_lock:
+            lines = []
+            events = self._events
+            while events:
+                trace_id, stage, start, duration = events.popleft()
+                lines.append(json.dumps(
+                    {'t': f"{self._prefix}-{trace_id}", 's': stage, 'b': start, 'd': duration},
+                    separators=(',', ':')
+                ))
+            if lines:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(lines) + '\n')
+
+    def _write_loop(self):
+        """주기적으로 파일에 기록"""
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"추적 기록 실패: {e}")
+
+    def close(self):
+        """남은 구간을 기록하고 종료"""
+        self._stop.set()
+        if self._writer:
+            self._writer.join(timeout=5)
+        if self.enabled:
+            self.flush()
+
+
+_default_tracer = None
+
+
+def get_tracer():
+    """
+    프로세스 공용 추적기
+
+    Returns:
+        Tracer: 추적기
+    """
+    global _default_tracer
+    if _default_tracer is None:
+        _default_tracer = Tracer()
+        track_queue('trace', lambda: len(_default_tracer._events))
+    return _default_tracer
+
+
+def load_trace(path):
+    """
+    추적 파일 로드
+
+    Args:
+        path (str): 추적 파일 경로
+
+    Returns:
+        dict: {추적 ID: [(stage, start_ns, duration_ns), ...]}
+    """
+    traces = defaultdict(list)
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            traces[event['t']].append((event['s'], event['b'], event['d']))
+    return traces
+
+
+def _percentile(values, pct):
+    """정렬된 목록의 백분위수"""
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def _format_duration(ns):
+    """ns를 읽기 쉬운 단위로 변환"""
+    if ns >= 1e9:
+        return f"{ns / 1e9:.2f}s"
+    if ns >= 1e6:
+        return f"{ns / 1e6:.1f}ms"
+    return f"{ns / 1e3:.0f}µs"
+
+
+def report(path, slowest=10, width=40):
+    """
+    단계별 지연 시간 히스토그램과 가장 느린 추적 출력
+
+    Args:
+        path (str): 추적 파일 경로
+        slowest (int): 출력할 느린 추적 수
+        width (int): 히스토그램 막대 최대 길이
+    """
+    traces = load_trace(path)
+    if not traces:
+        print("추적 기록이 없습니다.")
+        return
+
+    by_stage = defaultdict(list)
+    for spans in traces.values():
+        for stage, _, duration in spans:
+            by_stage[stage].append(duration)
+
+    print(f"\n=== 단계별 지연 시간 (추적 {len(traces)}건) ===")
+    for stage, durations in by_stage.items():
+        durations.sort()
+        print(f"\n[{stage}] {len(durations)}건  "
+              f"p50 {_format_duration(_percentile(durations, 0.5))}  "
+              f"p95 {_format_duration(_percentile(durations, 0.95))}  "
+              f"p99 {_format_duration(_percentile(durations, 0.99))}  "
+              f"최대 {_format_duration(durations[-1])}")
+
+        # 2배 간격 버킷 히스토그램
+        buckets = defaultdict(int)
+        for duration in durations:
+            buckets[max(0, int(duration).bit_length() - 1)] += 1
+        peak = max(buckets.values())
+        for bucket in sorted(buckets):
+            count = buckets[bucket]
+            bar = '█' * max(1, round(count / peak * width))
+            print(f"  < {_format_duration(2 ** (bucket + 1)):>8} {bar} {count}")
+
+    totals = []
+    for trace_id, spans in traces.items():
+        start = min(begin for _, begin, _ in spans)
+        end = max(begin + duration for _, begin, duration in spans)
+        totals.append((end - start, trace_id, spans))
+    totals.sort(reverse=True)
+
+    print(f"\n=== 가장 느린 추적 {min(slowest, len(totals))}건 ===")
+    for total, trace_id, spans in totals[:slowest]:
+        stages = ', '.join(f"{stage} {_format_duration(duration)}" for stage, _, duration in sorted(spans, key=lambda s: s[1]))
+        print(f"{trace_id}: 전체 {_format_duration(total)} ({stages})")
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='지연 시간 추적 리포트')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    report_parser = subparsers.add_parser('report', help='단계별 히스토그램과 느린 추적 출력')
+    report_parser.add_argument('path', nargs='?', default=None, help='추적 파일 경로')
+    report_parser.add_argument('--slowest', type=int, default=10, help='출력할 느린 추적 수')
+
+    args = parser.parse_args()
+
+    if args.command == 'report':
+        path = args.path or load_config().get('tracing', {}).get('file', 'logs/trace.jsonl')
+        report(path, slowest=args.slowest)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,10 @@
 """
 import os
 import logging
-import pandas as pd
 from datetime import datetime
-import yaml
 from dotenv import load_dotenv
+from config_service import get_config_service
+from log_pipeline import get_pipeline
 
 # 환경 변수 로드
 load_dotenv()
@@ -16,6 +16,9 @@ def setup_logger(name, log_file=None, level=logging.INFO):
     """
     로거 설정
     
+    같은 이름으로 여러 번 호출해도 핸들러는 한 번만 붙습니다.
+    기록은 큐에 넣기만 하고 콘솔/파일 출력은 백그라운드 스레드가 담당합니다 (log_pipeline.py).
+    
     Args:
         name (str): 로거 이름
         log_file (str): 로그 파일 경로
@@ -24,47 +27,49 @@ def setup_logger(name, log_file=None, level=logging.INFO):
     Returns:
         logging.Logger: 설정된 로거
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    
-    # 포맷 설정
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # 콘솔 핸들러
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # 파일 핸들러
-    if log_file:
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
-    return logger
+    return get_pipeline().get_logger(name, log_file, level)
 
 
 def load_config(config_file='config.yaml'):
     """
     YAML 설정 파일 로드
     
+    파일은 프로세스당 한 번만 파싱되고, 수정 시각이 바뀌면 자동으로 다시 읽습니다.
+    
     Args:
         config_file (str): 설정 파일 경로
         
     Returns:
-        dict: 설정 딕셔너리
+        Config: 읽기 전용 설정 (딕셔너리처럼 사용)
     """
-    try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-        return config
-    except Exception as e:
-        print(f"설정 파일 로드 실패: {e}")
-        return {}
+    return get_config_service(config_file).get()
+
+
+def watch_config(callback, config_file='config.yaml'):
+    """
+    설정 변경 알림 등록
+    
+    Args:
+        callback: callback(new_config, old_config)
+        config_file (str): 설정 파일 경로
+    """
+    get_config_service(config_file).subscribe(callback)
+
+
+def data_path(path, data_dir=None):
+    """
+    데이터 파일 경로를 data_dir 아래로 옮김
+
+    Args:
+        path (str): 설정 파일의 경로 (예: data/history.db)
+        data_dir (str): 데이터 디렉토리 (None이면 path 그대로)
+
+    Returns:
+        str: 파일 경로 (예: <data_dir>/history.db)
+    """
+    if not data_dir:
+        return path
+    return os.path.join(data_dir, os.path.basename(os.path.normpath(path)))
 
 
 def get_env(key, default=None):
@@ -83,21 +88,17 @@ def get_env(key, default=None):
 
 def save_to_csv(data, filename):
     """
-    데이터를 CSV 파일로 저장
+    데이터를 CSV 파일로 저장 (청크 단위로 쓰기, exporter.write_rows 사용)
     
     Args:
-        data: DataFrame 또는 리스트
-        filename (str): 저장할 파일명
+        data: DataFrame 또는 딕셔너리 리스트
+        filename (str): 저장할 파일명 (.csv.gz이면 압축)
     """
+    from exporter import write_rows, records_to_chunks
+    
     try:
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        
-        if isinstance(data, pd.DataFrame):
-            df = data
-        else:
-            df = pd.DataFrame(data)
-        
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
+        columns, chunks = records_to_chunks(data)
+        write_rows(filename, columns, chunks, 'csv.gz' if filename.endswith('.gz') else 'csv')
         print(f"데이터 저장 완료: {filename}")
     except Exception as e:
         print(f"CSV 저장 실패: {e}")
@@ -105,21 +106,17 @@ def save_to_csv(data, filename):
 
 def save_to_excel(data, filename):
     """
-    데이터를 Excel 파일로 저장
+    데이터를 Excel 파일로 저장 (쓰기 전용 모드, exporter.write_rows 사용)
     
     Args:
-        data: DataFrame 또는 리스트
+        data: DataFrame 또는 딕셔너리 리스트
         filename (str): 저장할 파일명
     """
+    from exporter import write_rows, records_to_chunks
+    
     try:
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        
-        if isinstance(data, pd.DataFrame):
-            df = data
-        else:
-            df = pd.DataFrame(data)
-        
-        df.to_excel(filename, index=False, engine='openpyxl')
+        columns, chunks = records_to_chunks(data)
+        write_rows(filename, columns, chunks, 'xlsx')
         print(f"데이터 저장 완료: {filename}")
     except Exception as e:
         print(f"Excel 저장 실패: {e}")